@@ -0,0 +1,30 @@
+"""add chunk.text_norm search column
+
+Revision ID: 2a6c9e4f7b31
+Revises: 7f3b8d2a6e15
+Create Date: 2026-10-19 15:21:08.114529
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a6c9e4f7b31'
+down_revision: Union[str, Sequence[str], None] = '7f3b8d2a6e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by app.text.normalize at index time; rows chunked before this revision
+    # stay NULL until their document is re-chunked.
+    op.add_column("chunk", sa.Column("text_norm", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("chunk", "text_norm")
@@ -0,0 +1,33 @@
+"""add pgvector chunk.embedding column
+
+Revision ID: 3b9e5c7d1f04
+Revises: 8e2d6b0a4c19
+Create Date: 2026-10-19 19:36:02.661478
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e5c7d1f04'
+down_revision: Union[str, Sequence[str], None] = '8e2d6b0a4c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDING_DIM = 1024  # bge-m3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(f"ALTER TABLE chunk ADD COLUMN embedding vector({EMBEDDING_DIM})")
+    op.add_column("chunk", sa.Column("embedding_model", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("chunk", "embedding_model")
+    op.drop_column("chunk", "embedding")
@@ -0,0 +1,30 @@
+"""add lineage row range columns
+
+Revision ID: 4c1e7a92b0d6
+Revises: 9def7cbe3a5c
+Create Date: 2026-10-19 10:03:17.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e7a92b0d6'
+down_revision: Union[str, Sequence[str], None] = '9def7cbe3a5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("lineage", sa.Column("row_start", sa.Integer()))
+    op.add_column("lineage", sa.Column("row_end", sa.Integer()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("lineage", "row_end")
+    op.drop_column("lineage", "row_start")
@@ -0,0 +1,33 @@
+"""add ANN index on chunk.embedding
+
+Revision ID: 6a4f0d8e2b57
+Revises: 3b9e5c7d1f04
+Create Date: 2026-10-19 20:25:44.087163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a4f0d8e2b57'
+down_revision: Union[str, Sequence[str], None] = '3b9e5c7d1f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # HNSW builds a usable graph incrementally, so it is the safe default on an
+    # empty table. IVFFlat centroids come from existing rows; switch with
+    # `python -m workers.ann_index --kind ivfflat` once embeddings are loaded.
+    op.execute(
+        "CREATE INDEX idx_chunk_embedding_ann ON chunk "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_chunk_embedding_ann")
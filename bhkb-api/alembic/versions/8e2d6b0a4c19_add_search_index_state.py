@@ -0,0 +1,37 @@
+"""add search_index_state version counter for result caches
+
+Revision ID: 8e2d6b0a4c19
+Revises: f1a8c3d5e627
+Create Date: 2026-10-19 18:47:15.204337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2d6b0a4c19'
+down_revision: Union[str, Sequence[str], None] = 'f1a8c3d5e627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Single row; bumped in the same transaction that writes chunks so cached
+    # search results are invalidated exactly when new chunks become visible.
+    op.create_table(
+        "search_index_state",
+        sa.Column("id", sa.Boolean(), primary_key=True, server_default=sa.text("true")),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.CheckConstraint("id", name="ck_search_index_state_single_row"),
+    )
+    op.execute("INSERT INTO search_index_state DEFAULT VALUES")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("search_index_state")
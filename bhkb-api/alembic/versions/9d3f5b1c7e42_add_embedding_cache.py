@@ -0,0 +1,40 @@
+"""add content-addressed embedding_cache
+
+Revision ID: 9d3f5b1c7e42
+Revises: 6a4f0d8e2b57
+Create Date: 2026-10-19 21:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f5b1c7e42'
+down_revision: Union[str, Sequence[str], None] = '6a4f0d8e2b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDING_DIM = 1024  # bge-m3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyed by sha256 of the normalized chunk text, so re-chunking or re-crawling
+    # unchanged text reuses the vector instead of running the model again.
+    op.create_table(
+        "embedding_cache",
+        sa.Column("content_sha256", sa.LargeBinary(), nullable=False),
+        sa.Column("model_version", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("content_sha256", "model_version", name="pk_embedding_cache"),
+        sa.CheckConstraint("octet_length(content_sha256) = 32", name="ck_embedding_cache_sha256"),
+    )
+    op.execute(f"ALTER TABLE embedding_cache ADD COLUMN embedding vector({EMBEDDING_DIM}) NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("embedding_cache")
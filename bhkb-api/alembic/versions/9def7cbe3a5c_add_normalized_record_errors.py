@@ -0,0 +1,29 @@
+"""add normalized_record validation errors
+
+Revision ID: 9def7cbe3a5c
+Revises: a03f5cdfa397
+Create Date: 2026-10-19 09:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9def7cbe3a5c'
+down_revision: Union[str, Sequence[str], None] = 'a03f5cdfa397'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("normalized_record", sa.Column("errors", pg.JSONB()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("normalized_record", "errors")
@@ -0,0 +1,38 @@
+"""add ingest_task next_run_at for retry scheduling
+
+Revision ID: b7d2f4e81c09
+Revises: 4c1e7a92b0d6
+Create Date: 2026-10-19 10:41:05.117402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4e81c09'
+down_revision: Union[str, Sequence[str], None] = '4c1e7a92b0d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "ingest_task",
+        sa.Column("next_run_at", sa.TIMESTAMP(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index(
+        "idx_ingest_task_due",
+        "ingest_task",
+        ["next_run_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_ingest_task_due", table_name="ingest_task")
+    op.drop_column("ingest_task", "next_run_at")
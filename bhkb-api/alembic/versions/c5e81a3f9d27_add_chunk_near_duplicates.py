@@ -0,0 +1,45 @@
+"""add MinHash signatures, LSH bands and duplicate_of for chunks
+
+Revision ID: c5e81a3f9d27
+Revises: 2a6c9e4f7b31
+Create Date: 2026-10-19 16:04:52.730915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e81a3f9d27'
+down_revision: Union[str, Sequence[str], None] = '2a6c9e4f7b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("chunk", sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "chunk",
+        sa.Column("duplicate_of", sa.BigInteger(), sa.ForeignKey("chunk.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.create_index("idx_chunk_duplicate_of", "chunk", ["duplicate_of"])
+    op.create_table(
+        "chunk_lsh",
+        sa.Column("band", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.Column("chunk_id", sa.BigInteger(), sa.ForeignKey("chunk.id", ondelete="CASCADE"), nullable=False),
+        sa.PrimaryKeyConstraint("band", "bucket", "chunk_id"),
+    )
+    op.create_index("idx_chunk_lsh_chunk", "chunk_lsh", ["chunk_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_chunk_lsh_chunk", table_name="chunk_lsh")
+    op.drop_table("chunk_lsh")
+    op.drop_index("idx_chunk_duplicate_of", table_name="chunk")
+    op.drop_column("chunk", "duplicate_of")
+    op.drop_column("chunk", "minhash")
@@ -0,0 +1,85 @@
+"""add full-text search column, GIN index and chunk_search()
+
+Revision ID: d4b7f2a9c803
+Revises: c5e81a3f9d27
+Create Date: 2026-10-19 17:12:40.552301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7f2a9c803'
+down_revision: Union[str, Sequence[str], None] = 'c5e81a3f9d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# unaccent() is only STABLE, so generated columns and indexes need an IMMUTABLE
+# wrapper that pins the dictionary. Servers without the contrib extension get a
+# translate() fallback covering the BCS letters.
+F_UNACCENT_EXTENSION = """
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+"""
+
+F_UNACCENT_FALLBACK = """
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT replace(replace(translate($1, 'čćžšČĆŽŠ', 'cczsCCZS'), 'đ', 'dj'), 'Đ', 'Dj') $$
+"""
+
+# Inlinable SQL function: the planner sees through it and uses idx_chunk_tsv.
+# Near-duplicates are left out; their canonical chunk is returned instead.
+CHUNK_SEARCH = """
+CREATE OR REPLACE FUNCTION chunk_search(q text, lim integer DEFAULT 10)
+RETURNS TABLE (id bigint, text text, rank real)
+LANGUAGE sql STABLE PARALLEL SAFE
+AS $$
+    SELECT c.id, c.text, ts_rank_cd(c.tsv, query) AS rank
+    FROM chunk c, websearch_to_tsquery('simple', f_unaccent(lower(q))) AS query
+    WHERE c.tsv @@ query AND c.duplicate_of IS NULL
+    ORDER BY rank DESC, c.id
+    LIMIT lim
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    has_unaccent = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent'")
+    ).scalar()
+    if has_unaccent:
+        op.execute("CREATE EXTENSION IF NOT EXISTS unaccent SCHEMA public")
+        op.execute(F_UNACCENT_EXTENSION)
+    else:
+        op.execute(F_UNACCENT_FALLBACK)
+
+    # text_norm is already folded by app.text.normalize; rows chunked before it
+    # existed fall back to unaccented text.
+    op.add_column(
+        "chunk",
+        sa.Column(
+            "tsv",
+            pg.TSVECTOR(),
+            sa.Computed("to_tsvector('simple'::regconfig, coalesce(text_norm, f_unaccent(lower(text))))", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index("idx_chunk_tsv", "chunk", ["tsv"], postgresql_using="gin")
+    op.execute(CHUNK_SEARCH)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS chunk_search(text, integer)")
+    op.drop_index("idx_chunk_tsv", table_name="chunk")
+    op.drop_column("chunk", "tsv")
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
@@ -0,0 +1,28 @@
+"""add ingest_task checkpoint_row for resumable parsing
+
+Revision ID: e3a9c5d17f42
+Revises: b7d2f4e81c09
+Create Date: 2026-10-19 11:20:48.930155
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c5d17f42'
+down_revision: Union[str, Sequence[str], None] = 'b7d2f4e81c09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("ingest_task", sa.Column("checkpoint_row", sa.Integer()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("ingest_task", "checkpoint_row")
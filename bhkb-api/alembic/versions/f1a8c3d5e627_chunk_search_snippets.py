@@ -0,0 +1,84 @@
+"""return ts_headline snippets from chunk_search()
+
+Revision ID: f1a8c3d5e627
+Revises: d4b7f2a9c803
+Create Date: 2026-10-19 18:03:27.918446
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a8c3d5e627'
+down_revision: Union[str, Sequence[str], None] = 'd4b7f2a9c803'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ts_headline re-parses the original text, so words need the same folding as the
+# query for "plaća" to be highlighted by a "placa" lexeme.
+FOLD_CONFIG_UNACCENT = """
+ALTER TEXT SEARCH CONFIGURATION chunk_fold
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple
+"""
+
+# Headlines are computed only for the LIMITed hits, and MaxWords bounds the bytes
+# returned per row whatever the chunk size. A chunk that matched only through
+# text_norm (e.g. Cyrillic text for a Latin query) gets its leading words.
+CHUNK_SEARCH = """
+CREATE FUNCTION chunk_search(q text, lim integer DEFAULT 10)
+RETURNS TABLE (id bigint, snippet text, rank real)
+LANGUAGE sql STABLE PARALLEL SAFE
+AS $$
+    SELECT hit.id,
+           ts_headline(
+               'chunk_fold', hit.text, hit.query,
+               'StartSel=«, StopSel=», MinWords=15, MaxWords=35, MaxFragments=2, FragmentDelimiter=" … "'
+           ),
+           hit.rank
+    FROM (
+        SELECT c.id, c.text, query, ts_rank_cd(c.tsv, query) AS rank
+        FROM chunk c, websearch_to_tsquery('simple', f_unaccent(lower(q))) AS query
+        WHERE c.tsv @@ query AND c.duplicate_of IS NULL
+        ORDER BY rank DESC, c.id
+        LIMIT lim
+    ) AS hit
+    ORDER BY hit.rank DESC, hit.id
+$$
+"""
+
+CHUNK_SEARCH_TEXT = """
+CREATE FUNCTION chunk_search(q text, lim integer DEFAULT 10)
+RETURNS TABLE (id bigint, text text, rank real)
+LANGUAGE sql STABLE PARALLEL SAFE
+AS $$
+    SELECT c.id, c.text, ts_rank_cd(c.tsv, query) AS rank
+    FROM chunk c, websearch_to_tsquery('simple', f_unaccent(lower(q))) AS query
+    WHERE c.tsv @@ query AND c.duplicate_of IS NULL
+    ORDER BY rank DESC, c.id
+    LIMIT lim
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE TEXT SEARCH CONFIGURATION chunk_fold (COPY = simple)")
+    has_unaccent = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'unaccent'")
+    ).scalar()
+    if has_unaccent:
+        op.execute(FOLD_CONFIG_UNACCENT)
+    # The result columns change, which CREATE OR REPLACE cannot do.
+    op.execute("DROP FUNCTION chunk_search(text, integer)")
+    op.execute(CHUNK_SEARCH)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION chunk_search(text, integer)")
+    op.execute(CHUNK_SEARCH_TEXT)
+    op.execute("DROP TEXT SEARCH CONFIGURATION chunk_fold")
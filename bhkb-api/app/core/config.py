@@ -10,5 +10,49 @@ class Settings(BaseSettings):
     APP_NAME: str = "BH KB API"
     APP_ENV: str = "dev"
 
+    # Chunking
+    CHUNK_TOKENS: int = 700
+    CHUNK_OVERLAP: float = 0.1  # fraction of CHUNK_TOKENS repeated between neighbouring chunks
+    NEAR_DUP_THRESHOLD: float = 0.8  # MinHash Jaccard estimate above which a chunk is a duplicate
+
+    # Search result cache
+    SEARCH_CACHE_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared)
+    SEARCH_CACHE_SIZE: int = 1024  # entries, memory backend only
+    SEARCH_CACHE_TTL_SECONDS: float = 300.0
+    INDEX_VERSION_REFRESH_SECONDS: float = 5.0  # how often search_index_state is re-read
+    REDIS_URL: str | None = None
+
+    # Hybrid retrieval
+    EMBEDDING_DIM: int = 1024  # must match the chunk.embedding column
+    PREFETCH_LIMIT: int = 1000  # candidates per retriever (dense, lexical)
+    RERANK_TOP_K: int = 50  # fused candidates passed to MMR
+    FINAL_TOP_K: int = 12
+    MMR_DIVERSITY: float = 0.6  # 0 = relevance only, 1 = diversity only
+
+    # pgvector ANN index (built by workers.ann_index) and default query knobs
+    PGVECTOR_INDEX: str = "hnsw"  # or "ivfflat"; must match the index in place (checked at startup)
+    PGVECTOR_LISTS: int = 200
+    PGVECTOR_PROBES: int = 20
+    PGVECTOR_HNSW_M: int = 16
+    PGVECTOR_HNSW_EF_CONSTRUCTION: int = 64
+    PGVECTOR_EF_SEARCH: int = 40  # HNSW returns at most this many dense candidates
+    # Index halfvec or binary-quantized vectors (pgvector 0.7+) and re-rank
+    # PREFETCH_LIMIT x PGVECTOR_RESCORE_FACTOR candidates at full precision.
+    PGVECTOR_QUANTIZATION: str = "none"  # "none", "halfvec" or "binary"
+    PGVECTOR_RESCORE_FACTOR: int = 4
+
+    # Embedding model; "hashing" needs no model files, "onnx" runs bge-m3 on CPU
+    EMBEDDING_BACKEND: str = "hashing"  # or "onnx"
+    EMBEDDING_MODEL_PATH: str | None = None  # model.onnx
+    EMBEDDING_TOKENIZER_PATH: str | None = None  # tokenizer.json
+    # embedding_cache key; change it with the model. Dense search only matches chunks
+    # embedded by this version (filtered after the ANN scan), so after a change run
+    # workers.embed_chunks over the whole corpus before serving queries.
+    EMBEDDING_MODEL_VERSION: str = "bge-m3-onnx"
+    EMBEDDING_MAX_TOKENS: int = 2048  # tokenizer truncation; >= CHUNK_TOKENS (bge-m3 accepts 8192)
+    EMBEDDING_THREADS: int | None = None  # onnxruntime intra-op threads; None = all cores
+    EMBED_MAX_BATCH: int = 32
+    EMBED_MAX_LATENCY_MS: float = 10.0  # how long a query waits for others to batch with
+
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
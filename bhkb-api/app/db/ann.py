@@ -0,0 +1,195 @@
+"""pgvector ANN index management and per-query search tuning."""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import psycopg
+from psycopg import sql
+
+from app.text.embed import EMBEDDING_DIM
+
+ANN_INDEX = "idx_chunk_embedding_ann"
+ANN_KINDS = ("ivfflat", "hnsw")
+MAX_EF_SEARCH = 1000  # pgvector's upper bound for hnsw.ef_search
+QUANTIZED_MIN_PGVECTOR = (0, 7, 0)  # halfvec and binary_quantize
+
+# Indexed expression, operator class and query-side distance per storage mode. The
+# ORDER BY must repeat the indexed expression verbatim for the planner to use it.
+QUANTIZATIONS: dict[str, tuple[str, str, str]] = {
+    "none": ("embedding", "vector_cosine_ops", "embedding <=> %(v)s::vector"),
+    "halfvec": (
+        f"(embedding::halfvec({EMBEDDING_DIM}))",
+        "halfvec_cosine_ops",
+        f"embedding::halfvec({EMBEDDING_DIM}) <=> %(v)s::halfvec({EMBEDDING_DIM})",
+    ),
+    "binary": (
+        f"(binary_quantize(embedding)::bit({EMBEDDING_DIM}))",
+        "bit_hamming_ops",
+        f"binary_quantize(embedding)::bit({EMBEDDING_DIM}) <~> binary_quantize(%(v)s::vector)",
+    ),
+}
+
+
+@dataclass(frozen=True)
+class AnnConfig:
+    """Build parameters and default query-time knobs for the chunk embedding index."""
+
+    kind: str = "ivfflat"
+    lists: int = 200
+    probes: int = 20
+    m: int = 16
+    ef_construction: int = 64
+    ef_search: int = 40
+    quantization: str = "none"  # "halfvec" (2 bytes/dim) or "binary" (1 bit/dim)
+    rescore_factor: int = 4  # quantized candidates per result, re-ranked at full precision
+
+    def __post_init__(self) -> None:
+        if self.kind not in ANN_KINDS:
+            raise ValueError(f"kind must be one of {ANN_KINDS}, got {self.kind!r}")
+        if self.quantization not in QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {tuple(QUANTIZATIONS)}, got {self.quantization!r}")
+        if self.rescore_factor < 1:
+            raise ValueError("rescore_factor must be >= 1")
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> AnnConfig:
+        return cls(
+            kind=settings.PGVECTOR_INDEX,
+            lists=settings.PGVECTOR_LISTS,
+            probes=settings.PGVECTOR_PROBES,
+            m=settings.PGVECTOR_HNSW_M,
+            ef_construction=settings.PGVECTOR_HNSW_EF_CONSTRUCTION,
+            ef_search=settings.PGVECTOR_EF_SEARCH,
+            quantization=settings.PGVECTOR_QUANTIZATION,
+            rescore_factor=settings.PGVECTOR_RESCORE_FACTOR,
+        )
+
+    @property
+    def distance(self) -> str:
+        """ORDER BY expression for the ANN stage; binds %(v)s to a vector literal."""
+        return QUANTIZATIONS[self.quantization][2]
+
+    def _knobs(self, effort: Optional[float]) -> tuple[int, int]:
+        if effort is None:
+            return self.probes, min(MAX_EF_SEARCH, self.ef_search)
+        if not 0 <= effort <= 1:
+            raise ValueError("effort must be in [0, 1]")
+        return max(1, math.ceil(self.lists * effort)), max(1, math.ceil(MAX_EF_SEARCH * effort))
+
+    def search_settings(self, effort: Optional[float] = None) -> dict[str, str]:
+        """GUCs for one query. `effort` in [0, 1] trades latency for recall.
+
+        Without it the configured probes/ef_search apply; 0 scans the fewest lists or
+        graph candidates, 1 scans every list (exact for IVFFlat) or the widest ef.
+        """
+        probes, ef_search = self._knobs(effort)
+        return {"ivfflat.probes": str(probes), "hnsw.ef_search": str(ef_search)}
+
+    def dense_limits(self, prefetch: int, effort: Optional[float] = None) -> tuple[int, int]:
+        """(rows kept, rows read from the index) for the dense stage.
+
+        A quantized index is read `rescore_factor` times deeper and re-ranked at full
+        precision. HNSW returns at most ef_search rows per scan, so there the read
+        depth is capped by ef_search and the kept rows shrink with it.
+        """
+        factor = 1 if self.quantization == "none" else self.rescore_factor
+        candidates = prefetch * factor
+        if self.kind == "hnsw":
+            candidates = min(candidates, self._knobs(effort)[1])
+        return max(1, min(prefetch, candidates // factor)), candidates
+
+
+def suggest_lists(rows: int) -> int:
+    """pgvector guidance: rows / 1000 lists up to 1M rows, sqrt(rows) above."""
+    if rows <= 1_000_000:
+        return max(1, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def pgvector_version(conn: psycopg.Connection) -> tuple[int, ...]:
+    row = conn.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'").fetchone()
+    return _parse_version(row[0] if row else None)
+
+
+def _parse_version(version: Optional[str]) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.split(".")) if version else ()
+
+
+def index_ddl(config: AnnConfig, name: str = ANN_INDEX, concurrently: bool = True) -> sql.Composed:
+    expression, opclass, _ = QUANTIZATIONS[config.quantization]
+    if config.kind == "ivfflat":
+        params = sql.SQL("lists = {}").format(sql.Literal(config.lists))
+    else:
+        params = sql.SQL("m = {}, ef_construction = {}").format(
+            sql.Literal(config.m), sql.Literal(config.ef_construction)
+        )
+    statement = "CREATE INDEX {concurrently}{name} ON chunk USING {kind} ({expression} {opclass}) WITH ({params})"
+    return sql.SQL(statement).format(
+        concurrently=sql.SQL("CONCURRENTLY " if concurrently else ""),
+        name=sql.Identifier(name),
+        kind=sql.SQL(config.kind),
+        expression=sql.SQL(expression),
+        opclass=sql.SQL(opclass),
+        params=params,
+    )
+
+
+def rebuild_ann_index(conn: psycopg.Connection, config: AnnConfig, concurrently: bool = True) -> str:
+    """Build a new index next to the live one, then swap it in under ANN_INDEX.
+
+    With `concurrently` neither build nor drop blocks writers, and searches keep
+    using the old index until the swap. `conn` must be in autocommit mode, as
+    CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    Returns the index definition now in place.
+
+    Quantized indexes cover an expression over chunk.embedding, so the
+    full-precision vectors stay in the heap for re-scoring; they need pgvector 0.7+.
+    """
+    if config.quantization != "none" and pgvector_version(conn) < QUANTIZED_MIN_PGVECTOR:
+        raise RuntimeError(f"{config.quantization} quantization requires pgvector >= 0.7")
+    building = f"{ANN_INDEX}_new"
+    retired = f"{ANN_INDEX}_old"
+    drop = "DROP INDEX CONCURRENTLY IF EXISTS {}" if concurrently else "DROP INDEX IF EXISTS {}"
+    conn.execute(sql.SQL(drop).format(sql.Identifier(building)))  # left over from an interrupted run
+    conn.execute(index_ddl(config, building, concurrently))
+    with conn.transaction():
+        rename = "ALTER INDEX IF EXISTS {} RENAME TO {}"
+        conn.execute(sql.SQL(rename).format(sql.Identifier(ANN_INDEX), sql.Identifier(retired)))
+        conn.execute(sql.SQL(rename).format(sql.Identifier(building), sql.Identifier(ANN_INDEX)))
+    conn.execute(sql.SQL(drop).format(sql.Identifier(retired)))
+    row = conn.execute("SELECT indexdef FROM pg_indexes WHERE indexname = %s", (ANN_INDEX,)).fetchone()
+    return row[0]
+
+
+async def verify_index(pool: Any, config: AnnConfig) -> None:
+    """Fail fast when the installed ANN index does not match `config`.
+
+    The query knobs only apply to the index method they belong to: an HNSW index
+    read with IVFFlat settings silently returns ef_search rows at most. Quantized
+    queries also cast to halfvec or call binary_quantize, which needs pgvector
+    0.7+, and only the matching expression index keeps them off a sequential scan.
+    """
+    async with pool.connection() as conn:
+        cursor = await conn.execute(
+            "SELECT (SELECT extversion FROM pg_extension WHERE extname = 'vector'), "
+            "(SELECT indexdef FROM pg_indexes WHERE indexname = %s)",
+            (ANN_INDEX,),
+        )
+        version, indexdef = await cursor.fetchone()
+    rebuild = "rebuild it with `python -m workers.ann_index` or update the PGVECTOR_* settings"
+    method = re.search(r" USING (\w+) ", indexdef or "")
+    if method is None or method.group(1) != config.kind:
+        raise RuntimeError(f"PGVECTOR_INDEX={config.kind} but {ANN_INDEX} is {indexdef!r}; {rebuild}")
+    if config.quantization != "none" and _parse_version(version) < QUANTIZED_MIN_PGVECTOR:
+        raise RuntimeError(f"PGVECTOR_QUANTIZATION={config.quantization} requires pgvector >= 0.7, found {version}")
+    if QUANTIZATIONS[config.quantization][1] not in indexdef:
+        raise RuntimeError(f"PGVECTOR_QUANTIZATION={config.quantization} but {ANN_INDEX} is {indexdef!r}; {rebuild}")
+
+
+async def apply_search_settings(conn: Any, settings: dict[str, str]) -> None:
+    """SET LOCAL the given GUCs; the caller must be inside a transaction."""
+    for name, value in settings.items():
+        await conn.execute("SELECT set_config(%s, %s, true)", (name, value))
@@ -3,16 +3,29 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
-    CheckConstraint, ForeignKey, Index, UniqueConstraint, text
+    CheckConstraint, Computed, ForeignKey, Identity, Index, UniqueConstraint, text
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB, BIGINT
+from sqlalchemy.dialects.postgresql import UUID, JSONB, BIGINT, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import Text, Integer, Boolean, TIMESTAMP
+from sqlalchemy import Text, Integer, Boolean, TIMESTAMP, LargeBinary, SmallInteger
+from sqlalchemy.types import UserDefinedType
 
 class Base(DeclarativeBase):
     pass
 
 
+class Vector(UserDefinedType):
+    """pgvector column type; values are read and written as '[x,y,...]' text."""
+
+    cache_ok = True
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def get_col_spec(self, **kw) -> str:
+        return f"vector({self.dim})"
+
+
 """
 A file lands → 
 we register an artifact (the raw file) 
@@ -87,6 +100,7 @@ class IngestTask(Base):
     __table_args__ = (
         CheckConstraint("status IN ('pending','running','success','failed','dlq')", name="ck_ingest_status"),
         Index("idx_ingest_task_status", "status"),
+        Index("idx_ingest_task_due", "next_run_at", postgresql_where=text("status = 'pending'")),
     )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()"))
@@ -94,6 +108,8 @@ class IngestTask(Base):
     status: Mapped[str] = mapped_column(Text, nullable=False, server_default=text("'pending'"))
     attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
     last_error: Mapped[Optional[str]] = mapped_column(Text)
+    checkpoint_row: Mapped[Optional[int]] = mapped_column(Integer)  # last committed row_index
+    next_run_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
 
@@ -124,6 +140,7 @@ class NormalizedRecord(Base):
     payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
     schema_version: Mapped[str] = mapped_column(Text, nullable=False)  # e.g., 'customer-ledger@1.0'
     valid: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("true"))
+    errors: Mapped[Optional[list]] = mapped_column(JSONB)  # validation reasons when valid is false
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
 
     artifact: Mapped[Artifact] = relationship(back_populates="records")
@@ -137,6 +154,8 @@ class Lineage(Base):
     record_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False))
     run_id: Mapped[Optional[str]] = mapped_column(Text)
     action: Mapped[Optional[str]] = mapped_column(Text)  # PARSED/INDEXED_ES/...
+    row_start: Mapped[Optional[int]] = mapped_column(Integer)  # inclusive row_index span for range events
+    row_end: Mapped[Optional[int]] = mapped_column(Integer)
     at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
     notes: Mapped[Optional[str]] = mapped_column(Text)
 
@@ -156,3 +175,79 @@ class ResearchFinding(Base):
     allowlisted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
     fetched_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP(timezone=True))
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
+
+
+class Chunk(Base):
+    """Retrieval unit cut from a legal document by app.text.chunking."""
+
+    __tablename__ = "chunk"
+    __table_args__ = (
+        UniqueConstraint("document_key", "chunk_index", name="uq_chunk_document_index"),
+        Index("idx_chunk_duplicate_of", "duplicate_of"),
+        Index("idx_chunk_tsv", "tsv", postgresql_using="gin"),
+        # Rebuilt as IVFFlat or HNSW by workers.ann_index; see app.db.ann.
+        Index(
+            "idx_chunk_embedding_ann",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BIGINT, Identity(), primary_key=True)
+    document_key: Mapped[str] = mapped_column(Text, nullable=False)  # source path or URL
+    chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    clause_title: Mapped[Optional[str]] = mapped_column(Text)  # e.g. "Član 23" or "Član 1 – Član 3"
+    start_offset: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_offset: Mapped[int] = mapped_column(Integer, nullable=False)
+    token_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Declared before `text`, which shadows sqlalchemy.text inside this class body.
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    text_norm: Mapped[Optional[str]] = mapped_column(Text)  # app.text.normalize.normalize(text)
+    minhash: Mapped[Optional[bytes]] = mapped_column(LargeBinary)  # app.text.dedup signature, 128 x uint32
+    # Canonical chunk this one nearly duplicates; such chunks are not embedded.
+    duplicate_of: Mapped[Optional[int]] = mapped_column(BIGINT, ForeignKey("chunk.id", ondelete="SET NULL"))
+    embedding: Mapped[Optional[str]] = mapped_column(Vector(1024))  # bge-m3, L2-normalized
+    embedding_model: Mapped[Optional[str]] = mapped_column(Text)
+    # Searched by the chunk_search() SQL function; f_unaccent is created by the migration.
+    tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple'::regconfig, coalesce(text_norm, f_unaccent(lower(text))))", persisted=True),
+        nullable=False,
+    )
+
+
+class ChunkLSH(Base):
+    """MinHash LSH band table used to find near-duplicate chunks."""
+
+    __tablename__ = "chunk_lsh"
+    __table_args__ = (Index("idx_chunk_lsh_chunk", "chunk_id"),)
+
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    bucket: Mapped[int] = mapped_column(BIGINT, primary_key=True)
+    chunk_id: Mapped[int] = mapped_column(BIGINT, ForeignKey("chunk.id", ondelete="CASCADE"), primary_key=True)
+
+
+class EmbeddingCache(Base):
+    """Embeddings by sha256 of normalized chunk text and model version; see app.text.embed_cache."""
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = (CheckConstraint("octet_length(content_sha256) = 32", name="ck_embedding_cache_sha256"),)
+
+    content_sha256: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    model_version: Mapped[str] = mapped_column(Text, primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
+    embedding: Mapped[str] = mapped_column(Vector(1024), nullable=False)
+
+
+class SearchIndexState(Base):
+    """Single-row counter bumped whenever chunks change; search caches key on it."""
+
+    __tablename__ = "search_index_state"
+    __table_args__ = (CheckConstraint("id", name="ck_search_index_state_single_row"),)
+
+    id: Mapped[bool] = mapped_column(Boolean, primary_key=True, server_default=text("true"))
+    version: Mapped[int] = mapped_column(BIGINT, nullable=False, server_default=text("0"))
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
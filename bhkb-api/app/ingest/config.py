@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class IngestSettings(BaseSettings):
+    DATABASE_URL: str
+    S3_ENDPOINT: str | None = None
+    S3_ACCESS_KEY: str | None = None
+    S3_SECRET_KEY: str | None = None
+    POLL_INTERVAL_SECONDS: int = 5
+    PARSE_POOL_SIZE: int = 2
+    PARSE_TASK_MEMORY_MB: int = 1024  # address-space cap per pool process, 0 disables
+    PARSE_TASKS_PER_CHILD: int = 20
+    MAX_ATTEMPTS: int = 5
+    RETRY_BASE_SECONDS: float = 30.0  # first retry waits ~base, doubling per attempt
+    RETRY_MAX_SECONDS: float = 3600.0
+    DEFAULT_SCHEMA_VERSION: str = "customer-ledger@1.0"
+    RECORD_BATCH_SIZE: int = 5000  # rows per COPY batch and per checkpoint commit
+    EXPORT_PARQUET: bool = True  # write <raw key>.records.parquet after loading
+    TASK_LEASE_SECONDS: int = 900  # running tasks without a checkpoint for this long are requeued
+    PROM_PORT: int = 8001
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
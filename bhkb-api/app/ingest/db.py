@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+import psycopg
+
+
+@dataclass(frozen=True)
+class ClaimedTask:
+    id: str
+    artifact_id: str
+    attempts: int
+    s3_uri: str
+    filename: str | None
+    mime_type: str | None
+    checkpoint_row: int | None = None
+
+
+def claim_tasks(conn: psycopg.Connection, limit: int) -> list[ClaimedTask]:
+    """Move up to `limit` pending tasks whose retry time has passed to running.
+
+    SKIP LOCKED lets several workers poll the same table without handing out a task twice;
+    tasks backing off after a failure stay invisible until their next_run_at.
+    """
+    if limit <= 0:
+        return []
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(
+                (
+                    "UPDATE ingest_task t SET status = 'running', attempts = t.attempts + 1, updated_at = now() "
+                    "FROM artifact a "
+                    "WHERE a.id = t.artifact_id AND t.id IN ("
+                    "  SELECT id FROM ingest_task WHERE status = 'pending' AND next_run_at <= now() "
+                    "  ORDER BY next_run_at FOR UPDATE SKIP LOCKED LIMIT %s"
+                    ") "
+                    "RETURNING t.id, t.artifact_id, t.attempts, a.s3_uri, a.filename, a.mime_type, t.checkpoint_row"
+                ),
+                (limit,),
+            )
+            rows = cur.fetchall()
+    return [ClaimedTask(*row) for row in rows]
+
+
+def requeue_stale_tasks(
+    conn: psycopg.Connection, lease_seconds: int, max_attempts: int
+) -> tuple[int, list[ClaimedTask]]:
+    """Return running tasks whose worker stopped checkpointing to pending.
+
+    Checkpoint commits bump updated_at, so a live task never looks stale unless a single
+    chunk takes longer than the lease. A stale task that has used up `max_attempts` is
+    moved to dlq instead (one that keeps killing its worker would otherwise be reclaimed
+    forever); those are returned for dead-letter bookkeeping with the requeued count.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            (
+                "WITH stale AS ("
+                "  SELECT id, attempts >= %(max_attempts)s AS exhausted FROM ingest_task "
+                "  WHERE status = 'running' AND updated_at < now() - make_interval(secs => %(lease)s) "
+                "  FOR UPDATE SKIP LOCKED"
+                ") "
+                "UPDATE ingest_task t SET status = CASE WHEN s.exhausted THEN 'dlq' ELSE 'pending' END, "
+                "next_run_at = now(), last_error = 'lease expired', updated_at = now() "
+                "FROM stale s, artifact a WHERE t.id = s.id AND a.id = t.artifact_id "
+                "RETURNING s.exhausted, t.id, t.artifact_id, t.attempts, a.s3_uri, a.filename, a.mime_type, "
+                "t.checkpoint_row"
+            ),
+            {"lease": lease_seconds, "max_attempts": max_attempts},
+        )
+        rows = cur.fetchall()
+    conn.commit()
+    exhausted = [ClaimedTask(*row[1:]) for row in rows if row[0]]
+    return len(rows) - len(exhausted), exhausted
+
+
+def mark_task_success(conn: psycopg.Connection, task_id: str) -> None:
+    with conn.cursor() as cur:
+        cur.execute(
+            (
+                "UPDATE ingest_task SET status = 'success', last_error = NULL, checkpoint_row = NULL, "
+                "updated_at = now() WHERE id = %s"
+            ),
+            (task_id,),
+        )
+    conn.commit()
+
+
+def dead_letter_task(conn: psycopg.Connection, task_id: str, error: str) -> None:
+    """Move a task to the dead-letter status; retryable failures go through schedule_retry."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE ingest_task SET status = 'dlq', last_error = %s, updated_at = now() WHERE id = %s",
+            (error, task_id),
+        )
+    conn.commit()
+
+
+def retry_delay(attempts: int, base: float, cap: float, rng: random.Random | None = None) -> float:
+    """Seconds to wait before retry number `attempts`: capped exponential with equal jitter.
+
+    Half the delay is fixed and half random, so failures from one bad upstream spread out
+    instead of retrying in lockstep.
+    """
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay / 2 + (rng or random).uniform(0, delay / 2)
+
+
+def schedule_retry(conn: psycopg.Connection, task_id: str, error: str, delay_seconds: float) -> None:
+    """Put a failed task back to pending, claimable again after delay_seconds."""
+    with conn.cursor() as cur:
+        cur.execute(
+            (
+                "UPDATE ingest_task SET status = 'pending', last_error = %s, "
+                "next_run_at = now() + make_interval(secs => %s), updated_at = now() WHERE id = %s"
+            ),
+            (error, delay_seconds, task_id),
+        )
+    conn.commit()
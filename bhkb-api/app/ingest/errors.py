@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class DLQReason(str, Enum):
+    UNSUPPORTED_FORMAT = "unsupported_format"
+    PARSE_FAILED = "parse_failed"
+    UNKNOWN_SCHEMA = "unknown_schema"
+    ATTEMPTS_EXHAUSTED = "attempts_exhausted"
+
+
+class UnsupportedFormatError(RuntimeError):
+    """Raised when an artifact is not a spreadsheet format we can parse."""
+
+
+class ParseError(RuntimeError):
+    """Raised when an artifact cannot be parsed into records."""
+
+
+class UnknownSchemaError(RuntimeError):
+    """Raised when no validator is registered for a schema_version."""
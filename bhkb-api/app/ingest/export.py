@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import uuid
+from typing import Any, Iterator, Sequence
+
+import psycopg
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from minio import Minio
+
+from app.ingest.reader import RangedObjectReader
+from app.ingest.schemas import CompiledValidator, SchemaSpec, coerce_dates, coerce_numbers
+
+
+EXPORT_SUFFIX = ".records.parquet"
+EXPORT_FETCH_ROWS = 50_000  # rows per server-side fetch and per parquet row group
+EXPORT_COMPRESSION = "zstd"
+
+_ARROW_TYPES = {"string": pa.string(), "number": pa.float64(), "integer": pa.int64(), "date": pa.date32()}
+
+
+def export_key(raw_key: str) -> str:
+    """Parquet objects live next to the raw snapshot: raw/aa/<sha256>.records.parquet."""
+    return raw_key + EXPORT_SUFFIX
+
+
+def arrow_schema(spec: SchemaSpec) -> pa.Schema:
+    """Fixed columns, one typed column per schema field, and `extra` (JSON) for the rest."""
+    fields = [
+        pa.field("row_index", pa.int32(), nullable=False),
+        pa.field("valid", pa.bool_(), nullable=False),
+        pa.field("errors", pa.list_(pa.string())),
+        *(pa.field(f.name, _ARROW_TYPES[f.type]) for f in spec.fields),
+        pa.field("extra", pa.string()),
+    ]
+    return pa.schema(fields, metadata={"schema_version": spec.version})
+
+
+def _typed_column(type_name: str, values: list[Any]) -> pa.Array:
+    # Values were coerced at validation; anything still not parseable becomes null.
+    if type_name == "string":
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    if type_name == "date":
+        return pc.cast(coerce_dates(values)[0], pa.date32())
+    numbers = coerce_numbers(values)[0]
+    if type_name == "integer":
+        whole = pc.fill_null(pc.equal(pc.floor(numbers), numbers), False)
+        return pc.cast(pc.if_else(whole, numbers, pa.scalar(None, pa.float64())), pa.int64())
+    return numbers
+
+
+def build_record_batch(validator: CompiledValidator, schema: pa.Schema, rows: Sequence[tuple]) -> pa.RecordBatch:
+    """Turn (row_index, payload, valid, errors) rows into one typed record batch."""
+    payloads = [row[1] or {} for row in rows]
+    resolved = [validator.resolve(tuple(payload)) for payload in payloads]
+    columns: dict[str, pa.Array] = {
+        "row_index": pa.array([row[0] for row in rows], type=pa.int32()),
+        "valid": pa.array([bool(row[2]) for row in rows], type=pa.bool_()),
+        "errors": pa.array([row[3] or None for row in rows], type=pa.list_(pa.string())),
+    }
+    for field in validator.spec.fields:
+        values = [payload.get(mapping.get(field.name, "")) for payload, mapping in zip(payloads, resolved)]
+        columns[field.name] = _typed_column(field.type, values)
+
+    extra = []
+    for payload, mapping in zip(payloads, resolved):
+        mapped = set(mapping.values())
+        rest = {k: v for k, v in payload.items() if k not in mapped and v is not None}
+        extra.append(json.dumps(rest, ensure_ascii=False) if rest else None)
+    columns["extra"] = pa.array(extra, type=pa.string())
+    return pa.RecordBatch.from_arrays([columns[name] for name in schema.names], schema=schema)
+
+
+def iter_export_batches(
+    conn: psycopg.Connection, artifact_id: str, validator: CompiledValidator, schema: pa.Schema
+) -> Iterator[pa.RecordBatch]:
+    """Read an artifact's records with a server-side cursor, EXPORT_FETCH_ROWS at a time."""
+    with conn.cursor(name=f"export_{uuid.uuid4().hex[:12]}") as cur:
+        cur.execute(
+            "SELECT row_index, payload, valid, errors FROM normalized_record WHERE artifact_id = %s ORDER BY row_index",
+            (artifact_id,),
+        )
+        while rows := cur.fetchmany(EXPORT_FETCH_ROWS):
+            yield build_record_batch(validator, schema, rows)
+
+
+def export_artifact(
+    conn: psycopg.Connection,
+    client: Minio,
+    bucket: str,
+    raw_key: str,
+    artifact_id: str,
+    validator: CompiledValidator,
+) -> str:
+    """Write an artifact's normalized records to MinIO as zstd Parquet; returns the s3 uri.
+
+    Rows are spooled to a local temp file one row group at a time, so memory stays
+    bounded by EXPORT_FETCH_ROWS regardless of artifact size.
+    """
+    schema = arrow_schema(validator.spec).with_metadata(
+        {"schema_version": validator.spec.version, "artifact_id": str(artifact_id)}
+    )
+    key = export_key(raw_key)
+    with tempfile.NamedTemporaryFile(suffix=EXPORT_SUFFIX) as tmp:
+        with pq.ParquetWriter(tmp.name, schema, compression=EXPORT_COMPRESSION) as writer:
+            for batch in iter_export_batches(conn, artifact_id, validator, schema):
+                writer.write_batch(batch)
+        conn.commit()  # close the read transaction held by the named cursor
+        client.fput_object(bucket, key, tmp.name, content_type="application/vnd.apache.parquet")
+    return f"s3://{bucket}/{key}"
+
+
+def open_export(client: Minio, bucket: str, key: str) -> pq.ParquetFile:
+    """Open an exported Parquet object; only the footer and requested column chunks are fetched.
+
+    The ranged reader is left unbuffered: Parquet already reads whole column chunks, so
+    each read maps to exactly one GET.
+    """
+    return pq.ParquetFile(RangedObjectReader(client, bucket, key))
+
+
+def scan_records(
+    client: Minio,
+    bucket: str,
+    key: str,
+    columns: Sequence[str] | None = None,
+    batch_size: int = EXPORT_FETCH_ROWS,
+) -> Iterator[pa.RecordBatch]:
+    """Yield record batches of the selected columns from an exported artifact."""
+    yield from open_export(client, bucket, key).iter_batches(batch_size=batch_size, columns=columns)
+
+
+def read_records(client: Minio, bucket: str, key: str, columns: Sequence[str] | None = None) -> pa.Table:
+    """Read selected columns of an exported artifact into one table."""
+    return open_export(client, bucket, key).read(columns=columns)
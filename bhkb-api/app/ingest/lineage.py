@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg
+
+
+LINEAGE_COPY = (
+    "COPY lineage (artifact_id, record_id, run_id, action, row_start, row_end, notes) FROM STDIN (FORMAT BINARY)"
+)
+LINEAGE_TYPES = ["uuid", "uuid", "text", "text", "int4", "int4", "text"]
+
+
+@dataclass(frozen=True, slots=True)
+class LineageEvent:
+    action: str
+    artifact_id: Any = None
+    record_id: Any = None
+    row_start: int | None = None
+    row_end: int | None = None
+    notes: str | None = None
+
+
+def _as_uuid(value: Any) -> uuid.UUID | None:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(str(value))
+
+
+def copy_events(conn: psycopg.Connection, run_id: str, events: list[LineageEvent]) -> None:
+    """Write events with one binary COPY inside the caller's transaction."""
+    with conn.cursor() as cur:
+        with cur.copy(LINEAGE_COPY) as copy:
+            copy.set_types(LINEAGE_TYPES)
+            for event in events:
+                copy.write_row(
+                    (
+                        _as_uuid(event.artifact_id),
+                        _as_uuid(event.record_id),
+                        run_id,
+                        event.action,
+                        event.row_start,
+                        event.row_end,
+                        event.notes,
+                    )
+                )
+
+
+class LineageRecorder:
+    """Buffers the lineage events of one run until a commit point.
+
+    Call flush() inside the transaction that writes the data the events describe, or
+    flush_async() to hand the buffer to a LineageWriter when no transaction is open.
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self._events: list[LineageEvent] = []
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def record(self, action: str, *, artifact_id: Any = None, record_id: Any = None, notes: str | None = None) -> None:
+        self._events.append(LineageEvent(action, artifact_id=artifact_id, record_id=record_id, notes=notes))
+
+    def record_range(self, action: str, artifact_id: Any, row_start: int, row_end: int, notes: str | None = None) -> None:
+        """Record one event for rows row_start..row_end (inclusive) of an artifact."""
+        if row_end < row_start:
+            raise ValueError(f"empty row range {row_start}..{row_end}")
+        self._events.append(
+            LineageEvent(action, artifact_id=artifact_id, row_start=row_start, row_end=row_end, notes=notes)
+        )
+
+    def drain(self) -> list[LineageEvent]:
+        events, self._events = self._events, []
+        return events
+
+    def flush(self, conn: psycopg.Connection) -> int:
+        events = self.drain()
+        if events:
+            copy_events(conn, self.run_id, events)
+        return len(events)
+
+    def flush_async(self, writer: LineageWriter) -> int:
+        events = self.drain()
+        if events:
+            writer.submit(self.run_id, events)
+        return len(events)
+
+
+class LineageWriter:
+    """Background thread that COPYs submitted lineage batches on its own connection.
+
+    Batches queued while a write is in progress are merged per run_id, so a burst of
+    small flushes still ends up as a few COPY statements.
+    """
+
+    def __init__(self, dsn: str, *, max_pending: int = 1000):
+        self.dsn = dsn
+        self.logger = logging.getLogger("ingest.lineage")
+        self._queue: queue.Queue[tuple[str, list[LineageEvent]] | None] = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="lineage-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, run_id: str, events: list[LineageEvent]) -> None:
+        self._queue.put((run_id, events))
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write everything submitted so far, then stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            pending: dict[str, list[LineageEvent]] = {item[0]: list(item[1])}
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.setdefault(item[0], []).extend(item[1])
+            self._write(pending)
+
+    def _write(self, pending: dict[str, list[LineageEvent]]) -> None:
+        try:
+            with psycopg.connect(self.dsn) as conn:
+                for run_id, events in pending.items():
+                    copy_events(conn, run_id, events)
+        except Exception as exc:  # lineage must never take the worker down
+            dropped = sum(len(events) for events in pending.values())
+            self.logger.exception("lineage write failed", extra={"error": str(exc), "dropped": dropped})
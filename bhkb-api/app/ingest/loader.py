@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import uuid
+from typing import Iterable, Iterator, Sequence
+
+import psycopg
+
+from app.ingest.lineage import LineageRecorder
+from app.ingest.parsing import ParsedRecord
+
+
+RECORD_COPY = (
+    "COPY normalized_record (id, artifact_id, row_index, payload, schema_version, valid, errors) "
+    "FROM STDIN (FORMAT BINARY)"
+)
+RECORD_TYPES = ["uuid", "uuid", "int4", "jsonb", "text", "bool", "jsonb"]
+
+PARSED_ACTION = "PARSED"
+
+
+def skip_committed(batches: Iterable[list[ParsedRecord]], checkpoint: int | None) -> Iterator[list[ParsedRecord]]:
+    """Drop records at or below the checkpoint so a resumed task does not re-validate them."""
+    if checkpoint is None:
+        yield from batches
+        return
+    for batch in batches:
+        if batch and batch[-1].row_index <= checkpoint:
+            continue
+        if batch and batch[0].row_index <= checkpoint:
+            batch = [record for record in batch if record.row_index > checkpoint]
+        yield batch
+
+
+def _reset_output(cur: psycopg.Cursor, artifact_id: str, checkpoint: int | None) -> None:
+    """Delete output beyond the checkpoint (all of it on a fresh start)."""
+    if checkpoint is None:
+        cur.execute("DELETE FROM lineage WHERE artifact_id = %s AND action = %s", (artifact_id, PARSED_ACTION))
+        cur.execute("DELETE FROM normalized_record WHERE artifact_id = %s", (artifact_id,))
+        return
+    cur.execute(
+        "DELETE FROM lineage WHERE artifact_id = %s AND action = %s AND (row_end IS NULL OR row_end > %s)",
+        (artifact_id, PARSED_ACTION, checkpoint),
+    )
+    cur.execute("DELETE FROM normalized_record WHERE artifact_id = %s AND row_index > %s", (artifact_id, checkpoint))
+
+
+def discard_output(conn: psycopg.Connection, artifact_id: str) -> None:
+    """Delete everything loaded for an artifact, e.g. batches committed before a dead-letter."""
+    with conn.transaction():
+        with conn.cursor() as cur:
+            _reset_output(cur, artifact_id, None)
+            cur.execute("UPDATE ingest_task SET checkpoint_row = NULL WHERE artifact_id = %s", (artifact_id,))
+
+
+def load_records(
+    conn: psycopg.Connection,
+    task_id: str,
+    artifact_id: str,
+    batches: Iterable[Sequence[ParsedRecord]],
+    *,
+    lineage: LineageRecorder,
+    checkpoint: int | None = None,
+) -> int:
+    """Stream an artifact's record batches into normalized_record with binary COPY.
+
+    Each batch is committed on its own together with its PARSED range event and the
+    task's checkpoint_row, so a crash loses at most one batch. With checkpoint=None
+    earlier output of the artifact is replaced; otherwise rows above the checkpoint
+    are dropped and loading continues from there. Returns the rows written by this call.
+    """
+    artifact_uuid = uuid.UUID(str(artifact_id))
+    written = 0
+    with conn.transaction():
+        with conn.cursor() as cur:
+            _reset_output(cur, artifact_id, checkpoint)
+
+    for batch in batches:
+        if not batch:
+            continue
+        with conn.transaction():
+            with conn.cursor() as cur:
+                with cur.copy(RECORD_COPY) as copy:
+                    copy.set_types(RECORD_TYPES)
+                    for record in batch:
+                        copy.write_row(
+                            (
+                                uuid.uuid4(),
+                                artifact_uuid,
+                                record.row_index,
+                                record.payload,
+                                record.schema_version,
+                                record.valid,
+                                record.errors or None,
+                            )
+                        )
+                invalid = sum(1 for record in batch if not record.valid)
+                lineage.record_range(
+                    PARSED_ACTION,
+                    artifact_uuid,
+                    batch[0].row_index,
+                    batch[-1].row_index,
+                    notes=f"{invalid} invalid" if invalid else None,
+                )
+                lineage.flush(conn)
+                cur.execute(
+                    "UPDATE ingest_task SET checkpoint_row = %s, updated_at = now() WHERE id = %s",
+                    (batch[-1].row_index, task_id),
+                )
+        written += len(batch)
+
+    total = written + (checkpoint + 1 if checkpoint is not None else 0)
+    with conn.transaction():
+        lineage.record(PARSED_ACTION, artifact_id=artifact_uuid, notes=f"{total} records")
+        lineage.flush(conn)
+    return written
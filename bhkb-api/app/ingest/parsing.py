@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from decimal import Decimal
+from pathlib import PurePosixPath
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+from app.ingest.errors import ParseError, UnsupportedFormatError
+
+
+CSV_EXTENSIONS = {".csv", ".tsv", ".txt"}
+XLSX_EXTENSIONS = {".xlsx", ".xlsm"}
+CSV_MIME_TYPES = {"text/csv", "text/tab-separated-values", "application/csv"}
+XLSX_MIME_TYPES = {
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.ms-excel.sheet.macroenabled.12",
+}
+CSV_DELIMITERS = (",", ";", "\t", "|")
+
+
+@dataclass(slots=True)
+class ParsedRecord:
+    row_index: int
+    payload: dict[str, Any]
+    schema_version: str
+    valid: bool = True
+    errors: list[str] = field(default_factory=list)
+
+
+def detect_format(filename: str | None, mime_type: str | None) -> str:
+    """Return 'csv' or 'xlsx' for a supported artifact, else raise UnsupportedFormatError."""
+    mime = (mime_type or "").split(";")[0].strip().lower()
+    if mime in XLSX_MIME_TYPES:
+        return "xlsx"
+    if mime in CSV_MIME_TYPES:
+        return "csv"
+
+    suffix = PurePosixPath(filename or "").suffix.lower()
+    if suffix in XLSX_EXTENSIONS:
+        return "xlsx"
+    if suffix in CSV_EXTENSIONS:
+        return "csv"
+    raise UnsupportedFormatError(f"unsupported artifact type: {filename!r} ({mime_type or 'no mime'})")
+
+
+def sniff_delimiter(line: str) -> str:
+    """Pick the most frequent candidate delimiter on the header line (comma by default)."""
+    counts = {delim: line.count(delim) for delim in CSV_DELIMITERS}
+    best = max(counts, key=counts.__getitem__)
+    return best if counts[best] else ","
+
+
+def iter_csv_rows(raw: IO[bytes], encoding: str = "utf-8-sig") -> Iterator[list[str]]:
+    """Yield CSV rows from a binary stream without reading it fully into memory."""
+    text = io.TextIOWrapper(raw, encoding=encoding, newline="")
+    try:
+        first = text.readline()
+        if not first:
+            return
+        reader = csv.reader(itertools.chain([first], text), delimiter=sniff_delimiter(first))
+        yield from reader
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ParseError(f"invalid csv: {exc}") from exc
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(fileobj: IO[bytes]) -> Iterator[tuple[Any, ...]]:
+    """Yield rows of the first worksheet using openpyxl's read-only mode."""
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as exc:  # openpyxl raises zipfile/KeyError/ValueError variants
+        raise ParseError(f"invalid xlsx: {exc}") from exc
+    try:
+        sheet = workbook.worksheets[0]
+        yield from sheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _json_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _is_blank(row: Sequence[Any]) -> bool:
+    return all(cell is None or (isinstance(cell, str) and not cell.strip()) for cell in row)
+
+
+def build_header(row: Sequence[Any]) -> list[str]:
+    """Normalize header cells: blank names become col_N and duplicates get a suffix."""
+    header: list[str] = []
+    seen: dict[str, int] = {}
+    for idx, cell in enumerate(row):
+        name = str(cell).strip() if cell is not None else ""
+        name = name or f"col_{idx}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 0
+        header.append(name)
+    return header
+
+
+def build_payload(header: Sequence[str], row: Sequence[Any]) -> dict[str, Any]:
+    """Every header column becomes a key, None where a short row has no cell."""
+    payload: dict[str, Any] = dict.fromkeys(header)
+    for idx, cell in enumerate(row):
+        key = header[idx] if idx < len(header) else f"col_{idx}"
+        payload[key] = _json_value(cell)
+    return payload
+
+
+def iter_record_batches(
+    row_batches: Iterable[Sequence[Sequence[Any]]], schema_version: str
+) -> Iterator[list[ParsedRecord]]:
+    """Turn batches of raw rows into batches of records keyed by the first non-blank row.
+
+    Blank rows are skipped; row_index counts data rows from zero across batches.
+    """
+    header: list[str] | None = None
+    row_index = 0
+    for rows in row_batches:
+        batch: list[ParsedRecord] = []
+        for row in rows:
+            if _is_blank(row):
+                continue
+            if header is None:
+                header = build_header(row)
+                continue
+            batch.append(ParsedRecord(row_index=row_index, payload=build_payload(header, row), schema_version=schema_version))
+            row_index += 1
+        if batch:
+            yield batch
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import io
+import itertools
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Sequence
+
+from minio import Minio
+
+from app.ingest.parsing import iter_csv_rows, iter_xlsx_rows
+
+
+STREAM_BUFFER_BYTES = 1024 * 1024
+RANGE_BYTES = 1024 * 1024
+
+
+class RangedObjectReader(io.RawIOBase):
+    """Seekable read-only view of an S3 object that fetches bytes with ranged GETs.
+
+    Formats such as XLSX (zip) read their directory from the end of the file and then
+    jump between members; this serves those reads without downloading the object.
+    Wrap it in io.BufferedReader so each GET fetches a whole buffer.
+    """
+
+    def __init__(self, client: Minio, bucket: str, key: str, size: int | None = None):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._size = size if size is not None else client.stat_object(bucket, key).size
+        self._pos = 0
+        self.requests = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= self._size:
+            return 0
+        length = min(len(buffer), self._size - self._pos)
+        response = self._client.get_object(self._bucket, self._key, offset=self._pos, length=length)
+        try:
+            data = response.read(length)
+        finally:
+            response.close()
+            response.release_conn()
+        self.requests += 1
+        n = len(data)
+        buffer[:n] = data
+        self._pos += n
+        return n
+
+
+@contextmanager
+def open_artifact_stream(client: Minio, bucket: str, key: str, fmt: str) -> Iterator[IO[bytes]]:
+    """Open an artifact for parsing without materialising it locally.
+
+    CSV is read front to back from a single streaming GET; XLSX gets a seekable
+    reader backed by ranged GETs.
+    """
+    if fmt == "xlsx":
+        with io.BufferedReader(RangedObjectReader(client, bucket, key), buffer_size=RANGE_BYTES) as stream:
+            yield stream
+        return
+
+    response = client.get_object(bucket, key)
+    try:
+        yield io.BufferedReader(response, buffer_size=STREAM_BUFFER_BYTES)
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def iter_row_batches(stream: IO[bytes], fmt: str, batch_size: int) -> Iterator[list[Sequence[Any]]]:
+    """Yield raw rows in lists of at most batch_size; only one batch is alive at a time."""
+    rows = iter_csv_rows(stream) if fmt == "csv" else iter_xlsx_rows(stream)
+    while batch := list(itertools.islice(rows, batch_size)):
+        yield batch
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.ingest.errors import UnknownSchemaError
+from app.ingest.parsing import ParsedRecord
+
+
+FIELD_TYPES = ("string", "number", "integer", "date")
+
+# Plain decimals after separator cleanup: "1234.5", "-7", "1e-05" (str() of small floats).
+_PLAIN_NUMBER = r"^[+-]?\d+(\.\d+)?([eE][+-]?\d+)?$"
+# BCS formatting: decimal comma, dots as thousands ("1.234,56", "12,5", "1.234.567").
+_COMMA_DECIMAL = r"^[+-]?(\d{1,3}(\.\d{3})+,\d+|\d{1,3}(\.\d{3}){2,}|\d+,\d+)$"
+# English thousands: "1,234.56", "1,234,567".
+_COMMA_THOUSANDS = r"^[+-]?\d{1,3}(,\d{3})+(\.\d+)?$"
+_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%d.%m.%Y", "%d/%m/%Y")
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    type: str = "string"
+    required: bool = False
+    aliases: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.type not in FIELD_TYPES:
+            raise ValueError(f"unknown field type {self.type!r} for {self.name!r}")
+
+
+@dataclass(frozen=True)
+class SchemaSpec:
+    version: str
+    fields: tuple[FieldSpec, ...]
+
+
+BUILTIN_SCHEMAS: dict[str, SchemaSpec] = {
+    "customer-ledger@1.0": SchemaSpec(
+        version="customer-ledger@1.0",
+        fields=(
+            FieldSpec("konto", "string", required=True, aliases=("account",)),
+            FieldSpec("datum", "date", required=True, aliases=("date", "datum knjiženja", "datum_knjizenja")),
+            FieldSpec("dokument", "string", aliases=("document", "broj dokumenta")),
+            FieldSpec("opis", "string", aliases=("description",)),
+            FieldSpec("duguje", "number", aliases=("debit",)),
+            FieldSpec("potrazuje", "number", aliases=("potražuje", "credit")),
+            FieldSpec("iznos", "number", aliases=("amount",)),
+            FieldSpec("saldo", "number", aliases=("balance",)),
+        ),
+    ),
+}
+
+
+def _as_strings(values: Sequence[Any]) -> pa.Array:
+    return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def coerce_numbers(values: Sequence[Any]) -> tuple[pa.Array, np.ndarray]:
+    """Parse a column of numbers written in BCS or English notation.
+
+    Returns float64 values (null where missing or invalid) and a mask of cells that
+    were present but not numeric. All work happens in Arrow kernels, not per cell.
+    """
+    text = pc.replace_substring_regex(pc.utf8_trim_whitespace(_as_strings(values)), r"[\s']", "")
+    comma_decimal = pc.match_substring_regex(text, _COMMA_DECIMAL)
+    comma_thousands = pc.match_substring_regex(text, _COMMA_THOUSANDS)
+    text = pc.if_else(
+        comma_decimal,
+        pc.replace_substring(pc.replace_substring(text, ".", ""), ",", "."),
+        pc.if_else(comma_thousands, pc.replace_substring(text, ",", ""), text),
+    )
+    present = pc.and_(pc.is_valid(text), pc.not_equal(text, ""))
+    ok = pc.and_(present, pc.match_substring_regex(text, _PLAIN_NUMBER))
+    numbers = pc.cast(pc.if_else(ok, text, pa.scalar(None, pa.string())), pa.float64())
+    invalid = pc.and_(present, pc.invert(ok)).to_numpy(zero_copy_only=False)
+    return numbers, invalid.astype(bool)
+
+
+def _parse_exact(text: pa.Array, fmt: str) -> pa.Array:
+    # strptime rolls impossible days forward ("31.02.2024" -> 2 March); a value only
+    # counts if formatting it back reproduces the input.
+    parsed = pc.strptime(text, format=fmt, unit="s", error_is_null=True)
+    exact = pc.equal(pc.strftime(parsed, format=fmt), text)
+    return pc.if_else(pc.fill_null(exact, False), parsed, pa.scalar(None, parsed.type))
+
+
+def coerce_dates(values: Sequence[Any]) -> tuple[pa.Array, np.ndarray]:
+    """Parse ISO and dd.mm.yyyy style dates; returns ISO date strings and the invalid mask.
+
+    Calendar-impossible dates such as 31.02. are invalid, not rolled forward.
+    """
+    text = pc.replace_substring_regex(pc.utf8_trim_whitespace(_as_strings(values)), r"\.$", "")
+    # Zero-pad single-digit day/month ("1.2.2024" -> "01.02.2024") so the round trip
+    # compares like with like; two passes cover adjacent single digits.
+    for _ in range(2):
+        text = pc.replace_substring_regex(text, r"(^|\D)(\d)(\D|$)", r"\10\2\3")
+    parsed = pc.coalesce(*(_parse_exact(text, fmt) for fmt in _DATE_FORMATS))
+    dates = pc.cast(pc.cast(parsed, pa.date32()), pa.string())
+    present = pc.and_(pc.is_valid(text), pc.not_equal(text, ""))
+    invalid = pc.and_(present, pc.is_null(parsed)).to_numpy(zero_copy_only=False)
+    return dates, invalid.astype(bool)
+
+
+class CompiledValidator:
+    """Validator for one schema_version, built once and reused for every batch."""
+
+    def __init__(self, spec: SchemaSpec):
+        self.spec = spec
+        self._lookup: dict[str, FieldSpec] = {}
+        for field in spec.fields:
+            for name in (field.name, *field.aliases):
+                self._lookup[name.casefold()] = field
+        self._columns: dict[tuple[str, ...], dict[str, str]] = {}
+
+    def resolve(self, keys: tuple[str, ...]) -> dict[str, str]:
+        """Map schema field names to the payload keys used by this artifact's header."""
+        columns = self._columns.get(keys)
+        if columns is None:
+            columns = {}
+            for key in keys:
+                field = self._lookup.get(key.strip().casefold())
+                if field is not None and field.name not in columns:
+                    columns[field.name] = key
+            self._columns[keys] = columns
+        return columns
+
+    def validate_batch(self, batch: list[ParsedRecord]) -> list[ParsedRecord]:
+        """Coerce typed columns in place and flag invalid rows with reasons.
+
+        Invalid rows are kept with valid=False so one bad line never fails the batch.
+        """
+        if not batch:
+            return batch
+        columns = self.resolve(tuple(dict.fromkeys(key for record in batch for key in record.payload)))
+        size = len(batch)
+        reasons: dict[int, list[str]] = {}
+
+        for field in self.spec.fields:
+            key = columns.get(field.name)
+            if key is None:
+                if field.required:
+                    for idx in range(size):
+                        reasons.setdefault(idx, []).append(f"missing required field '{field.name}'")
+                continue
+
+            values = [record.payload.get(key) for record in batch]
+            if field.required:
+                missing = np.fromiter((v is None or v == "" for v in values), dtype=bool, count=size)
+                for idx in np.flatnonzero(missing):
+                    reasons.setdefault(int(idx), []).append(f"missing required field '{field.name}'")
+            if field.type == "string":
+                continue
+
+            if field.type == "date":
+                coerced, invalid = coerce_dates(values)
+            else:
+                coerced, invalid = coerce_numbers(values)
+                if field.type == "integer":
+                    fractional = pc.fill_null(pc.not_equal(pc.floor(coerced), coerced), False)
+                    invalid |= fractional.to_numpy(zero_copy_only=False).astype(bool)
+                    coerced = pc.cast(pc.if_else(fractional, pa.scalar(None, pa.float64()), coerced), pa.int64())
+            for idx in np.flatnonzero(invalid):
+                reasons.setdefault(int(idx), []).append(f"invalid {field.type} in '{key}': {values[idx]!r}")
+
+            for record, value, bad in zip(batch, coerced.to_pylist(), invalid):
+                if not bad and value is not None:
+                    record.payload[key] = value
+
+        for idx, messages in reasons.items():
+            batch[idx].valid = False
+            batch[idx].errors = messages
+        return batch
+
+
+class SchemaRegistry:
+    """Known schemas plus a cache of their compiled validators."""
+
+    def __init__(self, specs: Mapping[str, SchemaSpec] | None = None):
+        self._specs = dict(BUILTIN_SCHEMAS if specs is None else specs)
+        self._compiled: dict[str, CompiledValidator] = {}
+
+    def register(self, spec: SchemaSpec) -> None:
+        self._specs[spec.version] = spec
+        self._compiled.pop(spec.version, None)
+
+    def get(self, version: str) -> CompiledValidator:
+        validator = self._compiled.get(version)
+        if validator is None:
+            spec = self._specs.get(version)
+            if spec is None:
+                raise UnknownSchemaError(f"unknown schema_version: {version}")
+            validator = self._compiled[version] = CompiledValidator(spec)
+        return validator
+
+
+REGISTRY = SchemaRegistry()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import logging
+import resource
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from minio import Minio
+from prometheus_client import Counter, Histogram
+
+from app.ingest.config import IngestSettings
+from app.ingest.db import (
+    ClaimedTask,
+    claim_tasks,
+    dead_letter_task,
+    mark_task_success,
+    requeue_stale_tasks,
+    retry_delay,
+    schedule_retry,
+)
+from app.ingest.errors import DLQReason, ParseError, UnknownSchemaError, UnsupportedFormatError
+from app.ingest.export import export_artifact
+from app.ingest.lineage import LineageRecorder, LineageWriter
+from app.ingest.loader import discard_output, load_records, skip_committed
+from app.ingest.parsing import detect_format, iter_record_batches
+from app.ingest.reader import iter_row_batches, open_artifact_stream
+from app.ingest.schemas import REGISTRY
+from app.watcher.db import open_conn, write_dead_letter
+
+
+TASKS_TOTAL = Counter(
+    "ingest_tasks_total",
+    "Ingest tasks finished by the parse pool",
+    labelnames=("status",),
+)
+RECORDS_PARSED = Counter("ingest_records_parsed_total", "Normalized records written by the parse pool")
+TASK_SECONDS = Histogram("ingest_task_seconds", "Wall time from task submit to completion")
+
+FAILED_ACTION = "INGEST_FAILED"
+DLQ_ACTION = "DEAD_LETTERED"
+
+# Per-process MinIO client, created by the pool initializer.
+_MINIO: Minio | None = None
+
+
+def make_minio(settings: IngestSettings) -> Minio:
+    endpoint = (settings.S3_ENDPOINT or "").replace("http://", "").replace("https://", "")
+    return Minio(
+        endpoint,
+        access_key=settings.S3_ACCESS_KEY,
+        secret_key=settings.S3_SECRET_KEY,
+        secure=settings.S3_ENDPOINT.startswith("https") if settings.S3_ENDPOINT else False,
+    )
+
+
+def parse_s3_uri(uri: str) -> tuple[str, str]:
+    if not uri.startswith("s3://"):
+        raise ValueError(f"not an s3 uri: {uri}")
+    bucket, _, key = uri[len("s3://") :].partition("/")
+    if not bucket or not key:
+        raise ValueError(f"s3 uri needs bucket and key: {uri}")
+    return bucket, key
+
+
+def _init_worker(settings: IngestSettings) -> None:
+    """Pool initializer: cap the address space and build the process-local S3 client."""
+    global _MINIO
+    if settings.PARSE_TASK_MEMORY_MB > 0:
+        limit = settings.PARSE_TASK_MEMORY_MB * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    _MINIO = make_minio(settings)
+
+
+def process_task(task: ClaimedTask, settings: IngestSettings, run_id: str) -> int:
+    """Parse one artifact into normalized_record rows; runs inside a pool process.
+
+    Returns the number of records written. A task that already has a checkpoint_row
+    re-reads the artifact but only writes rows after it. Status bookkeeping stays in
+    the parent so that a crashed child can still be accounted for.
+    """
+    client = _MINIO or make_minio(settings)
+    fmt = detect_format(task.filename, task.mime_type)
+    validator = REGISTRY.get(settings.DEFAULT_SCHEMA_VERSION)
+    bucket, key = parse_s3_uri(task.s3_uri)
+    with open_artifact_stream(client, bucket, key, fmt) as stream:
+        row_batches = iter_row_batches(stream, fmt, settings.RECORD_BATCH_SIZE)
+        records = iter_record_batches(row_batches, settings.DEFAULT_SCHEMA_VERSION)
+        batches = map(validator.validate_batch, skip_committed(records, task.checkpoint_row))
+        conn = open_conn(settings.DATABASE_URL)
+        try:
+            count = load_records(
+                conn, task.id, task.artifact_id, batches, lineage=LineageRecorder(run_id), checkpoint=task.checkpoint_row
+            )
+            if settings.EXPORT_PARQUET:
+                export_artifact(conn, client, bucket, key, task.artifact_id, validator)
+            return count
+        finally:
+            conn.close()
+
+
+class IngestWorker:
+    def __init__(self, settings: IngestSettings, stop_event: threading.Event):
+        self.settings = settings
+        self.stop_event = stop_event
+        self.logger = logging.getLogger("ingest")
+        self.run_id = uuid.uuid4().hex
+        self.dsn = settings.DATABASE_URL
+        self.executor = self._make_executor()
+        self.in_flight: dict[Future, tuple[ClaimedTask, float]] = {}
+        # Failure/DLQ events happen outside any data transaction; write them off-loop.
+        self.lineage = LineageRecorder(self.run_id)
+        self.lineage_writer = self._make_lineage_writer()
+
+    def _make_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.settings.PARSE_POOL_SIZE,
+            initializer=_init_worker,
+            initargs=(self.settings,),
+            max_tasks_per_child=self.settings.PARSE_TASKS_PER_CHILD or None,
+        )
+
+    def _make_lineage_writer(self) -> LineageWriter:
+        return LineageWriter(self.dsn)
+
+    def run_forever(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as exc:  # pragma: no cover - catch-all to keep loop alive
+                self.logger.exception("poll failed", extra={"run_id": self.run_id, "error": str(exc)})
+            if self.in_flight:
+                wait(list(self.in_flight), timeout=self.settings.POLL_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            else:
+                self.stop_event.wait(timeout=self.settings.POLL_INTERVAL_SECONDS)
+        wait(list(self.in_flight))
+        self.poll_once(claim=False)
+        self.executor.shutdown(wait=True)
+        self.lineage_writer.close()
+
+    def poll_once(self, claim: bool = True) -> None:
+        """Record finished tasks, then top the pool up with newly claimed ones."""
+        conn = open_conn(self.dsn)
+        try:
+            broken = False
+            for future in [f for f in self.in_flight if f.done()]:
+                task, started = self.in_flight.pop(future)
+                broken |= self._finish(conn, task, future)
+                TASK_SECONDS.observe(time.time() - started)
+            if broken:
+                self.logger.warning("parse pool broken, restarting", extra={"run_id": self.run_id})
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._make_executor()
+
+            if not claim:
+                return
+            stale, exhausted = requeue_stale_tasks(conn, self.settings.TASK_LEASE_SECONDS, self.settings.MAX_ATTEMPTS)
+            if stale:
+                self.logger.warning("requeued stale tasks", extra={"run_id": self.run_id, "count": stale})
+            for task in exhausted:
+                # Already moved to dlq by the requeue statement.
+                self._record_dead_letter(conn, task, DLQReason.ATTEMPTS_EXHAUSTED, "lease expired")
+            free = self.settings.PARSE_POOL_SIZE - len(self.in_flight)
+            for task in claim_tasks(conn, free):
+                future = self.executor.submit(process_task, task, self.settings, self.run_id)
+                self.in_flight[future] = (task, time.time())
+                self._log_event(
+                    "task_claimed", task, extra={"attempts": task.attempts, "checkpoint_row": task.checkpoint_row}
+                )
+        finally:
+            conn.close()
+            self.lineage.flush_async(self.lineage_writer)
+
+    def _finish(self, conn, task: ClaimedTask, future: Future) -> bool:
+        """Apply a finished future's outcome to its task; returns True when the pool died."""
+        try:
+            count = future.result()
+        except UnsupportedFormatError as exc:
+            self._dead_letter(conn, task, DLQReason.UNSUPPORTED_FORMAT, str(exc))
+        except ParseError as exc:
+            self._dead_letter(conn, task, DLQReason.PARSE_FAILED, str(exc))
+        except UnknownSchemaError as exc:
+            self._dead_letter(conn, task, DLQReason.UNKNOWN_SCHEMA, str(exc))
+        except BrokenProcessPool as exc:
+            self._retry_or_dead_letter(conn, task, f"worker process died: {exc}")
+            return True
+        except Exception as exc:
+            self._retry_or_dead_letter(conn, task, f"{type(exc).__name__}: {exc}")
+        else:
+            mark_task_success(conn, task.id)
+            TASKS_TOTAL.labels(status="success").inc()
+            RECORDS_PARSED.inc(count)
+            self._log_event("task_succeeded", task, extra={"records": count})
+        return False
+
+    def _retry_or_dead_letter(self, conn, task: ClaimedTask, error: str) -> None:
+        if task.attempts >= self.settings.MAX_ATTEMPTS:
+            self._dead_letter(conn, task, DLQReason.ATTEMPTS_EXHAUSTED, error)
+            return
+        delay = retry_delay(task.attempts, self.settings.RETRY_BASE_SECONDS, self.settings.RETRY_MAX_SECONDS)
+        schedule_retry(conn, task.id, error, delay)
+        self.lineage.record(FAILED_ACTION, artifact_id=task.artifact_id, notes=error)
+        TASKS_TOTAL.labels(status="failed").inc()
+        self._log_event(
+            "task_retry_scheduled", task, extra={"error": error, "attempts": task.attempts, "delay_s": round(delay, 1)}
+        )
+
+    def _dead_letter(self, conn, task: ClaimedTask, reason: DLQReason, error: str) -> None:
+        dead_letter_task(conn, task.id, error)
+        self._record_dead_letter(conn, task, reason, error)
+
+    def _record_dead_letter(self, conn, task: ClaimedTask, reason: DLQReason, error: str) -> None:
+        # Batches commit one by one, so a task can fail after loading part of its file;
+        # a dead-lettered artifact keeps no normalized records or PARSED lineage.
+        discard_output(conn, task.artifact_id)
+        write_dead_letter(
+            conn,
+            target=task.s3_uri,
+            failed_activity=reason.value,
+            last_error=error,
+            error_blob={"task_id": task.id, "artifact_id": task.artifact_id, "attempts": task.attempts},
+        )
+        self.lineage.record(DLQ_ACTION, artifact_id=task.artifact_id, notes=f"{reason.value}: {error}")
+        TASKS_TOTAL.labels(status="dlq").inc()
+        self._log_event("task_dead_lettered", task, extra={"reason": reason.value, "error": error})
+
+    def _log_event(self, event: str, task: ClaimedTask, extra: dict | None = None) -> None:
+        payload = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "level": "info",
+            "component": "ingest",
+            "run_id": self.run_id,
+            "event": event,
+            "task_id": task.id,
+            "artifact_id": task.artifact_id,
+        }
+        if extra:
+            payload.update(extra)
+        self.logger.info(json.dumps(payload))
@@ -17,9 +17,12 @@ from minio import Minio
 
 from app.core.config import Settings
 from app.core.logging import setup_logging
+from app.db.ann import AnnConfig, verify_index
 from app.db.session import create_pool
 from app.db.migrations import run_migrations
 from app.routers.search import router as search_router
+from app.services.cache import build_search_cache
+from app.services.embedding import build_embedder
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,6 +32,9 @@ async def lifespan(app: FastAPI):
     The lifespan context manager handles:
     - Logging setup
     - Database connection pool creation
+    - Check that the ANN index matches PGVECTOR_QUANTIZATION
+    - Search result cache setup
+    - Query embedder setup
     - HTTP client initialization
     - MinIO/S3 client setup
     - Database schema initialization
@@ -41,6 +47,8 @@ async def lifespan(app: FastAPI):
         app.state is FastAPI's built-in state management that stores:
         - settings: Application configuration
         - db_pool: PostgreSQL connection pool
+        - search_cache: Search result cache keyed on the index version
+        - embedder: Micro-batching query encoder for the dense retrieval path
         - http: Async HTTP client for external requests
         - minio: S3/MinIO client for object storage
     """
@@ -52,6 +60,9 @@ async def lifespan(app: FastAPI):
 
     # Initialize DB pool for PostgreSQL connections
     app.state.db_pool = await create_pool(settings.DATABASE_URL)
+    await verify_index(app.state.db_pool, AnnConfig.from_settings(settings))
+    app.state.search_cache = build_search_cache(settings, app.state.db_pool)
+    app.state.embedder = build_embedder(settings)
 
     # Create HTTP client with 30s timeout
     app.state.http = httpx.AsyncClient(timeout=30)
@@ -72,6 +83,8 @@ async def lifespan(app: FastAPI):
     finally:
         # Cleanup resources when application shuts down
         await app.state.http.aclose()
+        await app.state.search_cache.close()
+        await app.state.embedder.close()
         await app.state.db_pool.close()
 
 def create_app() -> FastAPI:
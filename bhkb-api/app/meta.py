@@ -1,40 +1,356 @@
 import re
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Mapping, Optional
+
+
+# Evidence terms per jurisdiction with a weight: official names and gazettes are strong,
+# bare place names weak. Latin spellings with and without diacritics plus Cyrillic.
+JURISDICTION_LEXICON: dict[str, dict[str, float]] = {
+    "FBIH": {
+        "Federacija Bosne i Hercegovine": 3.0,
+        "Federacije Bosne i Hercegovine": 3.0,
+        "Službene novine Federacije": 3.0,
+        "Sluzbene novine Federacije": 3.0,
+        "Porezna uprava Federacije": 3.0,
+        "Vlada Federacije": 2.0,
+        "FBiH": 2.0,
+        "F BiH": 2.0,
+        "Federacija": 1.0,
+        "Federacije": 1.0,
+        "Федерација Босне и Херцеговине": 3.0,
+        "Федерације Босне и Херцеговине": 3.0,
+        "ФБиХ": 2.0,
+        "Mostar": 0.5,
+        "Zenica": 0.5,
+        "Tuzla": 0.5,
+        "Bihać": 0.5,
+    },
+    "RS": {
+        "Republika Srpska": 3.0,
+        "Republike Srpske": 3.0,
+        "Republici Srpskoj": 3.0,
+        "Službeni glasnik Republike Srpske": 3.0,
+        "Poreska uprava Republike Srpske": 3.0,
+        "Република Српска": 3.0,
+        "Републике Српске": 3.0,
+        "Републици Српској": 3.0,
+        "Banja Luka": 0.5,
+        "Banjaluka": 0.5,
+        "Бања Лука": 0.5,
+        "Бањалука": 0.5,
+        "Bijeljina": 0.5,
+        "Бијељина": 0.5,
+    },
+    "BD": {
+        "Brčko distrikt": 3.0,
+        "Brčko distrikta": 3.0,
+        "Brcko distrikt": 3.0,
+        "Brcko distrikta": 3.0,
+        "Брчко дистрикт": 3.0,
+        "Брчко дистрикта": 3.0,
+        "Brčko": 1.0,
+        "Brcko": 1.0,
+        "Брчко": 1.0,
+    },
+    "BIH": {
+        "Službeni glasnik BiH": 3.0,
+        "Službeni glasnik Bosne i Hercegovine": 3.0,
+        "Parlamentarna skupština Bosne i Hercegovine": 3.0,
+        "Vijeće ministara": 2.0,
+        "Savjet ministara": 2.0,
+        "Uprava za indirektno oporezivanje": 3.0,
+        "Управа за индиректно опорезивање": 3.0,
+        "Савјет министара": 2.0,
+        "Службени гласник БиХ": 3.0,
+        "Bosne i Hercegovine": 0.5,
+        "Босне и Херцеговине": 0.5,
+    },
+}
+
+# URL fragments checked before the text; a hit here decides on its own.
+JURISDICTION_URL_MARKERS: dict[str, tuple[str, ...]] = {
+    "FBIH": ("pufbih", "fbihvlada", "fbih.gov", "fmf.gov"),
+    "BD": ("brcko", "bdcentral"),
+    "RS": ("vladars", "rs.gov", "poreskaupravars", "vlada"),
+    "BIH": ("uino.gov", "vijeceministara"),
+}
+
+
+def _alternation(terms: list[str]) -> str:
+    # One group per term, so a match maps back by group name rather than by re-folding
+    # its text: IGNORECASE matches "İ" for "i", but "İ".casefold() is "i̇".
+    return "|".join(f"(?P<t{index}>{re.escape(term)})" for index, term in enumerate(terms))
+
+
+def _longest_first(terms: Iterable[str]) -> list[str]:
+    # Longest first so "Federacije Bosne i Hercegovine" wins over "Bosne i Hercegovine".
+    return sorted(set(terms), key=len, reverse=True)
+
+
+@dataclass(frozen=True)
+class JurisdictionGuess:
+    code: Optional[str]
+    confidence: float
+    scores: dict[str, float] = field(default_factory=dict)
+
+
+class JurisdictionClassifier:
+    """
+    Classify documents by jurisdiction with one precompiled alternation over the lexicon.
+
+    Only the first `header_chars` and last `footer_chars` characters are scanned, where
+    issuers and gazette names appear. Confidence is the winner's share of the evidence,
+    scaled down until its score reaches `saturation`.
+    """
+
+    def __init__(
+        self,
+        lexicon: Mapping[str, Mapping[str, float]] = JURISDICTION_LEXICON,
+        url_markers: Mapping[str, Iterable[str]] = JURISDICTION_URL_MARKERS,
+        header_chars: int = 4000,
+        footer_chars: int = 1500,
+        saturation: float = 3.0,
+    ):
+        self.header_chars = header_chars
+        self.footer_chars = footer_chars
+        self.saturation = saturation
+        self._weights: dict[str, tuple[str, float]] = {}
+        for code, terms in lexicon.items():
+            for term, weight in terms.items():
+                self._weights[term.casefold()] = (code, weight)
+        self._text_terms = _longest_first(self._weights)
+        self._text_pattern = re.compile(rf"(?<!\w)(?:{_alternation(self._text_terms)})(?!\w)", re.IGNORECASE)
+
+        self._url_codes: dict[str, str] = {}
+        for code, markers in url_markers.items():
+            for marker in markers:
+                self._url_codes[marker.lower()] = code
+        self._url_terms = _longest_first(self._url_codes)
+        self._url_pattern = re.compile(_alternation(self._url_terms), re.IGNORECASE)
+
+    def _windows(self, text: str) -> list[tuple[int, int]]:
+        size = len(text)
+        header_end = min(size, self.header_chars)
+        footer_start = max(header_end, size - self.footer_chars)
+        return [(0, header_end), (footer_start, size)] if footer_start < size else [(0, header_end)]
+
+    def classify(self, text: str, url: Optional[str] = None) -> JurisdictionGuess:
+        if url:
+            match = self._url_pattern.search(url)
+            if match:
+                code = self._url_codes[self._url_terms[int(match.lastgroup[1:])]]
+                return JurisdictionGuess(code, 1.0, {code: self.saturation})
+
+        scores: dict[str, float] = {}
+        text = text or ""
+        for start, end in self._windows(text):
+            for match in self._text_pattern.finditer(text, start, end):
+                code, weight = self._weights[self._text_terms[int(match.lastgroup[1:])]]
+                scores[code] = scores.get(code, 0.0) + weight
+        if not scores:
+            return JurisdictionGuess(None, 0.0, scores)
+
+        code, best = max(scores.items(), key=lambda item: item[1])
+        confidence = best / sum(scores.values()) * min(1.0, best / self.saturation)
+        return JurisdictionGuess(code, round(confidence, 3), scores)
+
+    def classify_many(self, documents: Iterable[tuple[Optional[str], str]]) -> Iterator[JurisdictionGuess]:
+        """Classify (url, text) pairs lazily, reusing the compiled patterns."""
+        for url, text in documents:
+            yield self.classify(text, url)
+
+
+DEFAULT_CLASSIFIER = JurisdictionClassifier()
 
 
 def guess_jurisdiction(url: str, text: str) -> Optional[str]:
     """
     Heuristically derive jurisdiction from a URL or text body.
 
-    Priority is URL, with a fallback to scanning text for known markers.
-    Returns a short code when recognized, otherwise None.
+    Priority is URL, with a fallback to scanning the header/footer of the text for
+    known issuers and places. Returns a short code when recognized, otherwise None.
     """
-    lower_url = (url or "").lower()
-    lower_text = (text or "").lower()
+    return DEFAULT_CLASSIFIER.classify(text, url).code
 
-    if "pufbih" in lower_url or "federacija" in lower_text:
-        return "FBIH"
 
-    if "brcko" in lower_url or "brčko" in lower_text or "brcko" in lower_text:
-        return "BD"
+_MONTHS: dict[str, int] = {}
+for _number, _names in enumerate(
+    (
+        ("januar", "januara", "siječanj", "siječnja", "sijecnja", "јануар", "јануара"),
+        ("februar", "februara", "veljača", "veljače", "veljace", "фебруар", "фебруара"),
+        ("mart", "marta", "ožujak", "ožujka", "ozujka", "март", "марта"),
+        ("april", "aprila", "travanj", "travnja", "април", "априла"),
+        ("maj", "maja", "svibanj", "svibnja", "мај", "маја"),
+        ("juni", "jun", "juna", "lipanj", "lipnja", "јун", "јуна"),
+        ("juli", "jul", "jula", "srpanj", "srpnja", "јул", "јула"),
+        ("august", "augusta", "avgust", "avgusta", "kolovoz", "kolovoza", "август", "августа"),
+        ("septembar", "septembra", "rujan", "rujna", "септембар", "септембра"),
+        ("oktobar", "oktobra", "listopad", "listopada", "октобар", "октобра"),
+        ("novembar", "novembra", "studeni", "studenoga", "studenog", "новембар", "новембра"),
+        ("decembar", "decembra", "prosinac", "prosinca", "децембар", "децембра"),
+    ),
+    start=1,
+):
+    for _name in _names:
+        _MONTHS[_name] = _number
 
-    if "vlada" in lower_url or "rs.gov" in lower_url:
-        return "RS"
+_ORDINALS: dict[str, int] = {}
+for _days, _words in {
+    # "narednog/sljedećeg/idućeg dana od dana objavljivanja" is the day after publication.
+    1: (
+        "prvog", "prvoga", "narednog", "narednoga", "sljedećeg", "sljedećega", "sljedeceg", "slijedećeg",
+        "idućeg", "idućega", "iduceg", "sledećeg", "sledeceg",
+        "првог", "првога", "наредног", "нареднога", "сљедећег", "сљедећега", "следећег", "идућег", "идућега",
+    ),
+    2: ("drugog", "drugoga", "другог", "другога"),
+    3: ("trećeg", "trećega", "treceg", "трећег", "трећега"),
+    4: ("četvrtog", "četvrtoga", "cetvrtog", "четвртог", "четвртога"),
+    5: ("petog", "petoga", "петог", "петога"),
+    6: ("šestog", "šestoga", "sestog", "шестог", "шестога"),
+    7: ("sedmog", "sedmoga", "седмог", "седмога"),
+    8: ("osmog", "osmoga", "осмог", "осмога"),
+    9: ("devetog", "devetoga", "деветог", "деветога"),
+    10: ("desetog", "desetoga", "десетог", "десетога"),
+    15: ("petnaestog", "petnaestoga", "петнаестог", "петнаестога"),
+    20: ("dvadesetog", "dvadesetoga", "двадесетог", "двадесетога"),
+    30: ("tridesetog", "tridesetoga", "тридесетог", "тридесетога"),
+}.items():
+    for _word in _words:
+        _ORDINALS[_word] = _days
 
-    return None
+# Phrases that introduce the start or end of validity. "applies" (primjena) is kept apart
+# from "in_force" (stupanje na snagu) because accounting rules care about application.
+_FROM_APPLIES = (
+    r"prim(?:j)?enj(?:uje|uju|ivat\s+će|ivaće)(?:\s+se)?\s+(?:počev\s+)?od|počinje\s+se\s+primjenjivati"
+    r"|прим(?:ј)?ењ(?:ује|ују|иваће)(?:\s+се)?\s+(?:почев\s+)?од|почиње\s+се\s+примјењивати"
+)
+_FROM_IN_FORCE = r"stupa(?:ju)?\s+na\s+snagu|stupila\s+je\s+na\s+snagu|ступа(?:ју)?\s+на\s+снагу"
+_TO = (
+    r"prestaje\s+(?:da\s+)?važiti|prestaje\s+da\s+važi|prestaje\s+se\s+primjenjivati|važi\s+do|primjenjuje\s+se\s+do"
+    r"|престаје\s+(?:да\s+)?важи(?:ти)?|важи\s+до|примјењује\s+се\s+до"
+)
+EFFECTIVE_ANCHOR = re.compile(
+    rf"(?P<applies>{_FROM_APPLIES})|(?P<in_force>{_FROM_IN_FORCE})|(?P<to>{_TO})", re.IGNORECASE
+)
+EFFECTIVE_VALUE = re.compile(
+    r"(?P<iso>(?P<iy>\d{4})-(?P<im>\d{2})-(?P<id>\d{2}))"
+    r"|(?P<num>(?P<nd>\d{1,2})\.\s?(?P<nm>\d{1,2})\.\s?(?P<ny>\d{4})\.?|(?P<sd>\d{1,2})/(?P<sm>\d{1,2})/(?P<sy>\d{4}))"
+    rf"|(?P<text>(?P<td>\d{{1,2}})\.?\s+(?P<tm>{'|'.join(sorted(_MONTHS, key=len, reverse=True))})\s+(?P<ty>\d{{4}}))"
+    rf"|(?P<ordinal>(?<!\w)(?P<ow>{'|'.join(sorted(_ORDINALS, key=len, reverse=True))})\s+(?:dana|дана))"
+    r"|(?P<sameday>danom\s+(?:objave|objavljivanja|donošenja)|даном\s+(?:објаве|објављивања|доношења))",
+    re.IGNORECASE,
+)
+# How far after an anchor the date or offset may appear.
+EFFECTIVE_WINDOW_CHARS = 160
 
 
-def extract_effective_from(text: str) -> Optional[str]:
+@dataclass(frozen=True)
+class DateCandidate:
+    kind: str  # "applies", "in_force" or "to"
+    date: Optional[str]  # ISO date when written out
+    offset_days: Optional[int]  # days after publication ("osmog dana od dana objavljivanja")
+    anchor_start: int
+    value_start: int
+    value_end: int
+
+
+@dataclass(frozen=True)
+class EffectiveDates:
+    effective_from: Optional[str]
+    effective_to: Optional[str]
+    candidates: list[DateCandidate] = field(default_factory=list)
+
+
+def _iso(year: str, month: int | str, day: str) -> Optional[str]:
+    try:
+        return date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def _value(match: "re.Match[str]") -> tuple[Optional[str], Optional[int]]:
+    if match["iso"]:
+        return _iso(match["iy"], match["im"], match["id"]), None
+    if match["nd"]:
+        return _iso(match["ny"], match["nm"], match["nd"]), None
+    if match["sd"]:
+        return _iso(match["sy"], match["sm"], match["sd"]), None
+    if match["text"]:
+        return _iso(match["ty"], _MONTHS[match["tm"].lower()], match["td"]), None
+    if match["ordinal"]:
+        return None, _ORDINALS[match["ow"].lower()]
+    return None, 0
+
+
+class EffectiveDateExtractor:
     """
-    Extract the first effective-from date in formats like DD.MM.YYYY.
-    Returns ISO yyyy-mm-dd or None when missing.
+    Find effective-from/to dates next to anchoring phrases ("stupa na snagu",
+    "primjenjuje se od", "prestaje važiti", and their Cyrillic forms).
+
+    Every anchor yields at most one candidate: the first date, ordinal day offset or
+    "danom objave" within `window` characters and before the next anchor. A written
+    application date beats an entry-into-force date; offsets are resolved only when a
+    publication date is supplied.
     """
-    match = re.search(r"(\d{1,2})[.\-/](\d{1,2})[.\-/](\d{2,4})", text)
-    if not match:
-        return None
 
-    day, month, year = match.groups()
-    if len(year) == 2:
-        year = f"20{year}"
+    def __init__(self, window: int = EFFECTIVE_WINDOW_CHARS):
+        self.window = window
 
-    return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+    def candidates(self, text: str) -> list[DateCandidate]:
+        anchors = list(EFFECTIVE_ANCHOR.finditer(text))
+        found: list[DateCandidate] = []
+        for idx, anchor in enumerate(anchors):
+            end = anchor.end() + self.window
+            if idx + 1 < len(anchors):
+                end = min(end, anchors[idx + 1].start())
+            value = EFFECTIVE_VALUE.search(text, anchor.end(), end)
+            if value is None:
+                continue
+            iso, offset = _value(value)
+            if iso is None and offset is None:
+                continue
+            found.append(DateCandidate(anchor.lastgroup, iso, offset, anchor.start(), value.start(), value.end()))
+        return found
+
+    def extract(self, text: str, publication_date: Optional[date] = None) -> EffectiveDates:
+        found = self.candidates(text or "")
+
+        def first(kind: str) -> Optional[str]:
+            for candidate in found:
+                if candidate.kind != kind:
+                    continue
+                if candidate.date:
+                    return candidate.date
+                if publication_date is not None and candidate.offset_days is not None:
+                    return (publication_date + timedelta(days=candidate.offset_days)).isoformat()
+            return None
+
+        return EffectiveDates(
+            effective_from=first("applies") or first("in_force"),
+            effective_to=first("to"),
+            candidates=found,
+        )
+
+    def extract_many(
+        self, texts: Iterable[str], publication_dates: Optional[Iterable[Optional[date]]] = None
+    ) -> Iterator[EffectiveDates]:
+        """Extract from many documents lazily with the module's precompiled patterns."""
+        if publication_dates is None:
+            for text in texts:
+                yield self.extract(text)
+            return
+        for text, published in zip(texts, publication_dates):
+            yield self.extract(text, published)
+
+
+DEFAULT_DATE_EXTRACTOR = EffectiveDateExtractor()
+
+
+def extract_effective_from(text: str) -> Optional[str]:
+    """
+    Extract the effective-from date announced by phrases like "stupa na snagu" or
+    "primjenjuje se od", in DD.MM.YYYY, ISO or "1. januara 2024." form.
+    Returns ISO yyyy-mm-dd or None when missing.
+    """
+    return DEFAULT_DATE_EXTRACTOR.extract(text).effective_from
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel, Field
+from app.db.ann import AnnConfig
 from app.db.session import get_pool  # type: ignore
+from app.services.cache import SearchCache, get_search_cache
+from app.services.hybrid import get_embedder, hybrid_search
 from app.services.search import keyword_search
 
 router = APIRouter()
@@ -13,11 +16,24 @@ class SearchResponse(BaseModel):
     query: str
     results: list[SearchResponseItem] = Field(default_factory=list, description="List of search results")
 
+class HybridResponseItem(BaseModel):
+    chunk_id: int
+    text: str
+    score: float = Field(description="Reciprocal Rank Fusion score")
+    dense_rank: int | None = None
+    lexical_rank: int | None = None
+
+class HybridSearchResponse(BaseModel):
+    query: str
+    results: list[HybridResponseItem] = Field(default_factory=list, description="MMR-ordered results")
+    timings_ms: dict[str, float] = Field(default_factory=dict, description="Wall time per stage")
+
 @router.get("", response_model=SearchResponse)
 async def search(
     q: str = Query(..., min_length=3, max_length=100, description="Search query string"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of results to return"),
-    pool=Depends(get_pool)
+    pool=Depends(get_pool),
+    cache: SearchCache = Depends(get_search_cache),
 ):
     """
     Perform a keyword search on document chunks using full-text search.
@@ -26,9 +42,56 @@ async def search(
         q (str): The search query string.
         limit (int, optional): The maximum number of results to return. Defaults to 10.
         pool (AsyncConnectionPool): The database connection pool, injected by FastAPI.
+        cache (SearchCache): Result cache; repeated queries skip the database until
+            the index version changes or the entry expires.
 
     Returns:
         SearchResponse: The search response containing the query and list of results.
     """
-    results = await keyword_search(pool, q, limit)
+    results = await cache.get_or_compute(q, limit, lambda: keyword_search(pool, q, limit))
     return SearchResponse(query=q, results=[SearchResponseItem(**r) for r in results])
+
+
+@router.get("/hybrid", response_model=HybridSearchResponse)
+async def search_hybrid(
+    request: Request,
+    q: str = Query(..., min_length=3, max_length=100, description="Search query string"),
+    limit: int | None = Query(None, ge=1, le=50, description="Results to return; defaults to FINAL_TOP_K"),
+    effort: float | None = Query(None, ge=0, le=1, description="ANN recall/latency trade-off; 1 is most accurate"),
+    pool=Depends(get_pool),
+    embedder=Depends(get_embedder),
+):
+    """
+    Perform a hybrid dense + full-text search fused with RRF and diversified with MMR.
+
+    Args:
+        request (Request): Used to read retrieval settings from app state.
+        q (str): The search query string.
+        limit (int, optional): The maximum number of results to return.
+        effort (float, optional): Sets ivfflat.probes / hnsw.ef_search for this request;
+            defaults to PGVECTOR_PROBES / PGVECTOR_EF_SEARCH. With PGVECTOR_QUANTIZATION
+            the quantized candidates are re-ranked on full-precision vectors.
+        pool (AsyncConnectionPool): The database connection pool, injected by FastAPI.
+        embedder (Embedder): Query encoder, injected by FastAPI.
+
+    Returns:
+        HybridSearchResponse: Results with their fused score and per-retriever ranks,
+        plus a per-stage timing breakdown.
+    """
+    settings = request.app.state.settings
+    result = await hybrid_search(
+        pool,
+        embedder,
+        q,
+        top_k=limit or settings.FINAL_TOP_K,
+        prefetch=settings.PREFETCH_LIMIT,
+        candidates=settings.RERANK_TOP_K,
+        diversity=settings.MMR_DIVERSITY,
+        ann=AnnConfig.from_settings(settings),
+        effort=effort,
+    )
+    return HybridSearchResponse(
+        query=q,
+        results=[HybridResponseItem(**vars(hit)) for hit in result.hits],
+        timings_ms=result.timings_ms,
+    )
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Mapping, Optional, Protocol
+
+from fastapi import Request
+from prometheus_client import Counter
+
+from app.services.singleflight import SingleFlight
+from app.text.normalize import normalize_query
+
+SEARCH_CACHE_REQUESTS = Counter(
+    "search_cache_requests_total",
+    "Search result cache lookups",
+    labelnames=("result",),
+)
+
+INDEX_VERSION_SQL = "SELECT version FROM search_index_state"
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryCache:
+    """Per-process LRU with a TTL per entry; expired entries are dropped on read."""
+
+    def __init__(self, maxsize: int = 1024, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class RedisCache:
+    """Shared cache for multi-worker deployments; values are stored as JSON.
+
+    The `redis` package is optional and only imported when this class is used.
+    """
+
+    def __init__(self, client: Any, prefix: str = "bhkb:search:"):
+        self._redis = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "bhkb:search:") -> RedisCache:
+        from redis import asyncio as _redis
+
+        return cls(_redis.from_url(url), prefix)
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._redis.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._redis.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=max(1, round(ttl)))
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class IndexVersion:
+    """The search index version that chunk writers bump, re-read at most every `refresh` seconds.
+
+    Cache keys embed the version, so a bump makes every older entry unreachable;
+    results can be at most `refresh` seconds stale after new chunks are committed.
+    """
+
+    def __init__(self, pool: Any, refresh: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.pool = pool
+        self.refresh = refresh
+        self._clock = clock
+        self._value = 0
+        self._next_read = float("-inf")
+
+    async def current(self) -> int:
+        now = self._clock()
+        if now >= self._next_read:
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(INDEX_VERSION_SQL)
+                row = await cursor.fetchone()
+            self._value = row[0] if row else 0
+            self._next_read = now + self.refresh
+        return self._value
+
+
+class SearchCache:
+    """Caches search results by index version, normalized query, limit and filters.
+
+    Misses for the same key are coalesced, so a burst of identical requests runs
+    one query and holds one pool connection. Without a version source every entry
+    lives until its TTL or LRU eviction.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        version: Optional[IndexVersion] = None,
+        ttl: float = 300.0,
+        flight: Optional[SingleFlight] = None,
+    ):
+        self.backend = backend
+        self.version = version
+        self.ttl = ttl
+        self.flight = flight or SingleFlight("search")
+
+    def key(self, version: int, q: str, limit: int, filters: Optional[Mapping[str, Any]] = None) -> str:
+        encoded = json.dumps(filters or {}, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return f"v{version}|{limit}|{encoded}|{normalize_query(q)}"
+
+    async def get_or_compute(
+        self,
+        q: str,
+        limit: int,
+        compute: Callable[[], Awaitable[Any]],
+        filters: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        version = await self.version.current() if self.version is not None else 0
+        key = self.key(version, q, limit, filters)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            SEARCH_CACHE_REQUESTS.labels(result="hit").inc()
+            return cached
+        SEARCH_CACHE_REQUESTS.labels(result="miss").inc()
+
+        async def load() -> Any:
+            value = await compute()
+            await self.backend.set(key, value, self.ttl)
+            return value
+
+        return await self.flight.do(key, load)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def build_search_cache(settings: Any, pool: Any) -> SearchCache:
+    """SearchCache configured from Settings: SEARCH_CACHE_BACKEND is "memory" or "redis"."""
+    if settings.SEARCH_CACHE_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("REDIS_URL is required when SEARCH_CACHE_BACKEND=redis")
+        backend: CacheBackend = RedisCache.from_url(settings.REDIS_URL)
+    elif settings.SEARCH_CACHE_BACKEND == "memory":
+        backend = MemoryCache(settings.SEARCH_CACHE_SIZE)
+    else:
+        raise ValueError(f"unknown SEARCH_CACHE_BACKEND: {settings.SEARCH_CACHE_BACKEND!r}")
+    version = IndexVersion(pool, settings.INDEX_VERSION_REFRESH_SECONDS)
+    return SearchCache(backend, version, settings.SEARCH_CACHE_TTL_SECONDS)
+
+
+def get_search_cache(request: Request) -> SearchCache:
+    cache: SearchCache = request.app.state.search_cache
+    return cache
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any, Sequence
+
+import numpy as np
+from prometheus_client import Histogram
+
+from app.text.embed import EmbeddingModel, HashingEmbedder, OnnxEmbedder
+
+EMBED_BATCH_SIZE = Histogram(
+    "embedding_batch_size",
+    "Texts per model call made by the embedding micro-batcher",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+
+class BatchingEmbedder:
+    """Async front for a blocking model that groups concurrent requests into one call.
+
+    A request waits at most `max_latency` seconds for others to join its batch,
+    and a batch never exceeds `max_batch` texts. One model call runs at a time, in
+    a worker thread, so the event loop stays free; the model parallelises inside
+    the call. Cancelled requests are dropped from the batch before it runs.
+    """
+
+    def __init__(self, model: EmbeddingModel, max_batch: int = 32, max_latency: float = 0.01):
+        if max_batch < 1:
+            raise ValueError("max_batch must be positive")
+        self.model = model
+        self.model_version = model.model_version
+        self.dim = model.dim
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future[np.ndarray]]] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        for text, future in zip(texts, futures):
+            self._queue.put_nowait((text, future))
+        return np.stack(await asyncio.gather(*futures))
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        return (await self.embed([text]))[0]
+
+    async def _next_batch(self) -> list[tuple[str, asyncio.Future[np.ndarray]]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_latency
+        while len(batch) < self.max_batch:
+            if self._queue.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+        return [(text, future) for text, future in batch if not future.done()]
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            EMBED_BATCH_SIZE.observe(len(batch))
+            try:
+                vectors = await asyncio.to_thread(self.model.embed, [text for text, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+        while not self._queue.empty():
+            self._queue.get_nowait()[1].cancel()
+
+
+def load_model(settings: Any) -> EmbeddingModel:
+    """Blocking model from Settings: EMBEDDING_BACKEND is "hashing" or "onnx"."""
+    if settings.EMBEDDING_BACKEND == "onnx":
+        if not (settings.EMBEDDING_MODEL_PATH and settings.EMBEDDING_TOKENIZER_PATH):
+            raise ValueError("EMBEDDING_MODEL_PATH and EMBEDDING_TOKENIZER_PATH are required when EMBEDDING_BACKEND=onnx")
+        if settings.EMBEDDING_MAX_TOKENS < settings.CHUNK_TOKENS:
+            raise ValueError("EMBEDDING_MAX_TOKENS must be >= CHUNK_TOKENS or chunk tails are never embedded")
+        return OnnxEmbedder(
+            settings.EMBEDDING_MODEL_PATH,
+            settings.EMBEDDING_TOKENIZER_PATH,
+            settings.EMBEDDING_MODEL_VERSION,
+            dim=settings.EMBEDDING_DIM,
+            max_length=settings.EMBEDDING_MAX_TOKENS,
+            threads=settings.EMBEDDING_THREADS,
+        )
+    if settings.EMBEDDING_BACKEND == "hashing":
+        return HashingEmbedder(settings.EMBEDDING_DIM)
+    raise ValueError(f"unknown EMBEDDING_BACKEND: {settings.EMBEDDING_BACKEND!r}")
+
+
+def build_embedder(settings: Any) -> BatchingEmbedder:
+    """The query-time embedder for app.state, batching with EMBED_MAX_BATCH / EMBED_MAX_LATENCY_MS."""
+    return BatchingEmbedder(load_model(settings), settings.EMBED_MAX_BATCH, settings.EMBED_MAX_LATENCY_MS / 1000)
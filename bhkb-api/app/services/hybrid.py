@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from fastapi import Request
+
+from app.db.ann import AnnConfig, apply_search_settings
+from app.text.embed import Embedder, to_vector_literal
+from app.text.normalize import normalize_query
+
+RRF_K = 60
+
+# Only vectors from the query's model are comparable; rows still awaiting a
+# re-embed after a model change are left to the lexical retriever. The model
+# predicate filters the ANN scan's output, so while two models' vectors coexist
+# the dense stage can return far fewer than `n` rows: re-embed the whole corpus
+# before switching EMBEDDING_MODEL_VERSION.
+DENSE_SQL = """
+SELECT id FROM chunk
+WHERE embedding IS NOT NULL AND duplicate_of IS NULL AND embedding_model = %(model)s
+ORDER BY embedding <=> %(v)s::vector
+LIMIT %(n)s
+"""
+
+# ANN over a quantized index expression, then exact cosine on the full-precision
+# vectors of just those rows.
+RESCORED_DENSE_SQL = """
+SELECT id FROM (
+    SELECT id, embedding FROM chunk
+    WHERE embedding IS NOT NULL AND duplicate_of IS NULL AND embedding_model = %(model)s
+    ORDER BY {distance}
+    LIMIT %(candidates)s
+) AS approx
+ORDER BY embedding <=> %(v)s::vector
+LIMIT %(n)s
+"""
+
+# Same match and ranking as chunk_search(), without the per-row ts_headline.
+LEXICAL_SQL = """
+SELECT c.id
+FROM chunk c, websearch_to_tsquery('simple', f_unaccent(lower(%(q)s))) AS query
+WHERE c.tsv @@ query AND c.duplicate_of IS NULL
+ORDER BY ts_rank_cd(c.tsv, query) DESC, c.id
+LIMIT %(n)s
+"""
+
+CANDIDATE_SQL = """
+SELECT c.id, c.embedding::real[],
+       ts_headline('chunk_fold', c.text, query,
+                   'StartSel=«, StopSel=», MinWords=15, MaxWords=35, MaxFragments=2, FragmentDelimiter=" … "')
+FROM chunk c, websearch_to_tsquery('simple', f_unaccent(lower(%(q)s))) AS query
+WHERE c.id = ANY(%(ids)s)
+"""
+
+
+@dataclass(frozen=True)
+class HybridHit:
+    chunk_id: int
+    text: str
+    score: float  # fused RRF score
+    dense_rank: int | None
+    lexical_rank: int | None
+
+
+@dataclass
+class HybridResult:
+    hits: list[HybridHit]
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+class _Timer:
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._mark = self._started
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._mark) * 1000, 3)
+        self._mark = now
+
+    def total(self) -> dict[str, float]:
+        self.timings["total"] = round((time.perf_counter() - self._started) * 1000, 3)
+        return self.timings
+
+
+def rrf_fuse(rankings: Sequence[Sequence[int]], k: int = RRF_K) -> dict[int, float]:
+    """Reciprocal Rank Fusion: sum of 1 / (k + rank) over the lists an id appears in."""
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return dict(sorted(scores.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+def mmr_select(relevance: np.ndarray, embeddings: np.ndarray, top_k: int, diversity: float) -> list[int]:
+    """Maximal Marginal Relevance over candidate rows; returns row indices in pick order.
+
+    Each step picks argmax((1 - diversity) * relevance - diversity * max similarity to
+    the picked rows). Similarities come from one matrix product; rows without an
+    embedding (all zeros) are similar to nothing.
+    """
+    n = len(relevance)
+    if n == 0 or top_k <= 0:
+        return []
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+    similarity = unit @ unit.T
+    max_similarity = np.zeros(n, dtype=np.float64)
+    available = np.ones(n, dtype=bool)
+    picked: list[int] = []
+    for _ in range(min(top_k, n)):
+        scores = (1 - diversity) * relevance - diversity * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return picked
+
+
+async def _ids(pool: Any, sql: str, params: dict[str, Any], search_settings: dict[str, str] | None = None) -> list[int]:
+    async with pool.connection() as conn:
+        async with conn.transaction():
+            if search_settings:
+                await apply_search_settings(conn, search_settings)
+            cursor = await conn.execute(sql, params)
+            return [row[0] for row in await cursor.fetchall()]
+
+
+async def hybrid_search(
+    pool: Any,
+    embedder: Embedder,
+    q: str,
+    *,
+    top_k: int = 12,
+    prefetch: int = 1000,
+    candidates: int = 50,
+    diversity: float = 0.6,
+    rrf_k: int = RRF_K,
+    ann: AnnConfig | None = None,
+    effort: float | None = None,
+) -> HybridResult:
+    """Dense + lexical retrieval fused with RRF, then diversified with MMR.
+
+    The dense (pgvector cosine) and lexical (tsvector) candidate queries run
+    concurrently on separate pool connections, `prefetch` rows each. The best
+    `candidates` fused ids are loaded with their embeddings and snippets, and MMR
+    picks `top_k` of them. Per-stage wall times are returned in milliseconds.
+    With `ann`, the dense query gets its probes/ef_search for `effort` (SET LOCAL)
+    and, when the index is quantized, re-scores candidates at full precision.
+    """
+    timer = _Timer()
+    query = normalize_query(q)
+    vector = await embedder.embed_query(q)  # the model was fed unnormalized chunk text too
+    timer.lap("embed")
+
+    dense_sql, ann_settings = DENSE_SQL, None
+    dense_params = {"v": to_vector_literal(vector), "model": embedder.model_version, "n": prefetch}
+    if ann is not None:
+        dense_params["n"], dense_params["candidates"] = ann.dense_limits(prefetch, effort)
+        ann_settings = ann.search_settings(effort)
+        if ann.quantization != "none":
+            dense_sql = dense_query(ann)
+    dense, lexical = await asyncio.gather(
+        _ids(pool, dense_sql, dense_params, ann_settings),
+        _ids(pool, LEXICAL_SQL, {"q": query, "n": prefetch}),
+    )
+    timer.lap("retrieve")
+
+    fused = rrf_fuse([dense, lexical], rrf_k)
+    ids = list(fused)[:candidates]
+    timer.lap("fuse")
+
+    rows: dict[int, tuple] = {}
+    if ids:
+        async with pool.connection() as conn:
+            cursor = await conn.execute(CANDIDATE_SQL, {"q": query, "ids": ids})
+            rows = {row[0]: row for row in await cursor.fetchall()}
+    ids = [i for i in ids if i in rows]  # chunks re-written since the candidate queries drop out
+    timer.lap("fetch")
+    if not ids:
+        return HybridResult([], timer.total())
+
+    embeddings = np.zeros((len(ids), embedder.dim), dtype=np.float32)
+    for index, chunk_id in enumerate(ids):
+        if rows[chunk_id][1] is not None:
+            embeddings[index] = rows[chunk_id][1]
+    relevance = np.array([fused[i] for i in ids], dtype=np.float64)
+    relevance /= relevance.max()
+    picked = mmr_select(relevance, embeddings, top_k, diversity)
+    timer.lap("mmr")
+
+    dense_rank = _ranks(dense)
+    lexical_rank = _ranks(lexical)
+    hits = [
+        HybridHit(ids[i], rows[ids[i]][2], round(fused[ids[i]], 6), dense_rank.get(ids[i]), lexical_rank.get(ids[i]))
+        for i in picked
+    ]
+    return HybridResult(hits, timer.total())
+
+
+def dense_query(ann: AnnConfig) -> str:
+    return RESCORED_DENSE_SQL.format(distance=ann.distance)
+
+
+def _ranks(ranking: Iterable[int]) -> dict[int, int]:
+    return {item: rank for rank, item in enumerate(ranking, start=1)}
+
+
+def get_embedder(request: Request) -> Embedder:
+    embedder: Embedder = request.app.state.embedder
+    return embedder
@@ -2,24 +2,23 @@ from __future__ import annotations
 
 from typing import Any
 
+from app.text.normalize import normalize_query
+
 
 async def keyword_search(pool: Any, q: str, limit: int = 10) -> list[dict[str, Any]]:
     """
-    Run a simple keyword search against stored chunks.
+    Run a ranked full-text search against stored chunks.
 
-    This implementation is intentionally lightweight for testing: it executes a
-    parameterized query through the provided pool and trims returned text to
-    500 characters.
+    chunk_search() (migrations d4b7f2a9c803 and f1a8c3d5e627) matches the GIN-indexed
+    chunk.tsv column and orders by ts_rank_cd. It returns a match-centred
+    ts_headline snippet with «» around hits instead of the chunk text, so the
+    bytes per result stay bounded whatever the chunk size.
     """
     async with pool.connection() as conn:
         cursor = await conn.execute(
-            "SELECT id, text FROM chunk_search(:q, :limit)",
-            {"q": q, "limit": limit},
+            "SELECT id, snippet FROM chunk_search(%(q)s, %(limit)s)",
+            {"q": normalize_query(q), "limit": limit},
         )
         rows = await cursor.fetchall()
 
-    results: list[dict[str, Any]] = []
-    for chunk_id, text in rows:
-        trimmed = text if len(text) <= 500 else text[:500]
-        results.append({"chunk_id": chunk_id, "text": trimmed})
-    return results
+    return [{"chunk_id": chunk_id, "text": snippet} for chunk_id, snippet in rows]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from prometheus_client import Counter
+
+COALESCED_REQUESTS = Counter(
+    "singleflight_coalesced_total",
+    "Calls that waited on an identical in-flight call instead of running their own",
+    labelnames=("flight",),
+)
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one in-flight call.
+
+    The first caller starts `fn` as a task; callers arriving before it finishes
+    await the same task and get its result or exception. The task is shielded, so a
+    cancelled caller (e.g. a client that disconnected) does not cancel it for the
+    others. Keys are forgotten as soon as the call finishes; nothing is cached.
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            COALESCED_REQUESTS.labels(flight=self.name).inc()
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1 @@
+# Text processing package
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Protocol
+
+from app.text.clauses import ClauseSpan, iter_clauses
+
+Span = tuple[int, int]
+
+_WORD = re.compile(r"\S+")
+
+
+class Tokenizer(Protocol):
+    def token_spans(self, text: str, start: int = 0, end: int | None = None) -> Iterable[Span]:
+        """Character offsets of the tokens of text[start:end], relative to `text`."""
+        ...
+
+
+class WhitespaceTokenizer:
+    """Whitespace-delimited words; offsets come straight from the regex, nothing is copied."""
+
+    def token_spans(self, text: str, start: int = 0, end: int | None = None) -> Iterator[Span]:
+        for match in _WORD.finditer(text, start, len(text) if end is None else end):
+            yield match.span()
+
+
+class HFTokenizer:
+    """Counts tokens with a Hugging Face `tokenizers` model, e.g. the embedding model's.
+
+    The `tokenizers` package is optional and only imported when this class is used.
+    """
+
+    def __init__(self, tokenizer: Any):
+        self._tokenizer = tokenizer
+
+    @classmethod
+    def from_pretrained(cls, name: str) -> HFTokenizer:
+        from tokenizers import Tokenizer as _Tokenizer
+
+        return cls(_Tokenizer.from_pretrained(name))
+
+    @classmethod
+    def from_file(cls, path: str) -> HFTokenizer:
+        from tokenizers import Tokenizer as _Tokenizer
+
+        return cls(_Tokenizer.from_file(path))
+
+    def token_spans(self, text: str, start: int = 0, end: int | None = None) -> list[Span]:
+        encoding = self._tokenizer.encode(text[start:end], add_special_tokens=False)
+        return [(start + a, start + b) for a, b in encoding.offsets if b > a]
+
+
+@dataclass(frozen=True)
+class ChunkBudget:
+    max_tokens: int = 700
+    overlap: float = 0.1
+
+    def __post_init__(self) -> None:
+        if self.max_tokens < 1:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= self.overlap < 1:
+            raise ValueError("overlap must be in [0, 1)")
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> ChunkBudget:
+        return cls(max_tokens=settings.CHUNK_TOKENS, overlap=settings.CHUNK_OVERLAP)
+
+    @property
+    def overlap_tokens(self) -> int:
+        return int(self.max_tokens * self.overlap)
+
+    @property
+    def step(self) -> int:
+        return max(1, self.max_tokens - self.overlap_tokens)
+
+
+DEFAULT_TOKENIZER = WhitespaceTokenizer()
+DEFAULT_BUDGET = ChunkBudget()
+
+
+def _iter_windows(
+    text: str, tokenizer: Tokenizer, budget: ChunkBudget, start: int, end: int | None
+) -> Iterator[tuple[int, int, int]]:
+    """Sliding windows as (start, end, token_count)."""
+    window: deque[Span] = deque(maxlen=budget.max_tokens)
+    since_emit = 0
+    emitted = False
+    for span in tokenizer.token_spans(text, start, end):
+        window.append(span)
+        since_emit += 1
+        if len(window) == budget.max_tokens and (not emitted or since_emit >= budget.step):
+            yield window[0][0], window[-1][1], len(window)
+            since_emit = 0
+            emitted = True
+
+    if not emitted and window:
+        yield window[0][0], window[-1][1], len(window)
+    elif since_emit:
+        # Tail window: starts one step after the last full window.
+        tail = min(len(window), budget.max_tokens - budget.step + since_emit)
+        yield window[-tail][0], window[-1][1], tail
+
+
+def iter_chunk_spans(
+    text: str,
+    tokenizer: Tokenizer = DEFAULT_TOKENIZER,
+    budget: ChunkBudget = DEFAULT_BUDGET,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[Span]:
+    """Yield (start, end) character spans of overlapping windows of at most max_tokens.
+
+    Windows advance by budget.step tokens, so neighbours share overlap_tokens tokens.
+    Only one window of token offsets is held at a time; slice `text` to get chunk text.
+    """
+    for window_start, window_end, _ in _iter_windows(text, tokenizer, budget, start, end):
+        yield window_start, window_end
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    """A chunk as offsets into its document plus the clauses it was built from."""
+
+    start: int
+    end: int
+    token_count: int
+    clause_titles: tuple[str, ...]
+    clause_start: int  # start of the first clause heading in the chunk
+    clause_end: int  # end of the last clause body in the chunk
+
+    @property
+    def clause_title(self) -> str:
+        titles = [t for t in self.clause_titles if t]
+        if len(titles) > 1:
+            return f"{titles[0]} – {titles[-1]}"
+        return titles[0] if titles else ""
+
+    def text(self, document: str) -> str:
+        return document[self.start : self.end]
+
+
+def iter_clause_chunks(
+    text: str,
+    tokenizer: Tokenizer = DEFAULT_TOKENIZER,
+    budget: ChunkBudget = DEFAULT_BUDGET,
+) -> Iterator[Chunk]:
+    """Chunk a legal text along its clause boundaries.
+
+    Consecutive whole clauses (heading included) are packed while they fit in
+    max_tokens; a clause that is too large on its own is split into overlapping
+    windows. Nothing crosses into a neighbouring clause mid-way.
+    """
+    pack: list[ClauseSpan] = []
+    pack_tokens = 0
+
+    def flush() -> Chunk:
+        return Chunk(
+            start=pack[0].start,
+            end=pack[-1].end,
+            token_count=pack_tokens,
+            clause_titles=tuple(span.title for span in pack),
+            clause_start=pack[0].start,
+            clause_end=pack[-1].end,
+        )
+
+    for clause in iter_clauses(text):
+        tokens = count_tokens(text, tokenizer, clause.start, clause.end)
+        if not tokens:
+            continue
+        if pack and pack_tokens + tokens > budget.max_tokens:
+            yield flush()
+            pack, pack_tokens = [], 0
+        if tokens > budget.max_tokens:
+            for start, end, count in _iter_windows(text, tokenizer, budget, clause.start, clause.end):
+                yield Chunk(start, end, count, (clause.title,), clause.start, clause.end)
+            continue
+        pack.append(clause)
+        pack_tokens += tokens
+
+    if pack:
+        yield flush()
+
+
+def count_tokens(text: str, tokenizer: Tokenizer = DEFAULT_TOKENIZER, start: int = 0, end: int | None = None) -> int:
+    return sum(1 for _ in tokenizer.token_spans(text, start, end))
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import re
+from typing import Iterator, NamedTuple
+
+
+# Article headings in BCS legal texts, Latin and Cyrillic: "Član 5", "Članak 12a.", "Čl. 3",
+# "ČLAN 7", "Clan 2" (no diacritics), "Члан 4", "Чланак 9". Only capitalised forms count:
+# in-sentence references ("iz člana 5", "u čl. 3") are lowercase and must not split.
+CLAUSE_MARKER = re.compile(
+    r"(?<!\w)"
+    r"(?P<marker>Članak|Član|ČLANAK|ČLAN|Clanak|Clan|CLANAK|CLAN|Čl\.|Cl\.|Чланак|Члан|ЧЛАНАК|ЧЛАН|Чл\.)"
+    r"[ \t\u00a0]*(?P<number>\d+[a-zабвгдђежзијклљмнњопрстћуфхцчџш]?)\.?(?!\w)"
+)
+_NON_SPACE = re.compile(r"\S")
+
+
+class ClauseSpan(NamedTuple):
+    """One clause of a document, as offsets into the original text.
+
+    `start` is where the heading begins, `body_start`/`end` delimit the trimmed body.
+    The untitled span (title "") is text before the first heading.
+    """
+
+    title: str
+    number: str
+    start: int
+    body_start: int
+    end: int
+
+    def body(self, text: str) -> str:
+        return text[self.body_start : self.end]
+
+
+def _trimmed(text: str, title: str, number: str, start: int, body_start: int, end: int) -> ClauseSpan:
+    first = _NON_SPACE.search(text, body_start, end)
+    body_start = first.start() if first else end
+    while end > body_start and text[end - 1].isspace():
+        end -= 1
+    return ClauseSpan(title, number, start, body_start, end)
+
+
+def _heading(match: re.Match[str]) -> tuple[str, str]:
+    return f"{match['marker']} {match['number']}", match["number"]
+
+
+def iter_clauses(text: str) -> Iterator[ClauseSpan]:
+    """Yield clause spans in document order without copying clause bodies.
+
+    A preamble before the first heading is yielded only when it has content; text
+    without any heading comes back as a single untitled span.
+    """
+    previous: re.Match[str] | None = None
+    for match in CLAUSE_MARKER.finditer(text):
+        if previous is None:
+            if _NON_SPACE.search(text, 0, match.start()):
+                yield _trimmed(text, "", "", 0, 0, match.start())
+        else:
+            yield _trimmed(text, *_heading(previous), previous.start(), previous.end(), match.start())
+        previous = match
+
+    if previous is None:
+        yield _trimmed(text, "", "", 0, 0, len(text))
+    else:
+        yield _trimmed(text, *_heading(previous), previous.start(), previous.end(), len(text))
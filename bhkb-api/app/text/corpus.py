@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import psycopg
+
+from app.text.chunking import ChunkBudget, iter_clause_chunks
+from app.text.dedup import DEFAULT_HASHER, NEAR_DUP_THRESHOLD, mark_near_duplicates
+from app.text.normalize import normalize_many
+
+
+CHUNK_COPY = (
+    "COPY chunk (document_key, chunk_index, clause_title, start_offset, end_offset, token_count, text, text_norm, minhash) "
+    "FROM STDIN (FORMAT BINARY)"
+)
+CHUNK_TYPES = ["text", "int4", "text", "int4", "int4", "int4", "text", "text", "bytea"]
+
+INDEX_VERSION_BUMP = "UPDATE search_index_state SET version = version + 1, updated_at = now()"
+
+ChunkRow = tuple[str, int, str, int, int, int, str, str, bytes]
+
+
+@dataclass(frozen=True)
+class ChunkStats:
+    docs: int
+    chunks: int
+    seconds: float
+    duplicates: int = 0
+
+    @property
+    def docs_per_s(self) -> float:
+        return self.docs / self.seconds if self.seconds else 0.0
+
+    @property
+    def chunks_per_s(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "docs": self.docs,
+            "chunks": self.chunks,
+            "duplicates": self.duplicates,
+            "seconds": round(self.seconds, 3),
+            "docs_per_s": round(self.docs_per_s, 1),
+            "chunks_per_s": round(self.chunks_per_s, 1),
+        }
+
+
+def iter_corpus(root: Path, pattern: str = "**/*.txt") -> Iterator[Path]:
+    """Corpus files under root in a stable order."""
+    yield from sorted(p for p in root.glob(pattern) if p.is_file())
+
+
+def document_key(path: Path, root: Path) -> str:
+    return path.relative_to(root).as_posix()
+
+
+def chunk_document(key: str, text: str, budget: ChunkBudget) -> list[ChunkRow]:
+    """Chunk rows for one document, in COPY column order, with the search form and MinHash of each text."""
+    chunks = list(iter_clause_chunks(text, budget=budget))
+    texts = [chunk.text(text) for chunk in chunks]
+    norms = normalize_many(texts)
+    return [
+        (key, index, chunk.clause_title, chunk.start, chunk.end, chunk.token_count, body, norm,
+         DEFAULT_HASHER.to_bytes(DEFAULT_HASHER.signature(norm)))
+        for index, (chunk, body, norm) in enumerate(zip(chunks, texts, norms))
+    ]
+
+
+def chunk_shard(root: str, relpaths: Sequence[str], max_tokens: int, overlap: float) -> list[ChunkRow]:
+    """Pool task: read and chunk a shard of documents. Arguments are plain values so they pickle cheaply."""
+    budget = ChunkBudget(max_tokens=max_tokens, overlap=overlap)
+    rows: list[ChunkRow] = []
+    for relpath in relpaths:
+        text = (Path(root) / relpath).read_text(encoding="utf-8")
+        rows.extend(chunk_document(relpath, text, budget))
+    return rows
+
+
+def write_chunks(
+    conn: psycopg.Connection,
+    keys: Sequence[str],
+    rows: Iterable[ChunkRow],
+    near_dup_threshold: float | None = NEAR_DUP_THRESHOLD,
+) -> int:
+    """Replace the chunks of `keys` with `rows` in one transaction using binary COPY.
+
+    Near-duplicates of chunks from other documents are flagged in the same
+    transaction (skipped when `near_dup_threshold` is None); returns how many were.
+    The search index version is bumped on commit, invalidating cached results.
+    """
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM chunk WHERE document_key = ANY(%s)", (list(keys),))
+            with cur.copy(CHUNK_COPY) as copy:
+                copy.set_types(CHUNK_TYPES)
+                for row in rows:
+                    copy.write_row(row)
+        duplicates = 0 if near_dup_threshold is None else mark_near_duplicates(conn, keys, near_dup_threshold)
+        conn.execute(INDEX_VERSION_BUMP)
+    return duplicates
+
+
+def _shards(relpaths: Sequence[str], size: int) -> Iterator[list[str]]:
+    it = iter(relpaths)
+    while shard := list(itertools.islice(it, size)):
+        yield shard
+
+
+def chunk_corpus(
+    root: Path,
+    relpaths: Sequence[str],
+    budget: ChunkBudget,
+    *,
+    workers: int = 1,
+    shard_size: int = 16,
+    conn: psycopg.Connection | None = None,
+    near_dup_threshold: float | None = NEAR_DUP_THRESHOLD,
+) -> ChunkStats:
+    """Chunk documents across a process pool and bulk-write each shard as it finishes.
+
+    With workers=1 everything runs in-process (no pickling), which is also what the
+    benchmark measures as the baseline. Without `conn` nothing is written and no
+    near-duplicates are looked up.
+    """
+    started = time.perf_counter()
+    shards = list(_shards(relpaths, shard_size))
+    args = [(str(root), shard, budget.max_tokens, budget.overlap) for shard in shards]
+    totals = [0, 0]  # chunks, duplicates
+    if workers <= 1:
+        results: Iterable[list[ChunkRow]] = (chunk_shard(*a) for a in args)
+        for shard, rows in zip(shards, results):
+            _store(conn, shard, rows, near_dup_threshold, totals)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard, rows in zip(shards, pool.map(chunk_shard, *zip(*args))):
+                _store(conn, shard, rows, near_dup_threshold, totals)
+    chunks, duplicates = totals
+    return ChunkStats(
+        docs=len(relpaths), chunks=chunks, seconds=time.perf_counter() - started, duplicates=duplicates
+    )
+
+
+def _store(
+    conn: psycopg.Connection | None,
+    keys: Sequence[str],
+    rows: list[ChunkRow],
+    near_dup_threshold: float | None,
+    totals: list[int],
+) -> None:
+    totals[0] += len(rows)
+    if conn is not None:
+        totals[1] += write_chunks(conn, keys, rows, near_dup_threshold)
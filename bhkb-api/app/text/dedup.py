@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+import numpy as np
+import psycopg
+
+MERSENNE_PRIME = (1 << 31) - 1
+_SHINGLE_BASE = 1_000_003
+_EMPTY = np.array([zlib.crc32(b"") % MERSENNE_PRIME], dtype=np.uint64)
+
+NEAR_DUP_THRESHOLD = 0.8  # estimated Jaccard similarity of word shingles
+
+LSH_COPY = "COPY chunk_lsh (band, bucket, chunk_id) FROM STDIN (FORMAT BINARY)"
+LSH_TYPES = ["int2", "int8", "int8"]
+
+
+class MinHasher:
+    """MinHash signatures over word k-shingles, banded for LSH lookups.
+
+    Hashes are derived from crc32 and a fixed seed, so signatures are stable across
+    processes and can be stored. With 16 bands of 8 rows, pairs above ~0.7 Jaccard
+    share at least one bucket with high probability.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Hashes of the word k-shingles of `text` (expected to be normalized)."""
+        tokens = text.split()
+        if not tokens:
+            return _EMPTY
+        words = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+        words %= MERSENNE_PRIME
+        k = min(self.shingle_size, len(tokens))
+        n = len(tokens) - k + 1
+        hashes = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            hashes = (hashes * _SHINGLE_BASE + words[j : j + n]) % MERSENNE_PRIME
+        return np.unique(hashes)
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        return ((self._a * shingles + self._b) % MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: Iterable[str]) -> list[np.ndarray]:
+        return [self.signature(text) for text in texts]
+
+    def band_keys(self, signature: np.ndarray) -> list[int]:
+        """One signed 64-bit bucket per band, so they fit a Postgres bigint."""
+        rows = signature.astype("<u4").reshape(self.bands, self.rows)
+        return [
+            int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "little", signed=True)
+            for row in rows
+        ]
+
+    @staticmethod
+    def to_bytes(signature: np.ndarray) -> bytes:
+        return signature.astype("<u4").tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: the fraction of equal signature slots."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+DEFAULT_HASHER = MinHasher()
+
+
+@dataclass
+class LSHIndex:
+    """In-memory band table; candidates still have to be checked with `similarity`."""
+
+    hasher: MinHasher = DEFAULT_HASHER
+    buckets: dict[tuple[int, int], list[int]] = field(default_factory=lambda: defaultdict(list))
+    entries: dict[int, np.ndarray] = field(default_factory=dict)
+
+    def add(self, key: int, signature: np.ndarray) -> list[int]:
+        self.entries[key] = signature
+        band_keys = self.hasher.band_keys(signature)
+        for band, bucket in enumerate(band_keys):
+            self.buckets[(band, bucket)].append(key)
+        return band_keys
+
+    def candidates(self, signature: np.ndarray) -> list[int]:
+        seen: dict[int, None] = {}
+        for band, bucket in enumerate(self.hasher.band_keys(signature)):
+            for key in self.buckets.get((band, bucket), ()):
+                seen.setdefault(key)
+        return list(seen)
+
+    def best_match(self, signature: np.ndarray, threshold: float, exclude: Iterable[int] = ()) -> tuple[int, float] | None:
+        skip = set(exclude)
+        best: tuple[int, float] | None = None
+        for key in self.candidates(signature):
+            if key in skip:
+                continue
+            score = similarity(signature, self.entries[key])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+
+def mark_near_duplicates(
+    conn: psycopg.Connection,
+    keys: Sequence[str],
+    threshold: float = NEAR_DUP_THRESHOLD,
+    hasher: MinHasher = DEFAULT_HASHER,
+) -> int:
+    """Point chunks of `keys` at an earlier near-identical chunk from another document.
+
+    Runs inside the caller's transaction, after the chunks were written. Existing
+    chunks sharing an LSH bucket are loaded, each new chunk is compared against
+    them and against the new chunks before it, and matches get `duplicate_of` set
+    to the canonical chunk (never a duplicate itself). The new chunks' bands are
+    then added to chunk_lsh. Returns the number of chunks marked.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, document_key, minhash FROM chunk WHERE document_key = ANY(%s) AND minhash IS NOT NULL ORDER BY id",
+            (list(keys),),
+        )
+        new = [(cid, doc, hasher.from_bytes(mh)) for cid, doc, mh in cur.fetchall()]
+        if not new:
+            return 0
+        band_rows = [(band, bucket, cid) for cid, _, sig in new for band, bucket in enumerate(hasher.band_keys(sig))]
+
+        cur.execute(
+            """
+            SELECT DISTINCT c.id, c.minhash, c.duplicate_of
+            FROM unnest(%s::int2[], %s::int8[]) AS q(band, bucket)
+            JOIN chunk_lsh l ON l.band = q.band AND l.bucket = q.bucket
+            JOIN chunk c ON c.id = l.chunk_id
+            WHERE c.minhash IS NOT NULL
+            ORDER BY c.id
+            """,
+            ([b for b, _, _ in band_rows], [k for _, k, _ in band_rows]),
+        )
+        index = LSHIndex(hasher)
+        canonical: dict[int, int] = {}
+        for cid, mh, duplicate_of in cur.fetchall():
+            index.add(cid, hasher.from_bytes(mh))
+            canonical[cid] = duplicate_of or cid
+
+        updates: list[tuple[int, int]] = []
+        by_document: dict[str, list[int]] = defaultdict(list)
+        for cid, doc, sig in new:
+            same_document = by_document[doc]
+            match = index.best_match(sig, threshold, exclude=same_document)
+            if match is not None:
+                canonical[cid] = canonical[match[0]]
+                updates.append((canonical[cid], cid))
+            else:
+                canonical[cid] = cid
+            index.add(cid, sig)
+            same_document.append(cid)
+
+        if updates:
+            cur.executemany("UPDATE chunk SET duplicate_of = %s WHERE id = %s", updates)
+        with cur.copy(LSH_COPY) as copy:
+            copy.set_types(LSH_TYPES)
+            for row in band_rows:
+                copy.write_row(row)
+    return len(updates)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from difflib import SequenceMatcher
+from typing import Any, Optional, Sequence
+
+from app.meta import DEFAULT_DATE_EXTRACTOR
+from app.text.normalize import normalize
+from app.utils import split_clauses
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+RENUMBERED = "renumbered"
+
+
+@dataclass(frozen=True, slots=True)
+class HashedClause:
+    """A clause reduced to what alignment needs: its number, a content hash and its position."""
+
+    position: int
+    title: str
+    key: str  # clause number, script- and case-folded ("5a" for "Član 5a" and "Члан 5а")
+    digest: str  # hash of the normalized, whitespace-collapsed body
+    body: str
+
+
+@dataclass(frozen=True, slots=True)
+class TextEdit:
+    op: str  # difflib opcode: "replace", "delete" or "insert"
+    old_start: int
+    old_end: int
+    new_start: int
+    new_end: int
+    old_text: str
+    new_text: str
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One clause-level change between two versions of a document.
+
+    `effective_to` is set on events that supersede the old clause (modified, removed,
+    renumbered): the day before the new version takes effect, when that is known.
+    """
+
+    kind: str
+    old_title: Optional[str]
+    new_title: Optional[str]
+    old_digest: Optional[str]
+    new_digest: Optional[str]
+    effective_to: Optional[str] = None
+    similarity: Optional[float] = None
+    edits: list[TextEdit] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def clause_digest(body: str) -> str:
+    return hashlib.blake2b(" ".join(normalize(body).split()).encode(), digest_size=16).hexdigest()
+
+
+def hash_clauses(text: str) -> list[HashedClause]:
+    """Hash every clause from split_clauses; untitled text is keyed as clause ""."""
+    return [
+        HashedClause(position, title, normalize(title.rsplit(" ", 1)[-1]) if title else "", clause_digest(body), body)
+        for position, (title, body) in enumerate(split_clauses(text))
+    ]
+
+
+def text_edits(old: str, new: str) -> tuple[float, list[TextEdit]]:
+    """Character-level edits between two clause bodies and their similarity ratio."""
+    matcher = SequenceMatcher(None, old, new, autojunk=False)
+    edits = [
+        TextEdit(op, i1, i2, j1, j2, old[i1:i2], new[j1:j2])
+        for op, i1, i2, j1, j2 in matcher.get_opcodes()
+        if op != "equal"
+    ]
+    return round(matcher.ratio(), 4), edits
+
+
+def _superseded_on(effective_from: Optional[str]) -> Optional[str]:
+    if not effective_from:
+        return None
+    return (date.fromisoformat(effective_from) - timedelta(days=1)).isoformat()
+
+
+def align_clauses(old: Sequence[HashedClause], new: Sequence[HashedClause], effective_to: Optional[str] = None) -> list[ChangeEvent]:
+    """Align two hashed versions in linear time and describe what changed.
+
+    Same number and digest is unchanged. Remaining new clauses are matched by digest
+    first (renumbered, e.g. after an inserted article), then by number (modified,
+    with a character diff); whatever is left is added or removed. Events come out
+    in new-document order, removals last.
+    """
+    old_by_key = {clause.key: clause for clause in old}
+    matched: set[int] = set()
+    pending: list[HashedClause] = []
+    for clause in new:
+        previous = old_by_key.get(clause.key)
+        if previous is not None and previous.digest == clause.digest and previous.position not in matched:
+            matched.add(previous.position)
+        else:
+            pending.append(clause)
+
+    by_digest: dict[str, list[HashedClause]] = {}
+    for clause in old:
+        if clause.position not in matched:
+            by_digest.setdefault(clause.digest, []).append(clause)
+
+    paired: dict[int, HashedClause] = {}
+    for clause in pending:
+        candidates = by_digest.get(clause.digest)
+        if candidates:
+            previous = candidates.pop(0)
+            matched.add(previous.position)
+            paired[clause.position] = previous
+
+    events: list[ChangeEvent] = []
+    for clause in pending:
+        previous = paired.get(clause.position)
+        if previous is not None:
+            events.append(
+                ChangeEvent(RENUMBERED, previous.title, clause.title, previous.digest, clause.digest, effective_to, 1.0)
+            )
+            continue
+        previous = old_by_key.get(clause.key)
+        if previous is not None and previous.position not in matched:
+            matched.add(previous.position)
+            ratio, edits = text_edits(previous.body, clause.body)
+            events.append(
+                ChangeEvent(MODIFIED, previous.title, clause.title, previous.digest, clause.digest, effective_to, ratio, edits)
+            )
+        else:
+            events.append(ChangeEvent(ADDED, None, clause.title, None, clause.digest))
+
+    events.extend(
+        ChangeEvent(REMOVED, c.title, None, c.digest, None, effective_to) for c in old if c.position not in matched
+    )
+    return events
+
+
+def diff_versions(old_text: str, new_text: str, effective_from: Optional[str] = None) -> list[ChangeEvent]:
+    """Clause-level changes from `old_text` to `new_text`.
+
+    `effective_from` is the ISO date the new version applies from; when omitted it is
+    extracted from the new text. Superseded clauses end the day before.
+    """
+    if effective_from is None:
+        effective_from = DEFAULT_DATE_EXTRACTOR.extract(new_text).effective_from
+    return align_clauses(hash_clauses(old_text), hash_clauses(new_text), _superseded_on(effective_from))
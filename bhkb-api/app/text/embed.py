@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import zlib
+from typing import Optional, Protocol, Sequence
+
+import numpy as np
+
+from app.text.normalize import normalize
+
+EMBEDDING_DIM = 1024  # bge-m3; the chunk.embedding column is declared with this size
+
+
+class Embedder(Protocol):
+    model_version: str
+    dim: int
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        """One L2-normalized float32 vector for a search query."""
+        ...
+
+
+class EmbeddingModel(Protocol):
+    model_version: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) L2-normalized float32 vectors; blocking."""
+        ...
+
+
+class HashingEmbedder:
+    """Deterministic feature-hashing embeddings over normalized word uni- and bigrams.
+
+    No model and no semantics beyond shared words; used in tests and to bootstrap
+    the dense path before a real encoder is configured.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+        self.model_version = f"hashing-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = normalize(text).split()
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features))
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(out[row], hashes % self.dim, signs)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return np.divide(out, norms, out=out, where=norms > 0)
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+
+class OnnxEmbedder:
+    """bge-m3-style encoder exported to ONNX, run on CPU with onnxruntime.
+
+    The dense embedding is the L2-normalized [CLS] hidden state; models exported
+    with a pooled 2-D output use that instead. `onnxruntime` and `tokenizers` are
+    optional and only imported when this class is instantiated.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        tokenizer_path: str,
+        model_version: str,
+        dim: int = EMBEDDING_DIM,
+        max_length: int = 8192,
+        threads: Optional[int] = None,
+    ):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self._session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_truncation(max_length)
+        self._tokenizer.enable_padding()
+        self.dim = dim
+        self.model_version = model_version
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        encodings = self._tokenizer.encode_batch(list(texts))
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+        }
+        if "token_type_ids" in self._inputs:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        output = self._session.run(None, feeds)[0]
+        vectors = np.ascontiguousarray(output if output.ndim == 2 else output[:, 0], dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"model returned {vectors.shape[1]}-d vectors, expected {self.dim}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+    async def embed_query(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+
+def cheap_embed(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """HashingEmbedder for a single text."""
+    return HashingEmbedder(dim).embed([text])[0]
+
+
+def to_vector_literal(vector: np.ndarray) -> str:
+    """pgvector text input ('[0.1,0.2,...]'), for use with a %s::vector parameter."""
+    return "[" + ",".join(np.char.mod("%.7g", np.asarray(vector, dtype=np.float32))) + "]"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+
+import psycopg
+
+from app.text.corpus import INDEX_VERSION_BUMP
+from app.text.embed import EmbeddingModel, to_vector_literal
+from app.text.normalize import normalize
+
+# Near-duplicates (duplicate_of set) are never embedded; search excludes them.
+PENDING_SQL = """
+SELECT id, text, text_norm FROM chunk
+WHERE id > %(after)s AND duplicate_of IS NULL
+  AND (embedding IS NULL OR embedding_model IS DISTINCT FROM %(model)s)
+ORDER BY id
+LIMIT %(n)s
+"""
+
+CACHED_SQL = "SELECT content_sha256 FROM embedding_cache WHERE model_version = %s AND content_sha256 = ANY(%s)"
+
+CACHE_INSERT = (
+    "INSERT INTO embedding_cache (content_sha256, model_version, embedding) "
+    "VALUES (%s, %s, %s::vector) ON CONFLICT DO NOTHING"
+)
+
+APPLY_SQL = """
+UPDATE chunk c SET embedding = e.embedding, embedding_model = e.model_version
+FROM unnest(%(ids)s::bigint[], %(keys)s::bytea[]) AS k(id, content_sha256)
+JOIN embedding_cache e ON e.content_sha256 = k.content_sha256 AND e.model_version = %(model)s
+WHERE c.id = k.id
+"""
+
+
+@dataclass(frozen=True)
+class EmbedStats:
+    chunks: int
+    cached: int  # chunks whose vector came from embedding_cache
+    embedded: int  # distinct texts sent to the model
+    seconds: float
+
+    @property
+    def texts_per_s(self) -> float:
+        return self.embedded / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "chunks": self.chunks,
+            "cached": self.cached,
+            "embedded": self.embedded,
+            "seconds": round(self.seconds, 3),
+            "texts_per_s": round(self.texts_per_s, 1),
+        }
+
+
+def content_key(text_norm: str) -> bytes:
+    """embedding_cache key: sha256 of the normalized chunk text."""
+    return hashlib.sha256(text_norm.encode("utf-8")).digest()
+
+
+def embed_pending(conn: psycopg.Connection, model: EmbeddingModel, batch_size: int = 64) -> EmbedStats:
+    """Fill chunk.embedding for chunks lacking a vector from `model`, cache first.
+
+    Texts are keyed by content_key(normalized text); only keys missing from
+    embedding_cache for model.model_version reach the model, and texts sharing a key
+    in a batch are embedded once. The model sees the original text, casing and
+    diacritics included, as it does the raw search query.
+    Each batch commits on its own and bumps the search index version.
+    """
+    started = time.perf_counter()
+    chunks = cached = embedded = 0
+    after = 0
+    while True:
+        with conn.transaction():
+            rows = conn.execute(PENDING_SQL, {"after": after, "model": model.model_version, "n": batch_size}).fetchall()
+            if not rows:
+                break
+            ids = [chunk_id for chunk_id, _, _ in rows]
+            keys = [content_key(text_norm or normalize(text)) for _, text, text_norm in rows]
+            texts: dict[bytes, str] = {}
+            for key, (_, text, _) in zip(keys, rows):
+                texts.setdefault(key, text)  # texts equal after normalization share one vector
+
+            hits = {row[0] for row in conn.execute(CACHED_SQL, (model.model_version, list(texts))).fetchall()}
+            misses = [key for key in texts if key not in hits]
+            if misses:
+                vectors = model.embed([texts[key] for key in misses])
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        CACHE_INSERT,
+                        [(key, model.model_version, to_vector_literal(v)) for key, v in zip(misses, vectors)],
+                    )
+            conn.execute(APPLY_SQL, {"ids": ids, "keys": keys, "model": model.model_version})
+            conn.execute(INDEX_VERSION_BUMP)
+
+        after = ids[-1]
+        chunks += len(rows)
+        cached += sum(key in hits for key in keys)
+        embedded += len(misses)
+    return EmbedStats(chunks, cached, embedded, time.perf_counter() - started)
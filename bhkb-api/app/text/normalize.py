@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Iterable
+
+# Serbian/Bosnian Cyrillic -> Latin, already diacritic-folded (ч/ћ -> c, ђ -> dj).
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "ђ": "dj", "е": "e", "ж": "z", "з": "z",
+    "и": "i", "ј": "j", "к": "k", "л": "l", "љ": "lj", "м": "m", "н": "n", "њ": "nj", "о": "o",
+    "п": "p", "р": "r", "с": "s", "т": "t", "ћ": "c", "у": "u", "ф": "f", "х": "h", "ц": "c",
+    "ч": "c", "џ": "dz", "ш": "s",
+}
+
+# Letters whose fold is not their NFD base character.
+_LATIN_SPECIAL = {"đ": "dj", "ł": "l", "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "ı": "i"}
+
+QUERY_CACHE_SIZE = 4096
+QUERY_CACHE_MAX_CHARS = 256  # longer strings bypass the cache
+
+
+def _build_fold_table() -> dict[int, str]:
+    """Translation table for casefolded text, computed once at import.
+
+    Latin-1 Supplement and Latin Extended-A are folded to their NFD base letter, so
+    `str.translate` does in one C-level pass what NFD + combining-mark removal would
+    do per character.
+    """
+    table: dict[int, str] = {}
+    for code in range(0x00C0, 0x0250):
+        char = chr(code)
+        base = unicodedata.normalize("NFD", char)[0]
+        if base != char and base.isascii():
+            table[code] = base.casefold()
+    table.update({ord(k): v for k, v in _LATIN_SPECIAL.items()})
+    table.update({ord(k): v for k, v in _CYRILLIC.items()})
+    return table
+
+
+FOLD_TABLE = _build_fold_table()
+
+
+def normalize(text: str) -> str:
+    """Search form of `text`: NFC, casefold, fold diacritics, transliterate Cyrillic.
+
+    The same function is used for stored chunks and for queries, so "Član", "clan"
+    and "Члан" all compare equal.
+    """
+    return unicodedata.normalize("NFC", text).casefold().translate(FOLD_TABLE)
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _normalize_cached(query: str) -> str:
+    return " ".join(normalize(query).split())
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query; short strings are served from an LRU cache."""
+    if len(query) > QUERY_CACHE_MAX_CHARS:
+        return " ".join(normalize(query).split())
+    return _normalize_cached(query)
+
+
+def normalize_many(texts: Iterable[str]) -> list[str]:
+    """Normalize a batch of documents or chunks (uncached)."""
+    return list(map(normalize, texts))
+
+
+def normalize_queries(queries: Iterable[str]) -> list[str]:
+    """Normalize a batch of queries through the cache."""
+    return list(map(normalize_query, queries))
@@ -1,47 +1,29 @@
 from __future__ import annotations
 
-import re
-from typing import Iterable, List, Tuple
+from typing import List, Tuple
+
+from app.text.chunking import ChunkBudget, iter_chunk_spans
+from app.text.clauses import iter_clauses
 
 
 def split_clauses(text: str) -> List[Tuple[str, str]]:
     """
-    Split legal text into clause tuples using markers like 'Član 1'.
+    Split legal text into clause tuples using markers like 'Član 1', 'Članak 2', 'Čl. 3' or 'Члан 4'.
 
-    Returns a list of (title, body) tuples preserving order.
+    Returns a list of (title, body) tuples preserving order. Text before the first
+    marker is dropped; text without markers is returned as a single ("", text) clause.
+    Use app.text.clauses.iter_clauses to stream offsets instead of building strings.
     """
-    pattern = re.compile(r"(član\s+\d+)", flags=re.IGNORECASE)
-    matches = list(pattern.finditer(text))
-    if not matches:
-        return [("", text)]
-
-    clauses: list[tuple[str, str]] = []
-    for idx, match in enumerate(matches):
-        start = match.end()
-        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
-        title = match.group().strip()
-        body = text[start:end].strip()
-        clauses.append((title, body))
-    return clauses
+    clauses = [(span.title, span.body(text)) for span in iter_clauses(text) if span.title]
+    return clauses or [("", text)]
 
 
 def token_chunks(text: str, target_tokens: int = 200, overlap_ratio: float = 0.1) -> List[str]:
     """
     Break text into overlapping token chunks of roughly target_tokens length.
+
+    Chunk text is sliced from the original, so inner whitespace is preserved. Use
+    app.text.chunking.iter_chunk_spans to stream character offsets instead.
     """
-    words = text.split()
-    if not words:
-        return []
-
-    overlap = int(target_tokens * overlap_ratio)
-    step = max(1, target_tokens - overlap)
-
-    chunks: list[str] = []
-    for start in range(0, len(words), step):
-        chunk_words = words[start : start + target_tokens]
-        if not chunk_words:
-            break
-        chunks.append(" ".join(chunk_words))
-        if start + step >= len(words):
-            break
-    return chunks
+    budget = ChunkBudget(max_tokens=target_tokens, overlap=overlap_ratio)
+    return [text[start:end] for start, end in iter_chunk_spans(text, budget=budget)]
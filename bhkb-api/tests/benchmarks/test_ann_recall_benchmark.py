@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import psycopg
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.db.ann import ANN_INDEX, QUANTIZED_MIN_PGVECTOR, AnnConfig, pgvector_version, rebuild_ann_index
+from app.services.hybrid import dense_query
+from app.text.embed import to_vector_literal
+
+
+ROWS = 2000
+QUERIES = 20
+K = 10
+EFFORTS = [0.05, 0.2, 1.0]
+SEARCH_SQL = "SELECT id FROM chunk ORDER BY embedding <=> %s::vector LIMIT %s"
+COPY_SQL = (
+    "COPY chunk (document_key, chunk_index, start_offset, end_offset, token_count, text, embedding, embedding_model) "
+    "FROM STDIN"
+)
+
+
+def _clustered(rng: np.random.Generator, n: int, clusters: int = 40) -> np.ndarray:
+    centres = rng.standard_normal((clusters, 1024))
+    points = centres[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, 1024))
+    return (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(42)
+    return _clustered(rng, ROWS), _clustered(rng, QUERIES)
+
+
+def _load(conn: psycopg.Connection, vectors: np.ndarray) -> list[int]:
+    with conn.cursor() as cur:
+        with cur.copy(COPY_SQL) as copy:
+            for i, vector in enumerate(vectors):
+                copy.write_row(("bench.txt", i, 0, 1, 1, "x", to_vector_literal(vector), "bench"))
+        cur.execute("SELECT id FROM chunk ORDER BY chunk_index")
+        return [row[0] for row in cur.fetchall()]
+
+
+def _search(conn: psycopg.Connection, queries: np.ndarray, settings: dict[str, str]) -> tuple[list[list[int]], float]:
+    results = []
+    started = time.perf_counter()
+    with conn.transaction():
+        for name, value in settings.items():
+            conn.execute("SELECT set_config(%s, %s, true)", (name, value))
+        for query in queries:
+            rows = conn.execute(SEARCH_SQL, (to_vector_literal(query), K)).fetchall()
+            results.append([row[0] for row in rows])
+    return results, (time.perf_counter() - started) * 1000 / len(queries)
+
+
+@pytest.mark.parametrize("kind", ["ivfflat", "hnsw"])
+def test_ann_recall_vs_effort(benchmark, migrated_db, corpus, kind):
+    vectors, queries = corpus
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :K]
+
+    with psycopg.connect(migrated_db, autocommit=True) as conn:
+        ids = np.array(_load(conn, vectors))
+        config = AnnConfig(kind=kind, lists=40, m=16, ef_construction=64)
+        rebuild_ann_index(conn, config, concurrently=False)
+        conn.execute("ANALYZE chunk")
+
+        recalls = {}
+        for effort in EFFORTS:
+            found, latency_ms = _search(conn, queries, config.search_settings(effort))
+            hits = sum(len(set(f) & set(ids[e])) for f, e in zip(found, exact))
+            recalls[effort] = hits / (K * len(queries))
+            benchmark.extra_info[f"effort_{effort}"] = {"recall": recalls[effort], "latency_ms": round(latency_ms, 3)}
+
+        benchmark.pedantic(_search, args=(conn, queries, config.search_settings()), rounds=3, iterations=1)
+
+    efforts = [recalls[e] for e in EFFORTS]
+    assert efforts == sorted(efforts)
+    assert recalls[1.0] >= 0.9
+
+
+def _rescored(conn: psycopg.Connection, queries: np.ndarray, config: AnnConfig) -> tuple[list[list[int]], float]:
+    results = []
+    started = time.perf_counter()
+    sql = dense_query(config)
+    with conn.transaction():
+        for name, value in config.search_settings(1.0).items():
+            conn.execute("SELECT set_config(%s, %s, true)", (name, value))
+        n, candidates = config.dense_limits(K, 1.0)
+        for query in queries:
+            params = {"v": to_vector_literal(query), "model": "bench", "n": n, "candidates": candidates}
+            results.append([row[0] for row in conn.execute(sql, params).fetchall()])
+    return results, (time.perf_counter() - started) * 1000 / len(queries)
+
+
+@pytest.mark.parametrize("quantization", ["none", "halfvec", "binary"])
+def test_quantized_index_memory_and_recall(benchmark, migrated_db, corpus, quantization):
+    """Index size vs full-precision HNSW and recall@10 after exact re-scoring."""
+    vectors, queries = corpus
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :K]
+
+    with psycopg.connect(migrated_db, autocommit=True) as conn:
+        if pgvector_version(conn) < QUANTIZED_MIN_PGVECTOR:
+            pytest.skip("halfvec and binary_quantize need pgvector >= 0.7")
+        ids = np.array(_load(conn, vectors))
+        sizes = {}
+        for variant in dict.fromkeys(("none", quantization)):
+            rebuild_ann_index(conn, AnnConfig(kind="hnsw", quantization=variant), concurrently=False)
+            sizes[variant] = conn.execute("SELECT pg_relation_size(%s::regclass)", (ANN_INDEX,)).fetchone()[0]
+        conn.execute("ANALYZE chunk")
+
+        config = AnnConfig(kind="hnsw", quantization=quantization, rescore_factor=4)
+        if quantization == "none":
+            found, _ = _search(conn, queries, config.search_settings(1.0))
+        else:
+            found, _ = _rescored(conn, queries, config)
+        recall = sum(len(set(f) & set(ids[e])) for f, e in zip(found, exact)) / (K * len(queries))
+        benchmark.extra_info.update({
+            "index_bytes": sizes[quantization],
+            "memory_saved": round(1 - sizes[quantization] / sizes["none"], 3),
+            "recall": recall,
+        })
+        if quantization == "none":
+            benchmark.pedantic(_search, args=(conn, queries, config.search_settings()), rounds=3, iterations=1)
+        else:
+            benchmark.pedantic(_rescored, args=(conn, queries, config), rounds=3, iterations=1)
+
+    assert sizes[quantization] <= sizes["none"]
+    assert recall >= (0.9 if quantization != "binary" else 0.6)
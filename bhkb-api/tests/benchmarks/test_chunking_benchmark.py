@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.text.chunking import ChunkBudget
+from app.text.corpus import chunk_corpus, document_key, iter_corpus
+
+
+CORPUS = Path(__file__).resolve().parents[1] / "fixtures" / "corpus"
+# Each fixture document is listed this many times so a round is long enough to time.
+REPEAT = 50
+
+
+@pytest.fixture(scope="module")
+def relpaths() -> list[str]:
+    return [document_key(p, CORPUS) for p in iter_corpus(CORPUS)] * REPEAT
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunk_corpus_throughput(benchmark, relpaths, workers):
+    stats = benchmark.pedantic(
+        chunk_corpus,
+        args=(CORPUS, relpaths, ChunkBudget(max_tokens=200)),
+        kwargs={"workers": workers, "shard_size": 25},
+        rounds=3,
+        iterations=1,
+    )
+    benchmark.extra_info.update(stats.as_dict())
+    assert stats.docs == len(relpaths)
+    assert stats.chunks >= stats.docs
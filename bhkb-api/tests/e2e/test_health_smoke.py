@@ -11,6 +11,23 @@ class DummySettings:
     S3_ACCESS_KEY = "minio"
     S3_SECRET_KEY = "secret"
     APP_NAME = "TestApp"
+    SEARCH_CACHE_BACKEND = "memory"
+    SEARCH_CACHE_SIZE = 16
+    SEARCH_CACHE_TTL_SECONDS = 60.0
+    INDEX_VERSION_REFRESH_SECONDS = 5.0
+    REDIS_URL = None
+    EMBEDDING_DIM = 8
+    EMBEDDING_BACKEND = "hashing"
+    EMBED_MAX_BATCH = 4
+    EMBED_MAX_LATENCY_MS = 1.0
+    PGVECTOR_INDEX = "hnsw"
+    PGVECTOR_LISTS = 100
+    PGVECTOR_PROBES = 10
+    PGVECTOR_HNSW_M = 16
+    PGVECTOR_HNSW_EF_CONSTRUCTION = 64
+    PGVECTOR_EF_SEARCH = 40
+    PGVECTOR_QUANTIZATION = "none"
+    PGVECTOR_RESCORE_FACTOR = 4
 
 
 class DummyPool:
@@ -41,9 +58,13 @@ def test_health_smoke(monkeypatch):
     async def fake_create_pool(url: str):
         return dummy_pool
 
+    async def fake_verify_index(pool, config):
+        return None
+
     monkeypatch.setattr(main, "Settings", lambda: DummySettings())
     monkeypatch.setattr(main, "run_migrations", lambda url: None)
     monkeypatch.setattr(main, "create_pool", fake_create_pool)
+    monkeypatch.setattr(main, "verify_index", fake_verify_index)
     monkeypatch.setattr(main, "httpx", SimpleNamespace(AsyncClient=DummyAsyncClient))
     monkeypatch.setattr(main, "Minio", DummyMinio)
 
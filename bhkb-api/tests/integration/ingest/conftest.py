@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import psycopg
+import pytest
+
+
+@pytest.fixture(scope="function")
+def seeded_artifact(migrated_db: str):
+    """Tenant + case + one CSV artifact with a pending ingest_task."""
+    with psycopg.connect(migrated_db) as conn:
+        with conn.cursor() as cur:
+            cur.execute("INSERT INTO tenant (slug, name) VALUES (%s,%s) RETURNING id", ("acme", "Acme"))
+            tenant_id = cur.fetchone()[0]
+            cur.execute("INSERT INTO case_file (tenant_id, label) VALUES (%s,%s) RETURNING id", (tenant_id, "Case A"))
+            case_id = cur.fetchone()[0]
+            cur.execute(
+                "INSERT INTO artifact (tenant_id, case_id, filename, s3_uri, sha256) VALUES (%s,%s,%s,%s,%s) RETURNING id",
+                (tenant_id, case_id, "ledger.csv", "s3://raw/raw/aa/" + "a" * 64, "a" * 64),
+            )
+            artifact_id = cur.fetchone()[0]
+            cur.execute("INSERT INTO ingest_task (artifact_id) VALUES (%s) RETURNING id", (artifact_id,))
+            task_id = cur.fetchone()[0]
+        conn.commit()
+    return migrated_db, artifact_id, task_id
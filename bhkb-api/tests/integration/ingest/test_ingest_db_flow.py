@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from app.ingest.db import claim_tasks, dead_letter_task, mark_task_success, requeue_stale_tasks, schedule_retry
+from app.ingest.export import export_artifact
+from app.ingest.lineage import LineageRecorder, LineageWriter
+from app.ingest.loader import discard_output, load_records, skip_committed
+from app.ingest.parsing import ParsedRecord
+from app.ingest.schemas import REGISTRY
+from app.watcher.db import open_conn
+
+
+def _batches(n: int, size: int = 2) -> list[list[ParsedRecord]]:
+    records = [
+        ParsedRecord(row_index=i, payload={"konto": str(i), "iznos": i * 1.5}, schema_version="customer-ledger@1.0")
+        for i in range(n)
+    ]
+    records[-1].valid = False
+    records[-1].errors = ["missing required field 'datum'"]
+    return [records[i : i + size] for i in range(0, n, size)]
+
+
+def test_claim_is_exclusive_and_counts_attempts(seeded_artifact):
+    dsn, artifact_id, task_id = seeded_artifact
+    first, second = open_conn(dsn), open_conn(dsn)
+    try:
+        claimed = claim_tasks(first, 5)
+        assert [t.id for t in claimed] == [task_id]
+        assert claimed[0].attempts == 1
+        assert claimed[0].filename == "ledger.csv"
+        assert claim_tasks(second, 5) == []
+
+        dead_letter_task(first, task_id, "boom")
+        with first.cursor() as cur:
+            cur.execute("SELECT status, last_error FROM ingest_task WHERE id = %s", (task_id,))
+            assert cur.fetchone() == ("dlq", "boom")
+    finally:
+        first.close()
+        second.close()
+
+
+def test_load_records_copies_in_batches_and_is_idempotent(seeded_artifact):
+    dsn, artifact_id, task_id = seeded_artifact
+    conn = open_conn(dsn)
+    try:
+        assert load_records(conn, task_id, artifact_id, _batches(5), lineage=LineageRecorder("run-1")) == 5
+        assert load_records(conn, task_id, artifact_id, _batches(3), lineage=LineageRecorder("run-2")) == 3
+        mark_task_success(conn, task_id)
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*), max(row_index) FROM normalized_record WHERE artifact_id = %s", (artifact_id,))
+            assert cur.fetchone() == (3, 2)
+            cur.execute("SELECT payload FROM normalized_record WHERE artifact_id = %s AND row_index = 2", (artifact_id,))
+            assert cur.fetchone()[0] == {"konto": "2", "iznos": 3.0}
+            cur.execute(
+                "SELECT row_index, errors FROM normalized_record WHERE artifact_id = %s AND NOT valid", (artifact_id,)
+            )
+            assert cur.fetchall() == [(2, ["missing required field 'datum'"])]
+            cur.execute(
+                "SELECT run_id, row_start, row_end, notes FROM lineage WHERE artifact_id = %s ORDER BY id",
+                (artifact_id,),
+            )
+            assert cur.fetchall() == [
+                ("run-2", 0, 1, None),
+                ("run-2", 2, 2, "1 invalid"),
+                ("run-2", None, None, "3 records"),
+            ]
+            cur.execute("SELECT status, checkpoint_row FROM ingest_task WHERE id = %s", (task_id,))
+            assert cur.fetchone() == ("success", None)
+    finally:
+        conn.close()
+
+
+def test_lineage_writer_flushes_in_background(seeded_artifact):
+    dsn, artifact_id, _ = seeded_artifact
+    writer = LineageWriter(dsn)
+    recorder = LineageRecorder("run-async")
+    recorder.record("INGEST_FAILED", artifact_id=artifact_id, notes="boom")
+    recorder.flush_async(writer)
+    recorder.record("DEAD_LETTERED", artifact_id=artifact_id, notes="parse_failed: boom")
+    recorder.flush_async(writer)
+    writer.close(timeout=10)
+
+    conn = open_conn(dsn)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT action FROM lineage WHERE run_id = %s ORDER BY id", ("run-async",))
+            assert [row[0] for row in cur.fetchall()] == ["INGEST_FAILED", "DEAD_LETTERED"]
+    finally:
+        conn.close()
+
+
+def test_scheduled_retry_is_hidden_until_due(seeded_artifact):
+    dsn, _, task_id = seeded_artifact
+    conn = open_conn(dsn)
+    try:
+        assert [t.id for t in claim_tasks(conn, 5)] == [task_id]
+        schedule_retry(conn, task_id, "connection reset", 3600)
+        with conn.cursor() as cur:
+            cur.execute("SELECT status, last_error, next_run_at > now() FROM ingest_task WHERE id = %s", (task_id,))
+            assert cur.fetchone() == ("pending", "connection reset", True)
+        assert claim_tasks(conn, 5) == []
+
+        schedule_retry(conn, task_id, "connection reset", 0)
+        claimed = claim_tasks(conn, 5)
+        assert [(t.id, t.attempts) for t in claimed] == [(task_id, 2)]
+    finally:
+        conn.close()
+
+
+def _crash_after(batches, n):
+    for i, batch in enumerate(batches):
+        if i == n:
+            raise OSError("worker preempted")
+        yield batch
+
+
+def test_load_resumes_from_checkpoint_after_crash(seeded_artifact):
+    dsn, artifact_id, task_id = seeded_artifact
+    conn = open_conn(dsn)
+    try:
+        claim_tasks(conn, 1)
+        with pytest.raises(OSError):
+            load_records(conn, task_id, artifact_id, _crash_after(_batches(7), 2), lineage=LineageRecorder("run-1"))
+        conn.rollback()
+
+        assert requeue_stale_tasks(conn, 0, max_attempts=5) == (1, [])
+        claimed = claim_tasks(conn, 1)
+        assert [(t.id, t.checkpoint_row) for t in claimed] == [(task_id, 3)]
+
+        resumed = skip_committed(_batches(7), claimed[0].checkpoint_row)
+        written = load_records(
+            conn, task_id, artifact_id, resumed, lineage=LineageRecorder("run-2"), checkpoint=claimed[0].checkpoint_row
+        )
+        assert written == 3
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT array_agg(row_index ORDER BY row_index) FROM normalized_record WHERE artifact_id = %s",
+                (artifact_id,),
+            )
+            assert cur.fetchone()[0] == list(range(7))
+            cur.execute(
+                "SELECT run_id, row_start, row_end, notes FROM lineage WHERE artifact_id = %s ORDER BY id",
+                (artifact_id,),
+            )
+            assert cur.fetchall() == [
+                ("run-1", 0, 1, None),
+                ("run-1", 2, 3, None),
+                ("run-2", 4, 5, None),
+                ("run-2", 6, 6, "1 invalid"),
+                ("run-2", None, None, "7 records"),
+            ]
+    finally:
+        conn.close()
+
+
+class CapturingStore:
+    def __init__(self):
+        self.objects = {}
+
+    def fput_object(self, bucket, key, path, content_type=None):
+        with open(path, "rb") as fh:
+            self.objects[(bucket, key)] = fh.read()
+
+
+def test_export_artifact_writes_typed_parquet(seeded_artifact):
+    pq = pytest.importorskip("pyarrow.parquet")
+    dsn, artifact_id, task_id = seeded_artifact
+    conn = open_conn(dsn)
+    store = CapturingStore()
+    try:
+        load_records(conn, task_id, artifact_id, _batches(5), lineage=LineageRecorder("run-1"))
+        uri = export_artifact(conn, store, "raw", "raw/aa/" + "a" * 64, artifact_id, REGISTRY.get("customer-ledger@1.0"))
+    finally:
+        conn.close()
+
+    assert uri == "s3://raw/raw/aa/" + "a" * 64 + ".records.parquet"
+    table = pq.read_table(io.BytesIO(store.objects[("raw", "raw/aa/" + "a" * 64 + ".records.parquet")]))
+    assert table.num_rows == 5
+    assert table.column("iznos").to_pylist() == [0.0, 1.5, 3.0, 4.5, 6.0]
+    assert table.column("valid").to_pylist() == [True, True, True, True, False]
+    assert table.schema.metadata[b"schema_version"] == b"customer-ledger@1.0"
+
+
+def test_stale_task_out_of_attempts_is_dead_lettered_and_output_discarded(seeded_artifact):
+    dsn, artifact_id, task_id = seeded_artifact
+    conn = open_conn(dsn)
+    try:
+        claim_tasks(conn, 1)
+        with pytest.raises(OSError):
+            load_records(conn, task_id, artifact_id, _crash_after(_batches(7), 2), lineage=LineageRecorder("run-1"))
+        conn.rollback()
+
+        requeued, exhausted = requeue_stale_tasks(conn, 0, max_attempts=1)
+        assert requeued == 0
+        assert [(t.id, t.attempts, t.checkpoint_row) for t in exhausted] == [(task_id, 1, 3)]
+        assert claim_tasks(conn, 5) == []
+
+        discard_output(conn, artifact_id)
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM normalized_record WHERE artifact_id = %s", (artifact_id,))
+            assert cur.fetchone() == (0,)
+            cur.execute("SELECT count(*) FROM lineage WHERE artifact_id = %s AND action = 'PARSED'", (artifact_id,))
+            assert cur.fetchone() == (0,)
+            cur.execute("SELECT status, last_error, checkpoint_row FROM ingest_task WHERE id = %s", (task_id,))
+            assert cur.fetchone() == ("dlq", "lease expired", None)
+    finally:
+        conn.close()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import numpy as np
+import psycopg
+import pytest
+from psycopg_pool import AsyncConnectionPool
+
+from app.core.config import Settings
+from app.db.ann import ANN_INDEX, QUANTIZED_MIN_PGVECTOR, AnnConfig, pgvector_version, rebuild_ann_index, verify_index
+from app.services.hybrid import dense_query
+from app.text.embed import to_vector_literal
+
+
+def _seed(conn: psycopg.Connection, n: int = 300) -> np.ndarray:
+    vectors = np.random.default_rng(7).standard_normal((n, 1024)).astype(np.float32)
+    with conn.cursor() as cur:
+        for i, vector in enumerate(vectors):
+            cur.execute(
+                "INSERT INTO chunk (document_key, chunk_index, start_offset, end_offset, token_count, text, embedding, "
+                "embedding_model) VALUES ('ann.txt', %s, 0, 1, 1, 'x', %s::vector, 'test')",
+                (i, to_vector_literal(vector)),
+            )
+    return vectors
+
+
+def _index_names(conn: psycopg.Connection) -> list[str]:
+    rows = conn.execute(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'chunk' AND indexname LIKE %s ORDER BY 1",
+        (f"{ANN_INDEX}%",),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def test_rebuild_ann_index_swaps_kinds(migrated_db):
+    with psycopg.connect(migrated_db, autocommit=True) as conn:
+        assert "USING hnsw" in rebuild_ann_index(conn, AnnConfig(kind="hnsw"), concurrently=False)
+        vectors = _seed(conn)
+
+        ivfflat = rebuild_ann_index(conn, AnnConfig(kind="ivfflat", lists=4))
+        assert "USING ivfflat" in ivfflat and "lists='4'" in ivfflat
+        assert _index_names(conn) == [ANN_INDEX]
+
+        with conn.transaction():
+            conn.execute("SET LOCAL enable_seqscan = off")
+            conn.execute("SELECT set_config('ivfflat.probes', '4', true)")  # every list: exact
+            plan = "\n".join(r[0] for r in conn.execute(
+                "EXPLAIN SELECT id FROM chunk ORDER BY embedding <=> %s::vector LIMIT 5",
+                (to_vector_literal(vectors[0]),),
+            ))
+            top = conn.execute(
+                "SELECT chunk_index FROM chunk ORDER BY embedding <=> %s::vector LIMIT 1",
+                (to_vector_literal(vectors[0]),),
+            ).fetchone()
+        assert ANN_INDEX in plan
+        assert top == (0,)
+
+        hnsw = rebuild_ann_index(conn, AnnConfig(kind="hnsw", m=8, ef_construction=32))
+        assert "USING hnsw" in hnsw and "m='8'" in hnsw
+        assert _index_names(conn) == [ANN_INDEX]
+
+
+@pytest.mark.parametrize(
+    ("quantization", "opclass"), [("halfvec", "halfvec_cosine_ops"), ("binary", "bit_hamming_ops")]
+)
+def test_quantized_index_rescores_at_full_precision(migrated_db, quantization, opclass):
+    # Below pgvector 0.7 (as in CI) only the refusal branch runs; the quantized SQL
+    # itself is covered by test_quantized_distance_repeats_the_indexed_expression.
+    config = AnnConfig(kind="hnsw", quantization=quantization, rescore_factor=4)
+    with psycopg.connect(migrated_db, autocommit=True) as conn:
+        vectors = _seed(conn, 100)
+        if pgvector_version(conn) < QUANTIZED_MIN_PGVECTOR:
+            with pytest.raises(RuntimeError, match="pgvector >= 0.7"):
+                rebuild_ann_index(conn, config, concurrently=False)
+            assert _index_names(conn) == [ANN_INDEX]  # the live index is left alone
+            return
+
+        indexdef = rebuild_ann_index(conn, config, concurrently=False)
+        query = to_vector_literal(vectors[3])
+        rows = conn.execute(dense_query(config), {"v": query, "model": "test", "n": 5, "candidates": 20}).fetchall()
+        exact = conn.execute(
+            "SELECT id FROM chunk ORDER BY embedding <=> %s::vector LIMIT 5", (query,)
+        ).fetchall()
+    assert opclass in indexdef
+    assert rows[0] == exact[0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quantization", ["halfvec", "binary"])
+async def test_verify_index_rejects_quantization_the_database_cannot_serve(migrated_db, quantization):
+    pool = AsyncConnectionPool(migrated_db, min_size=1, max_size=1, open=False)
+    await pool.open()
+    try:
+        await verify_index(pool, AnnConfig(kind="hnsw"))
+        with psycopg.connect(migrated_db) as conn:
+            too_old = pgvector_version(conn) < QUANTIZED_MIN_PGVECTOR
+        match = "pgvector >= 0.7" if too_old else "rebuild it"  # the migration builds a full-precision index
+        with pytest.raises(RuntimeError, match=match):
+            await verify_index(pool, AnnConfig(kind="hnsw", quantization=quantization))
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_verify_index_rejects_settings_for_another_index_method(migrated_db):
+    pool = AsyncConnectionPool(migrated_db, min_size=1, max_size=1, open=False)
+    await pool.open()
+    try:
+        await verify_index(pool, AnnConfig.from_settings(Settings(DATABASE_URL=migrated_db)))  # the migrated default
+        with pytest.raises(RuntimeError, match="PGVECTOR_INDEX=ivfflat"):
+            await verify_index(pool, AnnConfig(kind="ivfflat"))
+        with psycopg.connect(migrated_db, autocommit=True) as conn:
+            conn.execute(f"DROP INDEX {ANN_INDEX}")
+        with pytest.raises(RuntimeError, match="is None"):
+            await verify_index(pool, AnnConfig(kind="hnsw"))
+    finally:
+        await pool.close()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.text.chunking import ChunkBudget
+from app.text.corpus import chunk_corpus, document_key, iter_corpus
+from app.watcher.db import open_conn
+
+
+CORPUS = Path(__file__).resolve().parents[2] / "fixtures" / "corpus"
+
+
+def test_chunk_corpus_writes_and_replaces_chunks(migrated_db):
+    relpaths = [document_key(p, CORPUS) for p in iter_corpus(CORPUS)]
+    conn = open_conn(migrated_db)
+    try:
+        first = chunk_corpus(CORPUS, relpaths, ChunkBudget(max_tokens=60), workers=2, shard_size=1, conn=conn)
+        second = chunk_corpus(CORPUS, relpaths, ChunkBudget(max_tokens=120), workers=1, conn=conn)
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*), count(DISTINCT document_key), max(token_count) FROM chunk")
+            count, docs, max_tokens = cur.fetchone()
+            cur.execute(
+                "SELECT clause_title, text, text_norm FROM chunk WHERE document_key = %s ORDER BY chunk_index LIMIT 1",
+                ("zakon_rs_cirilica.txt",),
+            )
+            title, text, text_norm = cur.fetchone()
+            cur.execute("SELECT version FROM search_index_state")
+            (version,) = cur.fetchone()
+    finally:
+        conn.close()
+
+    assert first.chunks > second.chunks
+    assert (count, docs) == (second.chunks, 3)
+    assert max_tokens <= 120
+    assert version == 4  # one bump per written shard: 3 + 1
+    assert title.startswith("Члан 1")
+    assert text.startswith("ЗАКОН О РАЧУНОВОДСТВУ")
+    assert text_norm.startswith("zakon o racunovodstvu")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.text.chunking import ChunkBudget
+from app.text.corpus import chunk_corpus
+from app.watcher.db import open_conn
+
+
+FIXTURE = Path(__file__).resolve().parents[2] / "fixtures" / "corpus" / "zakon_o_pdv_izvod.txt"
+
+
+def test_republished_document_chunks_point_at_canonical(migrated_db, tmp_path):
+    text = FIXTURE.read_text(encoding="utf-8")
+    (tmp_path / "fbih").mkdir()
+    (tmp_path / "rs").mkdir()
+    (tmp_path / "fbih" / "pdv.txt").write_text("Službene novine FBiH\n" + text, encoding="utf-8")
+    (tmp_path / "rs" / "pdv.txt").write_text("СЛУЖБЕНИ ГЛАСНИК РС\n" + text, encoding="utf-8")
+    budget = ChunkBudget(max_tokens=80)
+
+    conn = open_conn(migrated_db)
+    try:
+        first = chunk_corpus(tmp_path, ["fbih/pdv.txt"], budget, conn=conn)
+        second = chunk_corpus(tmp_path, ["rs/pdv.txt"], budget, conn=conn)
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT count(*) FILTER (WHERE d.duplicate_of IS NOT NULL),
+                       bool_and(c.document_key = 'fbih/pdv.txt' AND c.duplicate_of IS NULL)
+                FROM chunk d LEFT JOIN chunk c ON c.id = d.duplicate_of
+                WHERE d.document_key = 'rs/pdv.txt'
+                """
+            )
+            marked, canonical_ok = cur.fetchone()
+            cur.execute("SELECT count(*) FROM chunk_lsh")
+            (bands,) = cur.fetchone()
+        again = chunk_corpus(tmp_path, ["rs/pdv.txt"], budget, conn=conn)
+    finally:
+        conn.close()
+
+    assert first.duplicates == 0
+    assert second.duplicates == marked >= second.chunks - 1
+    assert canonical_ok
+    assert bands == 16 * (first.chunks + second.chunks)
+    assert again.duplicates == second.duplicates
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+
+from app.text.corpus import write_chunks
+from app.text.dedup import DEFAULT_HASHER
+from app.text.normalize import normalize
+from app.watcher.db import open_conn
+
+
+def _row(key: str, index: int, text: str) -> tuple:
+    norm = normalize(text)
+    return (key, index, f"Član {index + 1}", 0, len(text), len(text.split()), text, norm,
+            DEFAULT_HASHER.to_bytes(DEFAULT_HASHER.signature(norm)))
+
+
+def test_chunk_search_ranks_and_folds_diacritics(migrated_db):
+    conn = open_conn(migrated_db)
+    try:
+        write_chunks(conn, ["a.txt"], [
+            _row("a.txt", 0, "Porez na dobit plaća se godišnje."),
+            _row("a.txt", 1, "Porez na dobit i porez na dohodak, porez po odbitku."),
+            _row("a.txt", 2, "Члан о порезу на додату вриједност."),
+        ])
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM chunk_search(%s, %s)", ("porez", 10))
+            ranked = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT snippet FROM chunk_search(%s, 5)", ("PLAĆA",))
+            folded = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT count(*) FROM chunk_search(%s)", ("porezu",))
+            (cyrillic,) = cur.fetchone()
+    finally:
+        conn.close()
+
+    assert len(ranked) == 2 and ranked[0] > ranked[1]  # the chunk repeating "porez" ranks first
+    assert len(folded) == 1 and folded[0].startswith("Porez na dobit")
+    assert cyrillic == 1
+
+
+def test_chunk_search_returns_bounded_highlighted_snippet(migrated_db):
+    filler = " ".join(f"riječ{n}" for n in range(3000))
+    text = f"{filler} obveznik podnosi prijavu do desetog dana {filler}"
+    conn = open_conn(migrated_db)
+    try:
+        write_chunks(conn, ["long.txt"], [_row("long.txt", 0, text)])
+        with conn.cursor() as cur:
+            cur.execute("SELECT snippet FROM chunk_search(%s, 1)", ("prijavu",))
+            (snippet,) = cur.fetchone()
+    finally:
+        conn.close()
+
+    assert "«prijavu»" in snippet
+    assert len(snippet.split()) <= 35 * 2 + 1
+    assert len(snippet) < len(text) // 50
+
+
+def test_chunk_search_uses_gin_index(migrated_db):
+    conn = open_conn(migrated_db)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO chunk (document_key, chunk_index, start_offset, end_offset, token_count, text, text_norm)
+                SELECT 'bulk.txt', n, 0, 20, 3, 'odredba broj ' || n, 'odredba broj ' || n
+                FROM generate_series(1, 20000) AS n
+                """
+            )
+            cur.execute(
+                "INSERT INTO chunk (document_key, chunk_index, start_offset, end_offset, token_count, text, text_norm) "
+                "VALUES ('bulk.txt', 0, 0, 20, 3, 'rok za prijavu', 'rok za prijavu')"
+            )
+        conn.commit()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            # Flush the GIN pending list, as autovacuum would on a live table.
+            cur.execute("VACUUM ANALYZE chunk")
+            cur.execute("EXPLAIN (FORMAT JSON) SELECT * FROM chunk_search('prijavu', 10)")
+            plan = json.dumps(cur.fetchone()[0])
+    finally:
+        conn.close()
+
+    assert '"Index Name": "idx_chunk_tsv"' in plan
+    assert '"Node Type": "Seq Scan"' not in plan
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from app.text.chunking import ChunkBudget
+from app.text.corpus import chunk_document, write_chunks
+from app.text.embed import HashingEmbedder
+from app.text.embed_cache import content_key, embed_pending
+from app.text.normalize import normalize
+from app.watcher.db import open_conn
+
+
+CLAUSES = [
+    "Član 1 Obveznik PDV-a podnosi prijavu do desetog dana narednog mjeseca.",
+    "Član 2 Prag za obavezni upis u registar obveznika PDV-a iznosi 100.000 KM prometa.",
+]
+
+
+class CountingModel(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.texts: list[str] = []
+
+    def embed(self, texts):
+        self.texts.extend(texts)
+        return super().embed(texts)
+
+
+def _write(conn, key: str, text: str) -> None:
+    write_chunks(conn, [key], chunk_document(key, text, ChunkBudget(max_tokens=20, overlap=0)), near_dup_threshold=None)
+
+
+def test_embed_pending_reuses_cached_vectors(migrated_db):
+    model = CountingModel()
+    conn = open_conn(migrated_db)
+    try:
+        _write(conn, "a.txt", "\n".join(CLAUSES))
+        _write(conn, "b.txt", CLAUSES[0])  # same text as a chunk of a.txt
+        first = embed_pending(conn, model, batch_size=2)
+        second = embed_pending(conn, model)
+
+        _write(conn, "a.txt", "\n".join(CLAUSES))  # re-chunk: new rows, unchanged text
+        _write(conn, "c.txt", "Član 9 Novi tekst o porezu na dobit.")
+        _write(conn, "d.txt", "Član 9 Novi tekst o porezu na dobit, skoro isti.")
+        conn.execute("UPDATE chunk SET duplicate_of = (SELECT min(id) FROM chunk) WHERE document_key = 'd.txt'")
+        third = embed_pending(conn, model)
+
+        missing = conn.execute("SELECT document_key FROM chunk WHERE embedding IS NULL").fetchall()
+        cache = conn.execute("SELECT content_sha256, model_version FROM embedding_cache").fetchall()
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert (first.chunks, first.cached, first.embedded) == (3, 1, 2)
+    assert second.chunks == 0
+    assert (third.chunks, third.cached, third.embedded) == (3, 2, 1)
+    assert len(model.texts) == 3 == len(set(model.texts))
+    assert all(text != normalize(text) for text in model.texts)  # the model sees the original wording
+    assert missing == [("d.txt",)]  # near-duplicates are never embedded
+    assert {row[1] for row in cache} == {model.model_version}
+    assert content_key(normalize(CLAUSES[0])) in {bytes(row[0]) for row in cache}
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+from psycopg_pool import AsyncConnectionPool
+
+from app.services.hybrid import hybrid_search
+from app.text.corpus import chunk_document, write_chunks
+from app.text.chunking import ChunkBudget
+from app.text.embed import HashingEmbedder, to_vector_literal
+from app.watcher.db import open_conn
+
+
+DOC = """Član 1 Obveznik PDV-a podnosi prijavu do desetog dana narednog mjeseca.
+Član 2 Prag za obavezni upis u registar obveznika PDV-a iznosi 100.000 KM prometa.
+Član 3 Porez na dobit plaća se po stopi od 10% na poresku osnovicu.
+Član 4 Rok za prijavu poreza na dobit je 31. mart naredne godine.
+"""
+
+
+def _seed(url: str, embedder: HashingEmbedder) -> None:
+    conn = open_conn(url)
+    try:
+        rows = chunk_document("pdv.txt", DOC, ChunkBudget(max_tokens=20, overlap=0))
+        write_chunks(conn, ["pdv.txt"], rows)
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, text FROM chunk WHERE chunk_index < 3 ORDER BY chunk_index")
+            for chunk_id, text in cur.fetchall():
+                cur.execute(
+                    "UPDATE chunk SET embedding = %s::vector, embedding_model = %s WHERE id = %s",
+                    (to_vector_literal(embedder.embed([text])[0]), embedder.model_version, chunk_id),
+                )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_dense_and_lexical(migrated_db):
+    embedder = HashingEmbedder()
+    _seed(migrated_db, embedder)
+    pool = AsyncConnectionPool(migrated_db, min_size=1, max_size=2, open=False)
+    await pool.open()
+    try:
+        result = await hybrid_search(pool, embedder, "rok za prijavu", top_k=3, diversity=0.3)
+        empty = await hybrid_search(pool, embedder, "xyzzy", top_k=3)
+    finally:
+        await pool.close()
+
+    assert len(result.hits) == 3
+    assert any("«prijavu»" in hit.text for hit in result.hits)
+    # Član 4 has no embedding yet, so it can only come from the lexical retriever.
+    lexical_only = [hit for hit in result.hits if hit.dense_rank is None]
+    assert lexical_only and all(hit.lexical_rank for hit in lexical_only)
+    assert set(result.timings_ms) == {"embed", "retrieve", "fuse", "fetch", "mmr", "total"}
+    assert [hit.lexical_rank for hit in empty.hits] == [None] * 3  # dense still returns the embedded chunks
+
+
+@pytest.mark.asyncio
+async def test_dense_retriever_skips_vectors_from_another_model(migrated_db):
+    embedder = HashingEmbedder()
+    _seed(migrated_db, embedder)
+    conn = open_conn(migrated_db)
+    try:
+        conn.execute("UPDATE chunk SET embedding_model = 'retired-model' WHERE chunk_index = 0")
+        conn.commit()
+    finally:
+        conn.close()
+    pool = AsyncConnectionPool(migrated_db, min_size=1, max_size=2, open=False)
+    await pool.open()
+    try:
+        result = await hybrid_search(pool, embedder, "xyzzy", top_k=5)
+    finally:
+        await pool.close()
+
+    assert len(result.hits) == 2  # chunk 0 waits for a re-embed; chunk 3 has no vector
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.ingest.lineage import LineageEvent, LineageRecorder, LineageWriter
+
+
+class FakeWriter:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, run_id, events):
+        self.submitted.append((run_id, events))
+
+
+def test_recorder_buffers_until_flush():
+    recorder = LineageRecorder("run-1")
+    recorder.record_range("PARSED", "art-1", 0, 4999)
+    recorder.record("PARSED", artifact_id="art-1", notes="5000 records")
+    assert len(recorder) == 2
+
+    writer = FakeWriter()
+    assert recorder.flush_async(writer) == 2
+    assert len(recorder) == 0
+    run_id, events = writer.submitted[0]
+    assert run_id == "run-1"
+    assert events[0] == LineageEvent("PARSED", artifact_id="art-1", row_start=0, row_end=4999)
+    assert recorder.flush_async(writer) == 0
+    assert len(writer.submitted) == 1
+
+
+def test_record_range_rejects_empty_span():
+    with pytest.raises(ValueError):
+        LineageRecorder("run-1").record_range("PARSED", "art-1", 5, 4)
+
+
+def test_writer_merges_batches_queued_during_a_write(monkeypatch):
+    writes = []
+    busy = threading.Event()
+    release = threading.Event()
+
+    def fake_write(self, pending):
+        writes.append(pending)
+        busy.set()
+        release.wait(5)
+
+    monkeypatch.setattr(LineageWriter, "_write", fake_write)
+    writer = LineageWriter("postgresql://unused")
+    writer.submit("run-1", [LineageEvent("A")])
+    assert busy.wait(5)
+    writer.submit("run-1", [LineageEvent("B")])
+    writer.submit("run-2", [LineageEvent("C")])
+    writer.submit("run-1", [LineageEvent("D")])
+    release.set()
+    writer.close(timeout=5)
+
+    assert len(writes) == 2
+    assert [e.action for e in writes[1]["run-1"]] == ["B", "D"]
+    assert [e.action for e in writes[1]["run-2"]] == ["C"]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime
+
+import pytest
+
+from app.ingest.errors import ParseError, UnsupportedFormatError
+from app.ingest.parsing import (
+    build_header,
+    detect_format,
+    iter_csv_rows,
+    iter_record_batches,
+    iter_xlsx_rows,
+    sniff_delimiter,
+)
+
+
+def test_detect_format_by_mime_and_extension():
+    assert detect_format("ledger.CSV", None) == "csv"
+    assert detect_format("ledger.bin", "text/csv; charset=utf-8") == "csv"
+    assert detect_format("ledger.xlsx", None) == "xlsx"
+    with pytest.raises(UnsupportedFormatError):
+        detect_format("scan.pdf", "application/pdf")
+
+
+def test_sniff_delimiter_prefers_semicolon():
+    assert sniff_delimiter("konto;opis;iznos\n") == ";"
+    assert sniff_delimiter("single\n") == ","
+
+
+def test_iter_csv_rows_streams_semicolon_file():
+    raw = io.BytesIO("﻿konto;opis;iznos\r\n2100;Kupci;12,50\r\n".encode("utf-8"))
+    rows = list(iter_csv_rows(raw))
+    assert rows == [["konto", "opis", "iznos"], ["2100", "Kupci", "12,50"]]
+
+
+def test_iter_csv_rows_rejects_bad_encoding():
+    with pytest.raises(ParseError):
+        list(iter_csv_rows(io.BytesIO(b"a,b\n\xff\xfe,1\n")))
+
+
+def test_build_header_fills_blank_and_duplicate_names():
+    assert build_header(["konto", None, "konto", " "]) == ["konto", "col_1", "konto_1", "col_3"]
+
+
+def test_iter_record_batches_skips_blank_rows_and_counts_across_batches():
+    row_batches = [[[], ["konto", "iznos"]], [["2100", " 12 "], ["", ""]], [["2200", None, "extra"]]]
+    batches = list(iter_record_batches(row_batches, "customer-ledger@1.0"))
+    assert [len(batch) for batch in batches] == [1, 1]
+    records = [record for batch in batches for record in batch]
+    assert [r.row_index for r in records] == [0, 1]
+    assert records[0].payload == {"konto": "2100", "iznos": "12"}
+    assert records[1].payload == {"konto": "2200", "iznos": None, "col_2": "extra"}
+    assert all(r.schema_version == "customer-ledger@1.0" for r in records)
+
+
+def test_short_rows_keep_every_header_column():
+    row_batches = [[["konto", "datum", "iznos"], ["1100"], ["1200", "01.02.2024", "1.234,50"]]]
+    (records,) = list(iter_record_batches(row_batches, "customer-ledger@1.0"))
+    assert records[0].payload == {"konto": "1100", "datum": None, "iznos": None}
+    assert records[1].payload == {"konto": "1200", "datum": "01.02.2024", "iznos": "1.234,50"}
+
+
+def test_iter_xlsx_rows_read_only():
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["datum", "iznos"])
+    sheet.append([datetime(2024, 5, 12), 10.5])
+    buf = io.BytesIO()
+    workbook.save(buf)
+    buf.seek(0)
+
+    (records,) = list(iter_record_batches([list(iter_xlsx_rows(buf))], "customer-ledger@1.0"))
+    assert records[0].payload == {"datum": "2024-05-12T00:00:00", "iznos": 10.5}
+
+
+def test_iter_xlsx_rows_invalid_file():
+    pytest.importorskip("openpyxl")
+    with pytest.raises(ParseError):
+        list(iter_xlsx_rows(io.BytesIO(b"not a zip")))
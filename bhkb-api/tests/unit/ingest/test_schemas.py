@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.ingest.errors import UnknownSchemaError
+from app.ingest.parsing import ParsedRecord
+from app.ingest.schemas import FieldSpec, SchemaRegistry, SchemaSpec, coerce_dates, coerce_numbers
+
+
+def _batch(*payloads: dict) -> list[ParsedRecord]:
+    return [ParsedRecord(row_index=i, payload=dict(p), schema_version="customer-ledger@1.0") for i, p in enumerate(payloads)]
+
+
+def test_coerce_numbers_handles_bcs_and_english_notation():
+    numbers, invalid = coerce_numbers(["1.234,56", "12,5", "1,234.56", " 3 000,00 ", 7, "abc", None])
+    assert numbers.to_pylist() == [1234.56, 12.5, 1234.56, 3000.0, 7.0, None, None]
+    assert invalid.tolist() == [False, False, False, False, False, True, False]
+
+
+def test_coerce_dates_accepts_common_formats():
+    dates, invalid = coerce_dates(["12.05.2024.", "2024-05-12T00:00:00", "13/01/2023", "32.13.2024", None])
+    assert dates.to_pylist() == ["2024-05-12", "2024-05-12", "2023-01-13", None, None]
+    assert invalid.tolist() == [False, False, False, True, False]
+
+
+def test_coerce_dates_rejects_impossible_calendar_dates():
+    dates, invalid = coerce_dates(["31.02.2024", "2024-02-31", "31.04.2024", "29.02.2023", "29.02.2024", "1.2.2024"])
+    assert dates.to_pylist() == [None, None, None, None, "2024-02-29", "2024-02-01"]
+    assert invalid.tolist() == [True, True, True, True, False, False]
+
+
+def test_validate_batch_coerces_and_flags_rows_without_failing():
+    validator = SchemaRegistry().get("customer-ledger@1.0")
+    batch = validator.validate_batch(
+        _batch(
+            {"Konto": "2100", "Datum": "12.05.2024", "Potražuje": "1.234,50"},
+            {"Konto": None, "Datum": "sutra", "Potražuje": "x"},
+        )
+    )
+    assert batch[0].valid and batch[0].errors == []
+    assert batch[0].payload == {"Konto": "2100", "Datum": "2024-05-12", "Potražuje": 1234.5}
+    assert batch[1].valid is False
+    assert batch[1].errors == [
+        "missing required field 'konto'",
+        "invalid date in 'Datum': 'sutra'",
+        "invalid number in 'Potražuje': 'x'",
+    ]
+    assert batch[1].payload["Potražuje"] == "x"
+
+
+def test_missing_required_column_marks_every_row():
+    validator = SchemaRegistry().get("customer-ledger@1.0")
+    batch = validator.validate_batch(_batch({"konto": "1"}, {"konto": "2"}))
+    assert [r.errors for r in batch] == [["missing required field 'datum'"]] * 2
+
+
+def test_columns_resolve_from_every_row_of_the_batch():
+    validator = SchemaRegistry().get("customer-ledger@1.0")
+    batch = validator.validate_batch(_batch({"konto": "1100"}, {"konto": "1200", "datum": "01.02.2024"}))
+    assert batch[0].errors == ["missing required field 'datum'"]
+    assert batch[1].valid and batch[1].payload == {"konto": "1200", "datum": "2024-02-01"}
+
+
+def test_integer_fields_reject_fractions():
+    registry = SchemaRegistry({})
+    registry.register(SchemaSpec("qty@1", (FieldSpec("kolicina", "integer"),)))
+    batch = registry.get("qty@1").validate_batch(_batch({"kolicina": "3"}, {"kolicina": "2,5"}))
+    assert batch[0].payload["kolicina"] == 3
+    assert batch[1].errors == ["invalid integer in 'kolicina': '2,5'"]
+
+
+def test_registry_compiles_once_and_rejects_unknown_versions():
+    registry = SchemaRegistry()
+    assert registry.get("customer-ledger@1.0") is registry.get("customer-ledger@1.0")
+    with pytest.raises(UnknownSchemaError):
+        registry.get("customer-ledger@9.9")
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings
+from app.db.ann import QUANTIZATIONS, AnnConfig, index_ddl, suggest_lists
+
+
+def test_search_settings_defaults_and_effort():
+    config = AnnConfig(lists=100, probes=10, ef_search=40)
+    assert config.search_settings() == {"ivfflat.probes": "10", "hnsw.ef_search": "40"}
+    assert config.search_settings(0.0) == {"ivfflat.probes": "1", "hnsw.ef_search": "1"}
+    assert config.search_settings(0.25) == {"ivfflat.probes": "25", "hnsw.ef_search": "250"}
+    assert config.search_settings(1.0) == {"ivfflat.probes": "100", "hnsw.ef_search": "1000"}
+    with pytest.raises(ValueError):
+        config.search_settings(1.5)
+
+
+def test_effort_scales_hnsw_at_default_settings():
+    settings = Settings(DATABASE_URL="postgresql://x/y", PGVECTOR_INDEX="hnsw")
+    config = AnnConfig.from_settings(settings)
+    ef = [int(config.search_settings(effort)["hnsw.ef_search"]) for effort in (None, 0.1, 0.5, 1.0)]
+    assert ef == [40, 100, 500, 1000]
+    # The dense stage asks for no more rows than the scan can return.
+    limits = [config.dense_limits(settings.PREFETCH_LIMIT, effort) for effort in (None, 0.1, 1.0)]
+    assert limits == [(40, 40), (100, 100), (1000, 1000)]
+    assert AnnConfig(kind="ivfflat").dense_limits(settings.PREFETCH_LIMIT, 0.1) == (1000, 1000)
+
+
+def test_config_validation_and_from_settings():
+    with pytest.raises(ValueError):
+        AnnConfig(kind="flat")
+    settings = SimpleNamespace(
+        PGVECTOR_INDEX="hnsw", PGVECTOR_LISTS=50, PGVECTOR_PROBES=5,
+        PGVECTOR_HNSW_M=24, PGVECTOR_HNSW_EF_CONSTRUCTION=128, PGVECTOR_EF_SEARCH=80,
+        PGVECTOR_QUANTIZATION="halfvec", PGVECTOR_RESCORE_FACTOR=2,
+    )
+    assert AnnConfig.from_settings(settings) == AnnConfig("hnsw", 50, 5, 24, 128, 80, "halfvec", 2)
+
+
+def test_suggest_lists():
+    assert suggest_lists(0) == 1
+    assert suggest_lists(250_000) == 250
+    assert suggest_lists(4_000_000) == 2000
+
+
+def test_index_ddl():
+    ivfflat = index_ddl(AnnConfig(lists=64), "idx_new").as_string(None)
+    hnsw = index_ddl(AnnConfig(kind="hnsw", m=8, ef_construction=32), concurrently=False).as_string(None)
+    assert ivfflat == (
+        'CREATE INDEX CONCURRENTLY "idx_new" ON chunk USING ivfflat (embedding vector_cosine_ops) WITH (lists = 64)'
+    )
+    assert hnsw == (
+        'CREATE INDEX "idx_chunk_embedding_ann" ON chunk USING hnsw '
+        "(embedding vector_cosine_ops) WITH (m = 8, ef_construction = 32)"
+    )
+
+
+def test_quantized_index_ddl_and_candidates():
+    with pytest.raises(ValueError):
+        AnnConfig(quantization="int8")
+    halfvec = AnnConfig(kind="hnsw", quantization="halfvec", rescore_factor=3)
+    binary = AnnConfig(lists=10, quantization="binary")
+    assert "USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops)" in index_ddl(halfvec).as_string(None)
+    assert "USING ivfflat ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops)" in index_ddl(binary).as_string(None)
+    assert binary.distance.startswith("binary_quantize(embedding)::bit(1024) <~>")
+    # HNSW reads at most ef_search rows, so the rescore depth fits inside it.
+    assert halfvec.dense_limits(1000) == (13, 40)
+    assert halfvec.dense_limits(1000, 1.0) == (333, 1000)
+    assert halfvec.dense_limits(100, 1.0) == (100, 300)
+    assert binary.dense_limits(100) == (100, 400)  # IVFFlat has no per-scan cap
+
+
+@pytest.mark.parametrize("quantization", ["none", "halfvec", "binary"])
+def test_quantized_distance_repeats_the_indexed_expression(quantization):
+    # pgvector < 0.7 cannot run these queries, so this is the check that holds everywhere:
+    # the planner only uses the expression index when ORDER BY repeats it verbatim.
+    expression, _, distance = QUANTIZATIONS[quantization]
+    indexed = expression[1:-1] if expression.startswith("(") else expression
+    assert distance.startswith(f"{indexed} ")
+    assert f"({expression} " in index_ddl(AnnConfig(quantization=quantization)).as_string(None)
@@ -20,6 +20,23 @@ async def test_lifespan_initializes_resources(monkeypatch):
         S3_ACCESS_KEY: str = "minio"
         S3_SECRET_KEY: str = "secret"
         APP_NAME: str = "Test"
+        SEARCH_CACHE_BACKEND: str = "memory"
+        SEARCH_CACHE_SIZE: int = 16
+        SEARCH_CACHE_TTL_SECONDS: float = 60.0
+        INDEX_VERSION_REFRESH_SECONDS: float = 5.0
+        REDIS_URL = None
+        EMBEDDING_DIM: int = 8
+        EMBEDDING_BACKEND: str = "hashing"
+        EMBED_MAX_BATCH: int = 4
+        EMBED_MAX_LATENCY_MS: float = 1.0
+        PGVECTOR_INDEX: str = "hnsw"
+        PGVECTOR_LISTS: int = 100
+        PGVECTOR_PROBES: int = 10
+        PGVECTOR_HNSW_M: int = 16
+        PGVECTOR_HNSW_EF_CONSTRUCTION: int = 64
+        PGVECTOR_EF_SEARCH: int = 40
+        PGVECTOR_QUANTIZATION: str = "none"
+        PGVECTOR_RESCORE_FACTOR: int = 4
 
     class DummyHttpClient:
         closed = False
@@ -60,6 +77,12 @@ async def test_lifespan_initializes_resources(monkeypatch):
         return dummy_pool
 
     monkeypatch.setattr("app.main.create_pool", fake_create_pool)
+    verified = []
+
+    async def fake_verify_index(pool, config):
+        verified.append((pool, config.kind))
+
+    monkeypatch.setattr("app.main.verify_index", fake_verify_index)
     monkeypatch.setattr("app.main.httpx", SimpleNamespace(AsyncClient=DummyHttpClient))
 
     captured_minio = {}
@@ -87,6 +110,7 @@ async def test_lifespan_initializes_resources(monkeypatch):
         assert app.state.settings.APP_NAME == "Test"
         assert isinstance(app.state.http, DummyHttpClient)
         assert captured_minio["secure"] is False
+        assert verified == [(dummy_pool, "hnsw")]
 
     assert dummy_pool.closed is True
     assert app.state.http.closed is True
@@ -1,4 +1,8 @@
-from app.meta import extract_effective_from, guess_jurisdiction
+from datetime import date
+
+import pytest
+
+from app.meta import EffectiveDateExtractor, JurisdictionClassifier, extract_effective_from, guess_jurisdiction
 
 
 def test_guess_jurisdiction_url_priority():
@@ -20,3 +24,88 @@ def test_extract_effective_from():
 
 def test_extract_effective_from_none():
     assert extract_effective_from("nema datuma") is None
+
+
+def test_classifier_scores_header_and_footer_only():
+    classifier = JurisdictionClassifier(header_chars=200, footer_chars=100)
+    body = "Republika Srpska " * 50
+    text = "SLUŽBENE NOVINE FEDERACIJE BOSNE I HERCEGOVINE\n" + "x " * 200 + body + "y " * 200 + "Mostar"
+    guess = classifier.classify(text)
+    assert guess.code == "FBIH"
+    assert "RS" not in guess.scores
+    assert guess.confidence > 0.8  # "Bosne i Hercegovine" adds a little state-level evidence
+
+
+def test_classifier_handles_cyrillic_and_mixed_evidence():
+    classifier = JurisdictionClassifier()
+    guess = classifier.classify("СЛУЖБЕНИ ГЛАСНИК РЕПУБЛИКЕ СРПСКЕ, Бања Лука\nУправа за индиректно опорезивање")
+    assert guess.code == "RS"
+    assert guess.scores == {"RS": 3.5, "BIH": 3.0}
+    assert 0.5 < guess.confidence < 0.6
+
+
+def test_classifier_batch_api():
+    docs = [
+        ("https://www.pufbih.ba/x", ""),
+        (None, "Skupština Brčko distrikta BiH"),
+        (None, "bez oznaka"),
+    ]
+    assert [g.code for g in JurisdictionClassifier().classify_many(docs)] == ["FBIH", "BD", None]
+
+
+def test_extract_effective_from_ignores_unanchored_dates():
+    text = "Objavljeno u Službenom glasniku 03.04.2024. Odluka stupa na snagu 12.05.2024. godine"
+    assert extract_effective_from(text) == "2024-05-12"
+    assert extract_effective_from("Sjednica održana 03.04.2024.") is None
+
+
+def test_extractor_prefers_application_date_and_finds_effective_to():
+    text = (
+        "Ovaj zakon stupa na snagu osmog dana od dana objavljivanja, a primjenjuje se od 1. januara 2025. godine. "
+        "Danom početka primjene prestaje da važi Zakon iz 2019, koji se primjenjuje do 31.12.2024."
+    )
+    result = EffectiveDateExtractor().extract(text)
+    assert result.effective_from == "2025-01-01"
+    assert result.effective_to == "2024-12-31"
+    assert [(c.kind, c.date, c.offset_days) for c in result.candidates] == [
+        ("in_force", None, 8),
+        ("applies", "2025-01-01", None),
+        ("to", "2024-12-31", None),
+    ]
+    assert text[result.candidates[1].value_start : result.candidates[1].value_end] == "1. januara 2025"
+
+
+def test_extractor_resolves_offsets_and_cyrillic_in_batches():
+    texts = [
+        "Ова одлука ступа на снагу осмог дана од дана објављивања у „Службеном гласнику“.",
+        "Ова одлука ступа на снагу даном објављивања, а примјењује се од 1. јула 2024. године.",
+        "bez datuma",
+    ]
+    published = [date(2024, 1, 10), None, None]
+    results = list(EffectiveDateExtractor().extract_many(texts, published))
+    assert [r.effective_from for r in results] == ["2024-01-18", "2024-07-01", None]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Ovaj zakon stupa na snagu dvadesetog dana od dana objavljivanja.", "2024-01-30"),
+        ("Ovaj pravilnik stupa na snagu narednog dana od dana objavljivanja.", "2024-01-11"),
+        ("Ova odluka stupa na snagu sedmog dana od dana objavljivanja.", "2024-01-17"),
+        ("Ова одлука ступа на снагу сљедећег дана од дана објављивања.", "2024-01-11"),
+    ],
+)
+def test_extractor_ordinal_offsets(text, expected):
+    assert EffectiveDateExtractor().extract(text, date(2024, 1, 10)).effective_from == expected
+
+
+def test_extractor_does_not_match_ordinals_inside_words():
+    # "pedesetog" (50th) is not in the table; "desetog" inside it must not match.
+    result = EffectiveDateExtractor().extract("Zakon stupa na snagu pedesetog dana od objave.", date(2024, 1, 10))
+    assert result.effective_from is None
+
+
+def test_classifier_maps_case_insensitive_matches_back_to_terms():
+    # "İ" matches "i" under IGNORECASE but casefolds to "i̇".
+    assert guess_jurisdiction("http://x", "ZAKON FEDERACİJE BOSNE I HERCEGOVINE") == "FBIH"
+    assert guess_jurisdiction("http://VLADARS.net/x", "") == "RS"
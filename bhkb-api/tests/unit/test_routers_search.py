@@ -1,6 +1,11 @@
+from types import SimpleNamespace
+
 import pytest
 
+from app.db.ann import AnnConfig
 from app.routers import search as search_module
+from app.services.cache import MemoryCache, SearchCache
+from app.services.hybrid import HybridHit, HybridResult
 
 
 @pytest.mark.asyncio
@@ -12,6 +17,52 @@ async def test_search_endpoint(monkeypatch):
         return [{"chunk_id": 1, "text": "Tekst"}]
 
     monkeypatch.setattr(search_module, "keyword_search", fake_keyword_search)
-    response = await search_module.search(q="pravila", limit=5, pool="pool")
+    response = await search_module.search(q="pravila", limit=5, pool="pool", cache=SearchCache(MemoryCache()))
     assert response.query == "pravila"
     assert response.results[0].chunk_id == 1
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_serves_repeats_from_cache(monkeypatch):
+    calls = []
+
+    async def fake_keyword_search(pool, q, limit):
+        calls.append(q)
+        return [{"chunk_id": 1, "text": "Tekst"}]
+
+    monkeypatch.setattr(search_module, "keyword_search", fake_keyword_search)
+    cache = SearchCache(MemoryCache())
+    await search_module.search(q="PDV prag", limit=5, pool="pool", cache=cache)
+    response = await search_module.search(q="pdv  prag", limit=5, pool="pool", cache=cache)
+    assert calls == ["PDV prag"]
+    assert response.query == "pdv  prag"
+    assert response.results[0].text == "Tekst"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_endpoint_uses_settings_and_reports_timings(monkeypatch):
+    seen = {}
+
+    async def fake_hybrid_search(pool, embedder, q, **kwargs):
+        seen.update(kwargs, pool=pool, embedder=embedder, q=q)
+        return HybridResult([HybridHit(7, "«PDV» prag", 0.03, 1, None)], {"retrieve": 4.2, "total": 5.0})
+
+    monkeypatch.setattr(search_module, "hybrid_search", fake_hybrid_search)
+    settings = SimpleNamespace(
+        FINAL_TOP_K=12, PREFETCH_LIMIT=100, RERANK_TOP_K=50, MMR_DIVERSITY=0.6,
+        PGVECTOR_INDEX="ivfflat", PGVECTOR_LISTS=200, PGVECTOR_PROBES=20,
+        PGVECTOR_HNSW_M=16, PGVECTOR_HNSW_EF_CONSTRUCTION=64, PGVECTOR_EF_SEARCH=40,
+        PGVECTOR_QUANTIZATION="binary", PGVECTOR_RESCORE_FACTOR=4,
+    )
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(settings=settings)))
+    response = await search_module.search_hybrid(
+        request, q="PDV prag", limit=None, effort=0.5, pool="pool", embedder="emb"
+    )
+
+    assert seen == {
+        "top_k": 12, "prefetch": 100, "candidates": 50, "diversity": 0.6,
+        "ann": AnnConfig(lists=200, probes=20, quantization="binary", rescore_factor=4), "effort": 0.5,
+        "pool": "pool", "embedder": "emb", "q": "PDV prag",
+    }
+    assert response.results[0].chunk_id == 7 and response.results[0].lexical_rank is None
+    assert response.timings_ms["retrieve"] == 4.2
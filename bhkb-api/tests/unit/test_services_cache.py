@@ -0,0 +1,146 @@
+import pytest
+
+from app.services.cache import (
+    SEARCH_CACHE_REQUESTS,
+    IndexVersion,
+    MemoryCache,
+    RedisCache,
+    SearchCache,
+    build_search_cache,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class VersionCursor:
+    def __init__(self, value):
+        self.value = value
+
+    async def fetchone(self):
+        return (self.value,)
+
+
+class VersionPool:
+    def __init__(self):
+        self.version = 1
+        self.reads = 0
+
+    def connection(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, query):
+        self.reads += 1
+        return VersionCursor(self.version)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex):
+        self.data[key] = value.encode()
+
+    async def aclose(self):
+        pass
+
+
+def _count(result):
+    return SEARCH_CACHE_REQUESTS.labels(result=result)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expires_and_evicts_lru():
+    clock = Clock()
+    cache = MemoryCache(maxsize=2, clock=clock)
+    await cache.set("a", 1, ttl=10)
+    await cache.set("b", 2, ttl=10)
+    assert await cache.get("a") == 1  # "b" is now least recently used
+    await cache.set("c", 3, ttl=10)
+    assert await cache.get("b") is None
+    assert len(cache) == 2
+
+    clock.now = 10
+    assert await cache.get("a") is None
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_cache_keys_on_normalized_query_limit_and_filters():
+    cache = SearchCache(MemoryCache())
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return [{"chunk_id": len(calls)}]
+
+    hits, misses = _count("hit"), _count("miss")
+    first = await cache.get_or_compute("Rok za PRIJAVU", 10, compute)
+    assert await cache.get_or_compute("rok  za prijavu", 10, compute) == first
+    await cache.get_or_compute("rok za prijavu", 5, compute)
+    await cache.get_or_compute("rok za prijavu", 10, compute, filters={"jurisdiction": "RS"})
+    assert len(calls) == 3
+    assert (_count("hit") - hits, _count("miss") - misses) == (1, 3)
+    assert cache.key(1, "Član", 3, {"b": 1, "a": 2}) == 'v1|3|{"a":2,"b":1}|clan'
+
+
+@pytest.mark.asyncio
+async def test_index_version_bump_invalidates_after_refresh():
+    clock, pool = Clock(), VersionPool()
+    cache = SearchCache(MemoryCache(), IndexVersion(pool, refresh=5, clock=clock))
+    calls = []
+
+    async def compute():
+        calls.append(pool.version)
+        return calls[-1]
+
+    assert await cache.get_or_compute("pdv prag", 10, compute) == 1
+    pool.version = 2
+    assert await cache.get_or_compute("pdv prag", 10, compute) == 1  # version not re-read yet
+    clock.now = 5
+    assert await cache.get_or_compute("pdv prag", 10, compute) == 2
+    assert pool.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trips_json():
+    cache = SearchCache(RedisCache(FakeRedis()))
+
+    async def compute():
+        return [{"chunk_id": 1, "text": "Član «PDV»"}]
+
+    await cache.get_or_compute("pdv", 10, compute)
+    assert await cache.get_or_compute("pdv", 10, compute) == [{"chunk_id": 1, "text": "Član «PDV»"}]
+
+
+def test_build_search_cache_validates_backend():
+    class Settings:
+        SEARCH_CACHE_BACKEND = "memory"
+        SEARCH_CACHE_SIZE = 8
+        SEARCH_CACHE_TTL_SECONDS = 30.0
+        INDEX_VERSION_REFRESH_SECONDS = 1.0
+        REDIS_URL = None
+
+    cache = build_search_cache(Settings, pool=None)
+    assert isinstance(cache.backend, MemoryCache) and cache.backend.maxsize == 8 and cache.ttl == 30.0
+
+    Settings.SEARCH_CACHE_BACKEND = "redis"
+    with pytest.raises(ValueError):
+        build_search_cache(Settings, pool=None)
+    Settings.SEARCH_CACHE_BACKEND = "memcached"
+    with pytest.raises(ValueError):
+        build_search_cache(Settings, pool=None)
@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import embedding as embedding_module
+from app.services.embedding import BatchingEmbedder, build_embedder, load_model
+from app.text.embed import HashingEmbedder
+
+
+class RecordingModel(HashingEmbedder):
+    def __init__(self, dim=16, fail=False):
+        super().__init__(dim)
+        self.fail = fail
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return super().embed(texts)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_model_calls():
+    model = RecordingModel()
+    embedder = BatchingEmbedder(model, max_batch=4, max_latency=0.05)
+    queries = [f"upit {i}" for i in range(10)]
+    try:
+        vectors = await asyncio.gather(*(embedder.embed_query(q) for q in queries))
+    finally:
+        await embedder.close()
+
+    assert [len(call) for call in model.calls] == [4, 4, 2]
+    assert sum(model.calls, []) == queries
+    np.testing.assert_allclose(np.stack(vectors), model.embed(queries), rtol=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_lone_query_waits_at_most_max_latency():
+    model = RecordingModel()
+    embedder = BatchingEmbedder(model, max_batch=32, max_latency=0.01)
+    try:
+        vector = await asyncio.wait_for(embedder.embed_query("PDV prag"), timeout=1)
+        batch = await embedder.embed(["a", "b", "c"])
+    finally:
+        await embedder.close()
+    assert vector.shape == (16,)
+    assert batch.shape == (3, 16)
+    assert model.calls == [["PDV prag"], ["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_model_errors_reach_every_caller_and_cancelled_requests_are_dropped():
+    failing = BatchingEmbedder(RecordingModel(fail=True), max_latency=0.01)
+    results = await asyncio.gather(failing.embed_query("a"), failing.embed_query("b"), return_exceptions=True)
+    await failing.close()
+    assert [str(r) for r in results] == ["model crashed", "model crashed"]
+
+    model = RecordingModel()
+    embedder = BatchingEmbedder(model, max_latency=0.05)
+    cancelled = asyncio.create_task(embedder.embed_query("odustao"))
+    kept = asyncio.create_task(embedder.embed_query("ostao"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await kept
+    await embedder.close()
+    assert model.calls == [["ostao"]]
+
+
+def test_load_model_from_settings():
+    settings = SimpleNamespace(
+        EMBEDDING_BACKEND="hashing", EMBEDDING_DIM=8, EMBED_MAX_BATCH=4, EMBED_MAX_LATENCY_MS=5.0,
+        EMBEDDING_MODEL_PATH=None, EMBEDDING_TOKENIZER_PATH=None,
+    )
+    embedder = build_embedder(settings)
+    assert (embedder.dim, embedder.max_batch, embedder.max_latency) == (8, 4, 0.005)
+
+    with pytest.raises(ValueError, match="EMBEDDING_MODEL_PATH"):
+        load_model(SimpleNamespace(**{**vars(settings), "EMBEDDING_BACKEND": "onnx"}))
+    with pytest.raises(ValueError, match="unknown"):
+        load_model(SimpleNamespace(**{**vars(settings), "EMBEDDING_BACKEND": "gpu"}))
+
+
+def test_onnx_model_truncates_at_embedding_max_tokens(monkeypatch):
+    seen = {}
+    monkeypatch.setattr(embedding_module, "OnnxEmbedder", lambda *args, **kwargs: seen.update(kwargs))
+    settings = SimpleNamespace(
+        EMBEDDING_BACKEND="onnx", EMBEDDING_MODEL_PATH="model.onnx", EMBEDDING_TOKENIZER_PATH="tokenizer.json",
+        EMBEDDING_MODEL_VERSION="bge-m3-onnx", EMBEDDING_DIM=8, EMBEDDING_THREADS=None,
+        EMBEDDING_MAX_TOKENS=2048, CHUNK_TOKENS=700,
+    )
+    load_model(settings)
+    assert seen["max_length"] == 2048
+
+    with pytest.raises(ValueError, match="EMBEDDING_MAX_TOKENS"):
+        load_model(SimpleNamespace(**{**vars(settings), "EMBEDDING_MAX_TOKENS": 512}))
@@ -0,0 +1,28 @@
+import numpy as np
+
+from app.db.ann import AnnConfig
+from app.services.hybrid import dense_query, mmr_select, rrf_fuse
+
+
+def test_rrf_fuse_rewards_agreement_between_retrievers():
+    fused = rrf_fuse([[1, 2, 3], [3, 4]], k=60)
+    assert list(fused) == [3, 1, 2, 4]
+    assert fused[3] == 1 / 63 + 1 / 61
+    assert rrf_fuse([]) == {}
+
+
+def test_mmr_demotes_near_identical_candidates():
+    embeddings = np.array([[1, 0, 0], [0.99, 0.1, 0], [0, 1, 0], [0, 0, 0]], dtype=np.float32)
+    relevance = np.array([1.0, 0.95, 0.6, 0.5])
+    assert mmr_select(relevance, embeddings, 3, diversity=0.0) == [0, 1, 2]
+    assert mmr_select(relevance, embeddings, 3, diversity=0.6) == [0, 2, 3]
+    assert mmr_select(relevance, embeddings, 10, diversity=0.6) == [0, 2, 3, 1]
+    assert mmr_select(np.array([]), np.zeros((0, 3)), 5, 0.6) == []
+
+
+def test_dense_query_rescores_quantized_candidates():
+    sql = dense_query(AnnConfig(quantization="halfvec"))
+    approx, exact = sql.split(") AS approx")
+    assert "ORDER BY embedding::halfvec(1024) <=> %(v)s::halfvec(1024)" in approx
+    assert "LIMIT %(candidates)s" in approx
+    assert "ORDER BY embedding <=> %(v)s::vector" in exact
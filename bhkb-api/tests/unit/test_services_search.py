@@ -5,7 +5,7 @@ from app.services.search import keyword_search
 
 class DummyCursor:
     async def fetchall(self):
-        return [(1, "Prvi tekst"), (2, "Drugi tekst" * 10)]
+        return [(1, "Prvi «tekst»"), (2, "Drugi «tekst» … «tekst»")]
 
 
 class DummyConnection:
@@ -32,9 +32,18 @@ class DummyPool:
 
 
 @pytest.mark.asyncio
-async def test_keyword_search_returns_trimmed_text():
+async def test_keyword_search_returns_sql_snippets():
     pool = DummyPool()
     results = await keyword_search(pool, "porez", limit=5)
-    assert len(results) == 2
-    assert results[0]["chunk_id"] == 1
-    assert len(results[1]["text"]) <= 500
+    assert results == [
+        {"chunk_id": 1, "text": "Prvi «tekst»"},
+        {"chunk_id": 2, "text": "Drugi «tekst» … «tekst»"},
+    ]
+    assert "snippet FROM chunk_search" in pool.conn.executed[0]
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_normalizes_query():
+    pool = DummyPool()
+    await keyword_search(pool, "  Члан  ČLAN ", limit=5)
+    assert pool.conn.executed[1]["q"] == "clan clan"
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.services.cache import MemoryCache, SearchCache
+from app.services.singleflight import COALESCED_REQUESTS, SingleFlight
+
+
+def _coalesced(name):
+    return COALESCED_REQUESTS.labels(flight=name)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight("test-share")
+    release = asyncio.Event()
+    calls = []
+
+    async def query():
+        calls.append(1)
+        await release.wait()
+        return ["row"]
+
+    waiters = [asyncio.create_task(flight.do("pdv prag", query)) for _ in range(10)]
+    other = asyncio.create_task(flight.do("rok za prijavu", query))
+    await asyncio.sleep(0)
+    assert len(flight) == 2
+    release.set()
+    results = await asyncio.gather(*waiters, other)
+
+    assert results == [["row"]] * 11
+    assert len(calls) == 2
+    assert _coalesced("test-share") == 9
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_remembered():
+    flight = SingleFlight("test-error")
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("pool exhausted")
+
+    waiters = [asyncio.create_task(flight.do("q", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def ok():
+        return 1
+
+    assert await flight.do("q", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight("test-cancel")
+    release = asyncio.Event()
+
+    async def query():
+        await release.wait()
+        return "done"
+
+    leader = asyncio.create_task(flight.do("q", query))
+    follower = asyncio.create_task(flight.do("q", query))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+    assert await follower == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_search_cache_misses_are_coalesced():
+    cache = SearchCache(MemoryCache(), flight=SingleFlight("test-cache"))
+    release = asyncio.Event()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await release.wait()
+        return [{"chunk_id": 1}]
+
+    waiters = [asyncio.create_task(cache.get_or_compute("PDV prag", 10, compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [[{"chunk_id": 1}]] * 5
+    assert len(calls) == 1
+    assert await cache.get_or_compute("pdv prag", 10, compute) == [{"chunk_id": 1}]
+    assert len(calls) == 1
@@ -0,0 +1,89 @@
+import pytest
+
+from app.core.config import Settings
+from app.text.chunking import (
+    ChunkBudget,
+    HFTokenizer,
+    WhitespaceTokenizer,
+    count_tokens,
+    iter_chunk_spans,
+    iter_clause_chunks,
+)
+
+
+def _words(n: int) -> str:
+    return "  ".join(f"w{i}" for i in range(n))
+
+
+def test_chunk_spans_overlap_and_cover_every_token():
+    text = _words(100)
+    budget = ChunkBudget(max_tokens=20, overlap=0.25)
+    spans = list(iter_chunk_spans(text, budget=budget))
+    chunks = [text[a:b].split() for a, b in spans]
+
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert chunks[0][0] == "w0" and chunks[-1][-1] == "w99"
+    assert [chunk[0] for chunk in chunks] == [f"w{i}" for i in range(0, 100, 15)][: len(chunks)]
+    assert chunks[0][-5:] == chunks[1][:5]
+
+
+def test_chunk_spans_are_offsets_into_original_text():
+    text = "Prvi  red.\nDrugi red ima više riječi."
+    spans = list(iter_chunk_spans(text, budget=ChunkBudget(max_tokens=3, overlap=0)))
+    assert [text[a:b] for a, b in spans] == ["Prvi  red.\nDrugi", "red ima više", "riječi."]
+    assert spans[1] == (17, 29)
+
+
+def test_chunk_spans_respect_bounds_and_short_text():
+    text = "a b c d e f"
+    assert list(iter_chunk_spans(text, start=4, end=9, budget=ChunkBudget(max_tokens=10))) == [(4, 9)]
+    assert list(iter_chunk_spans("   ")) == []
+    assert count_tokens(text, WhitespaceTokenizer(), 2) == 5
+
+
+def test_budget_from_settings():
+    settings = Settings(DATABASE_URL="postgresql://x/y", CHUNK_TOKENS=700, CHUNK_OVERLAP=0.1)
+    budget = ChunkBudget.from_settings(settings)
+    assert (budget.max_tokens, budget.overlap_tokens, budget.step) == (700, 70, 630)
+    with pytest.raises(ValueError):
+        ChunkBudget(max_tokens=10, overlap=1.0)
+
+
+def test_hf_tokenizer_offsets_are_shifted():
+    class FakeEncoding:
+        offsets = [(0, 0), (0, 3), (3, 5), (6, 9)]
+
+    class FakeTokenizer:
+        def encode(self, text, add_special_tokens=True):
+            assert text == "abcde fgh"
+            return FakeEncoding()
+
+    spans = HFTokenizer(FakeTokenizer()).token_spans("xx abcde fgh", 3)
+    assert spans == [(3, 6), (6, 8), (9, 12)]
+
+
+def test_clause_chunks_pack_whole_clauses_and_split_oversized_ones():
+    long_body = " ".join(f"r{i}" for i in range(25))
+    text = (
+        "Preambula zakona.\n"
+        "Član 1 jedan dva tri.\n"
+        "Član 2 četiri.\n"
+        f"Član 3 {long_body}\n"
+        "Član 4 kraj."
+    )
+    chunks = list(iter_clause_chunks(text, budget=ChunkBudget(max_tokens=10, overlap=0.2)))
+
+    assert chunks[0].clause_titles == ("", "Član 1", "Član 2")
+    assert chunks[0].clause_title == "Član 1 – Član 2"
+    assert chunks[0].text(text) == "Preambula zakona.\nČlan 1 jedan dva tri.\nČlan 2 četiri."
+    assert chunks[0].token_count == 10
+
+    oversized = [c for c in chunks if c.clause_titles == ("Član 3",)]
+    assert len(oversized) == 4  # 27 tokens, windows of 10 every 8
+    assert oversized[0].text(text).startswith("Član 3 r0")
+    assert all(c.token_count <= 10 for c in oversized)
+    assert oversized[0].text(text).split()[-2:] == oversized[1].text(text).split()[:2]
+    assert all(c.clause_start == text.index("Član 3") for c in oversized)
+
+    assert chunks[-1].clause_title == "Član 4"
+    assert chunks[-1].text(text) == "Član 4 kraj."
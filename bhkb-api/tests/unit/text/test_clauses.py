@@ -0,0 +1,38 @@
+from app.text.clauses import iter_clauses
+from app.utils import split_clauses
+
+
+def test_iter_clauses_handles_bcs_and_cyrillic_markers():
+    text = (
+        "ZAKON O RAČUNOVODSTVU\n\n"
+        "Članak 1.\nOvim zakonom uređuje se...\n"
+        "Čl. 2 Primjena iz člana 1 i čl. 3.\n"
+        "ČLAN 3a\nIzuzeci.\n"
+        "Члан 4\nОвај закон ступа на снагу.\n"
+    )
+    spans = list(iter_clauses(text))
+    assert [s.title for s in spans] == ["", "Članak 1", "Čl. 2", "ČLAN 3a", "Члан 4"]
+    assert spans[0].body(text) == "ZAKON O RAČUNOVODSTVU"
+    assert spans[2].body(text) == "Primjena iz člana 1 i čl. 3."
+    assert spans[4].body(text) == "Овај закон ступа на снагу."
+    assert text[spans[1].start : spans[1].body_start].startswith("Članak 1.")
+    assert all(a.end <= b.start for a, b in zip(spans, spans[1:]))
+
+
+def test_iter_clauses_accepts_every_serbian_cyrillic_suffix():
+    suffixes = "абвгдђежзијклљмнњопрстћуфхцчџш"
+    text = "".join(f"Члан 5{letter}\nТекст.\n" for letter in suffixes)
+    assert [s.title for s in iter_clauses(text)] == [f"Члан 5{letter}" for letter in suffixes]
+
+
+def test_iter_clauses_is_lazy_and_falls_back_to_whole_text():
+    text = "Član 1 a " + "x " * 10 + "Član 2 b"
+    clauses = iter_clauses(text)
+    assert next(clauses).title == "Član 1"
+    assert [s.title for s in iter_clauses("  bez članova  ")] == [""]
+    assert list(iter_clauses("  bez članova  "))[0].body("  bez članova  ") == "bez članova"
+
+
+def test_split_clauses_keeps_tuple_contract():
+    assert split_clauses("Uvod. Član 1 Prvi. Članak 2 Drugi.") == [("Član 1", "Prvi."), ("Članak 2", "Drugi.")]
+    assert split_clauses("nema naslova") == [("", "nema naslova")]
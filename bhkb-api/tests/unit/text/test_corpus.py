@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from app.text.chunking import ChunkBudget
+from app.text.corpus import ChunkStats, chunk_corpus, chunk_document, document_key, iter_corpus
+
+
+CORPUS = Path(__file__).resolve().parents[2] / "fixtures" / "corpus"
+
+
+def test_chunk_document_rows_follow_copy_layout():
+    text = "Član 1 Prvi stav.\nČlan 2 Drugi stav."
+    rows = chunk_document("doc.txt", text, ChunkBudget(max_tokens=4, overlap=0))
+    assert all(len(row[8]) == 512 for row in rows)
+    assert [row[:8] for row in rows] == [
+        ("doc.txt", 0, "Član 1", 0, 17, 4, "Član 1 Prvi stav.", "clan 1 prvi stav."),
+        ("doc.txt", 1, "Član 2", 18, 36, 4, "Član 2 Drugi stav.", "clan 2 drugi stav."),
+    ]
+
+
+def test_chunk_corpus_pool_matches_serial_run():
+    relpaths = [document_key(p, CORPUS) for p in iter_corpus(CORPUS)]
+    assert relpaths == sorted(relpaths) and len(relpaths) == 3
+
+    serial = chunk_corpus(CORPUS, relpaths, ChunkBudget(max_tokens=80), workers=1)
+    pooled = chunk_corpus(CORPUS, relpaths, ChunkBudget(max_tokens=80), workers=2, shard_size=1)
+    assert serial.docs == pooled.docs == 3
+    assert serial.chunks == pooled.chunks > 3
+
+
+def test_chunk_stats_rates():
+    stats = ChunkStats(docs=10, chunks=40, seconds=2.0, duplicates=3)
+    assert stats.as_dict() == {"docs": 10, "chunks": 40, "duplicates": 3, "seconds": 2.0, "docs_per_s": 5.0, "chunks_per_s": 20.0}
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.text.dedup import LSHIndex, MinHasher, similarity
+from app.text.normalize import normalize
+
+
+BODY = normalize(
+    "Obveznik PDV-a dužan je podnijeti prijavu za svaki poreski period do desetog dana "
+    "narednog mjeseca. Uz prijavu se dostavlja knjiga ulaznih i izlaznih faktura, a porez "
+    "se plaća na jedinstveni račun Uprave za indirektno oporezivanje u istom roku. "
+    "Obveznik koji ne podnese prijavu u roku podliježe prekršajnoj odgovornosti."
+)
+
+
+def test_signature_is_stable_and_serializable():
+    first, second = MinHasher(), MinHasher()
+    sig = first.signature(BODY)
+    assert sig.dtype == np.uint32 and sig.shape == (128,)
+    assert np.array_equal(sig, second.signature(BODY))
+    assert np.array_equal(MinHasher.from_bytes(MinHasher.to_bytes(sig)), sig)
+    assert len(first.band_keys(sig)) == 16
+
+
+def test_republished_copy_is_similar_and_shares_buckets():
+    hasher = MinHasher()
+    original = hasher.signature(BODY)
+    copy = hasher.signature("federalno ministarstvo finansija – objavljeno na portalu " + BODY)
+    other = hasher.signature(normalize("Pravilnik o kontnom okviru za privredna društva i zadruge."))
+
+    assert similarity(original, copy) >= 0.8
+    assert similarity(original, other) < 0.2
+
+    index = LSHIndex(hasher)
+    index.add(1, original)
+    index.add(2, other)
+    assert index.candidates(copy) == [1]
+    assert index.best_match(copy, 0.8)[0] == 1
+    assert index.best_match(copy, 0.8, exclude=[1]) is None
+
+
+def test_short_and_empty_texts_still_hash():
+    hasher = MinHasher(shingle_size=5)
+    assert np.array_equal(hasher.signature("clan 1"), hasher.signature("clan  1"))
+    assert not np.array_equal(hasher.signature(""), hasher.signature("clan 1"))
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=100, bands=16)
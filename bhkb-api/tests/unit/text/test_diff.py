@@ -0,0 +1,62 @@
+from app.text.diff import ADDED, MODIFIED, REMOVED, RENUMBERED, align_clauses, diff_versions, hash_clauses
+
+
+OLD = """ZAKON O POREZU
+Član 1 Ovim zakonom uređuje se porez na dobit.
+Član 2 Stopa poreza iznosi 10%.
+Član 3 Obveznik je svako pravno lice.
+Član 4 Brisan.
+"""
+
+NEW = """ZAKON O POREZU
+Član 1 Ovim zakonom  uređuje se porez na dobit.
+Član 2 Stopa poreza iznosi 12%.
+Član 3 Izuzeće se odnosi na budžetske korisnike.
+Član 4 Obveznik je svako pravno lice.
+Član 5 Ovaj zakon se primjenjuje od 1. januara 2026. godine.
+"""
+
+
+def test_hash_clauses_ignores_script_case_and_whitespace():
+    latin = hash_clauses("Član 5a Porez na   dodatu vrijednost.")
+    cyrillic = hash_clauses("Члан 5а ПОРЕЗ на додату вриједност.")
+    assert [(c.key, c.digest) for c in latin] == [(c.key, c.digest) for c in cyrillic]
+    assert latin[0].key == "5a"
+
+
+def test_diff_versions_classifies_clause_changes():
+    events = diff_versions(OLD, NEW)
+    assert [(e.kind, e.old_title, e.new_title) for e in events] == [
+        (MODIFIED, "Član 2", "Član 2"),
+        (ADDED, None, "Član 3"),
+        (RENUMBERED, "Član 3", "Član 4"),
+        (ADDED, None, "Član 5"),
+        (REMOVED, "Član 4", None),
+    ]
+    modified = events[0]
+    assert [(edit.op, edit.old_text, edit.new_text) for edit in modified.edits] == [("replace", "0", "2")]
+    assert 0.9 < modified.similarity < 1
+
+
+def test_superseded_clauses_get_effective_to():
+    events = diff_versions(OLD, NEW)
+    assert {e.kind: e.effective_to for e in events} == {
+        MODIFIED: "2025-12-31",
+        ADDED: None,
+        RENUMBERED: "2025-12-31",
+        REMOVED: "2025-12-31",
+    }
+    explicit = diff_versions(OLD, NEW, effective_from="2025-07-01")
+    assert explicit[0].effective_to == "2025-06-30"
+    assert diff_versions(OLD, NEW.replace("se primjenjuje od 1. januara 2026. godine", "važi"))[0].effective_to is None
+
+
+def test_identical_versions_produce_no_events():
+    assert diff_versions(OLD, OLD.replace("Član", "Члан")) == []
+    assert align_clauses([], hash_clauses(OLD))[0].kind == ADDED
+
+
+def test_change_event_as_dict():
+    payload = diff_versions(OLD, NEW)[0].as_dict()
+    assert payload["kind"] == MODIFIED
+    assert payload["edits"][0]["new_text"] == "2"
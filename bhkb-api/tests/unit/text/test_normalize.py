@@ -0,0 +1,38 @@
+import unicodedata
+
+from app.text import normalize as norm
+from app.text.normalize import normalize, normalize_many, normalize_queries, normalize_query
+
+
+def test_normalize_folds_latin_diacritics_and_case():
+    assert normalize("PORESKA ČINJENICA šđžćč") == "poreska cinjenica sdjzcc"
+    assert normalize("Đorđe Ñandú") == "djordje nandu"
+
+
+def test_normalize_transliterates_cyrillic_to_folded_latin():
+    assert normalize("Члан 5. ЗАКОНА о порезу на додату вриједност") == "clan 5. zakona o porezu na dodatu vrijednost"
+    assert normalize("љубав, њива, џеп, ђак, ћуприја") == "ljubav, njiva, dzep, djak, cuprija"
+    assert normalize("Члан") == normalize("Član") == normalize("clan")
+
+
+def test_normalize_composes_decomposed_input():
+    decomposed = unicodedata.normalize("NFD", "Član")
+    assert len(decomposed) == 5
+    assert normalize(decomposed) == "clan"
+
+
+def test_normalize_query_collapses_whitespace_and_caches():
+    norm._normalize_cached.cache_clear()
+    assert normalize_query("  Porez   na  DOBIT ") == "porez na dobit"
+    normalize_query("  Porez   na  DOBIT ")
+    assert norm._normalize_cached.cache_info().hits == 1
+
+    long_query = "ž" * (norm.QUERY_CACHE_MAX_CHARS + 1)
+    assert normalize_query(long_query) == "z" * (norm.QUERY_CACHE_MAX_CHARS + 1)
+    assert norm._normalize_cached.cache_info().currsize == 1
+
+
+def test_batch_apis_match_single_calls():
+    texts = ["Šta je PDV?", "Шта је ПДВ?"]
+    assert normalize_many(texts) == ["sta je pdv?", "sta je pdv?"]
+    assert normalize_queries(texts) == [normalize_query(t) for t in texts]
@@ -1 +1 @@
-# Placeholder package for worker processes.
+# Worker entry package
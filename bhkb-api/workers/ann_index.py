@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from dataclasses import replace
+
+import psycopg
+
+from app.core.config import Settings
+from app.db.ann import ANN_INDEX, ANN_KINDS, QUANTIZATIONS, AnnConfig, rebuild_ann_index, suggest_lists
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create or rebuild the pgvector ANN index on chunk.embedding.")
+    parser.add_argument(
+        "--kind", choices=ANN_KINDS, help="index type (default: PGVECTOR_INDEX; the API refuses to start on a mismatch)"
+    )
+    parser.add_argument("--lists", help="IVFFlat lists, or 'auto' to size from the row count (default: PGVECTOR_LISTS)")
+    parser.add_argument("--m", type=int, help="HNSW m (default: PGVECTOR_HNSW_M)")
+    parser.add_argument("--ef-construction", type=int, help="HNSW ef_construction (default: PGVECTOR_HNSW_EF_CONSTRUCTION)")
+    parser.add_argument(
+        "--quantization", choices=tuple(QUANTIZATIONS), help="indexed vector form (default: PGVECTOR_QUANTIZATION)"
+    )
+    parser.add_argument("--blocking", action="store_true", help="build without CONCURRENTLY (faster, blocks writes)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    settings = Settings()
+    base = AnnConfig.from_settings(settings)
+
+    with psycopg.connect(settings.DATABASE_URL, autocommit=True) as conn:
+        rows = conn.execute("SELECT count(*) FROM chunk WHERE embedding IS NOT NULL").fetchone()[0]
+        lists = base.lists
+        if args.lists == "auto":
+            lists = suggest_lists(rows)
+        elif args.lists:
+            lists = int(args.lists)
+        config = replace(
+            base,
+            kind=args.kind or base.kind,
+            lists=lists,
+            m=args.m or base.m,
+            ef_construction=args.ef_construction or base.ef_construction,
+            quantization=args.quantization or base.quantization,
+        )
+        started = time.perf_counter()
+        indexdef = rebuild_ann_index(conn, config, concurrently=not args.blocking)
+        index_bytes = conn.execute("SELECT pg_relation_size(%s::regclass)", (ANN_INDEX,)).fetchone()[0]
+
+    print(json.dumps({
+        "component": "ann_index",
+        "rows": rows,
+        "index": indexdef,
+        "index_bytes": index_bytes,
+        "seconds": round(time.perf_counter() - started, 3),
+    }))
+
+
+if __name__ == "__main__":
+    main()
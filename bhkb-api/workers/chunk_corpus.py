@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+
+from app.core.config import Settings
+from app.text.chunking import ChunkBudget
+from app.text.corpus import chunk_corpus, document_key, iter_corpus
+from app.watcher.db import open_conn
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Re-chunk a corpus of plain-text legal documents into the chunk table.")
+    parser.add_argument("root", type=Path, help="corpus directory; document keys are paths relative to it")
+    parser.add_argument("--glob", default="**/*.txt", help="file pattern under root (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="chunking processes")
+    parser.add_argument("--shard-size", type=int, default=16, help="documents per pool task and per COPY")
+    parser.add_argument("--chunk-tokens", type=int, help="override CHUNK_TOKENS")
+    parser.add_argument("--chunk-overlap", type=float, help="override CHUNK_OVERLAP")
+    parser.add_argument("--no-dedup", action="store_true", help="do not flag near-duplicate chunks")
+    parser.add_argument("--dry-run", action="store_true", help="chunk and report without writing to the database")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    settings = Settings()
+    budget = ChunkBudget(
+        max_tokens=args.chunk_tokens or settings.CHUNK_TOKENS,
+        overlap=settings.CHUNK_OVERLAP if args.chunk_overlap is None else args.chunk_overlap,
+    )
+    root = args.root.resolve()
+    relpaths = [document_key(path, root) for path in iter_corpus(root, args.glob)]
+
+    conn = None if args.dry_run else open_conn(settings.DATABASE_URL)
+    try:
+        stats = chunk_corpus(
+            root,
+            relpaths,
+            budget,
+            workers=args.workers,
+            shard_size=args.shard_size,
+            conn=conn,
+            near_dup_threshold=None if args.no_dedup else settings.NEAR_DUP_THRESHOLD,
+        )
+    finally:
+        if conn is not None:
+            conn.close()
+    print(json.dumps({"component": "chunk_corpus", "max_tokens": budget.max_tokens, **stats.as_dict()}))
+
+
+if __name__ == "__main__":
+    main()
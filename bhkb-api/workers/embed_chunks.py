@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+
+from app.core.config import Settings
+from app.services.embedding import load_model
+from app.text.embed_cache import embed_pending
+from app.watcher.db import open_conn
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Embed chunks that lack a vector from the configured model, reusing embedding_cache."
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="chunks per model call and per commit")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args(argv)
+    settings = Settings()
+    model = load_model(settings)
+
+    conn = open_conn(settings.DATABASE_URL)
+    try:
+        stats = embed_pending(conn, model, args.batch_size)
+    finally:
+        conn.close()
+    print(json.dumps({"component": "embed_chunks", "model_version": model.model_version, **stats.as_dict()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,24 @@
+from __future__ import annotations
+
 import logging
-import time
+import threading
+
+from prometheus_client import start_http_server
+
+from app.ingest.config import IngestSettings
+from app.ingest.service import IngestWorker
+from app.watcher.service import install_signal_handlers
 
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
-    logging.info("Worker placeholder started (no tasks defined). Sleeping indefinitely.")
-    while True:
-        time.sleep(3600)
+    settings = IngestSettings()
+    stop_event = threading.Event()
+    install_signal_handlers(stop_event)
+    start_http_server(settings.PROM_PORT)
+    worker = IngestWorker(settings, stop_event)
+    worker.logger.info("ingest worker started", extra={"run_id": worker.run_id})
+    worker.run_forever()
 
 
 if __name__ == "__main__":